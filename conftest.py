@@ -19,9 +19,16 @@ QPC_PATH_CONSTANTS = (
     "INSIGHTS_CONFIG",
     "INSIGHTS_ENCRYPTION",
     "INSIGHTS_LOGIN_CONFIG",
+    "QPC_CIRCUIT_BREAKER",
     "QPC_CLIENT_TOKEN",
+    "QPC_HTTP_CACHE",
+    "QPC_ID_INDEX",
     "QPC_LOG",
+    "QPC_NAME_INDEX",
+    "QPC_REPORT_INDEX",
     "QPC_SERVER_CONFIG",
+    "QPC_SERVER_INFO",
+    "QPC_SHELL_HISTORY",
 )
 
 
@@ -32,6 +39,33 @@ def mock_path_constants(tmp_path, monkeypatch):
         monkeypatch.setattr(f"qpc.utils.{path}", str(tmp_path / path))
 
 
+@pytest.fixture(autouse=True)
+def reset_request_state():
+    """Discard the pooled HTTP session and request settings between tests."""
+    yield
+    from qpc.request import (
+        DEFAULT_JOBS,
+        close_session,
+        set_deadline,
+        set_max_jobs,
+        set_timeout,
+        start_command,
+    )
+
+    close_session()
+    set_max_jobs(DEFAULT_JOBS)
+    set_timeout(None)
+    set_deadline(None)
+    start_command()
+
+
+@pytest.fixture(autouse=True)
+def mock_retry_sleep():
+    """Don't actually wait between request retries."""
+    with mock.patch("qpc.request.time.sleep") as mocked_sleep:
+        yield mocked_sleep
+
+
 def _set_path_constants_to_none():
     """Set qpc path constants to None."""
     for constant in QPC_PATH_CONSTANTS:
@@ -1,6 +1,12 @@
 """QPC Package Initialization."""
-from importlib import metadata
 
-# Let's get the package version from poetry
-__package__version__ = metadata.version(__package__)
-del metadata
+
+def __getattr__(name):
+    """Read the package version on first use, as importlib.metadata is slow."""
+    if name == "__package__version__":
+        from importlib import metadata
+
+        # Let's get the package version from poetry
+        globals()[name] = metadata.version(__package__)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
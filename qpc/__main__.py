@@ -1,12 +1,18 @@
 """Main qpc entrypoint."""
 
 import gettext
+import sys
 
-from qpc.cli import CLI
+from qpc import completion
 
 
 def main():
     """Execute qpc CLI."""
+    if sys.argv[1:2] == [completion.COMMAND]:
+        # shells wait for completions on every TAB, so skip the CLI setup
+        sys.exit(completion.main(sys.argv[2:]))
+    from qpc.cli import CLI
+
     gettext.install("qpc")
     CLI().main()
 
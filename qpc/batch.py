@@ -0,0 +1,138 @@
+"""Run many qpc commands from a file or stdin in a single process.
+
+Every line of the batch is a qpc command line, without the leading ``qpc``,
+parsed and run like qpc would. Running all of them in one process saves the
+interpreter startup and config reads of each command, and reuses the
+connections of the process-wide session. Blank lines separate groups of
+commands: groups run one after the other, while the commands of a group may
+run concurrently with --parallel. Options for all commands, like --timeout, are
+taken from the batch command line.
+"""
+
+import argparse
+import shlex
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from qpc import messages
+from qpc.translation import _
+from qpc.utils import logger, validate_positive_int
+
+SUBCOMMAND = "batch"
+PROGRAM = "qpc"
+
+
+def add_parser(subparsers):
+    """Add the batch subcommand parser.
+
+    :param subparsers: subparsers of the qpc parser
+    """
+    parser = subparsers.add_parser(SUBCOMMAND)
+    parser.add_argument(
+        "--file",
+        dest="file",
+        metavar="FILE",
+        type=argparse.FileType("r", encoding="utf-8"),
+        default="-",
+        help=_(messages.BATCH_FILE_HELP),
+    )
+    parser.add_argument(
+        "--parallel",
+        dest="parallel",
+        metavar="N",
+        type=validate_positive_int,
+        default=1,
+        help=_(messages.BATCH_PARALLEL_HELP),
+    )
+
+
+def read_commands(lines):
+    """Split batch lines into groups of commands.
+
+    Comments starting with # are ignored and blank lines end a group.
+
+    :param lines: iterable of batch lines
+    :returns: list of groups, each a list of (line number, argv) tuples
+    :raises: ValueError if a line cannot be split like a shell would
+    """
+    groups = [[]]
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            groups.append([])
+            continue
+        try:
+            argv = shlex.split(line, comments=True)
+        except ValueError as error:
+            raise ValueError(
+                _(messages.BATCH_SYNTAX_ERROR) % {"line": line_number, "error": error}
+            ) from error
+        if argv and argv[0] == PROGRAM:
+            argv = argv[1:]
+        if argv:
+            groups[-1].append((line_number, argv))
+    return [group for group in groups if group]
+
+
+def run_commands(groups, parallel=1):
+    """Run groups of commands, returning the exit code of every line.
+
+    :param groups: groups of (line number, argv) tuples, as read_commands()
+        returns them
+    :param parallel: max number of commands of a group run at the same time
+    :returns: list of (line number, exit code) tuples, in batch order
+    """
+    results = []
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        for group in groups:
+            codes = executor.map(_run_line, group)
+            for (line_number, argv), code in zip(group, codes):
+                _log_result(line_number, argv, code)
+                results.append((line_number, code))
+    return results
+
+
+def main(args):
+    """Run the commands of the batch given to qpc batch.
+
+    :param args: the parsed qpc batch arguments
+    :returns: 0 if every command succeeded, 1 otherwise
+    """
+    try:
+        groups = read_commands(args.file)
+    except ValueError as error:
+        logger.error(error)
+        return 1
+    finally:
+        if args.file is not sys.stdin:
+            args.file.close()
+    results = run_commands(groups, args.parallel)
+    failed = sum(1 for _line, code in results if code)
+    if failed:
+        logger.error(
+            _(messages.BATCH_FAILED), {"failed": failed, "total": len(results)}
+        )
+        return 1
+    return 0
+
+
+def _log_result(line_number, argv, code):
+    result = {"line": line_number, "code": code, "command": shlex.join(argv)}
+    if code:
+        logger.error(_(messages.BATCH_LINE_FAILED), result)
+    else:
+        logger.info(_(messages.BATCH_LINE_SUCCEEDED), result)
+
+
+def _run_line(line):
+    from qpc.cli import CLI
+
+    line_number, argv = line
+    try:
+        return CLI().run(argv)
+    except Exception as error:  # noqa: BLE001
+        # a bug in one command must not stop the other lines
+        logger.debug("Error running line %s", line_number, exc_info=True)
+        logger.error(
+            _(messages.BATCH_LINE_ERROR), {"line": line_number, "error": error}
+        )
+        return 1
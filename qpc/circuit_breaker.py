@@ -0,0 +1,136 @@
+"""Circuit breaker shared by all qpc processes talking to the same server.
+
+Connection failures are counted in QPC_CIRCUIT_BREAKER, keyed by server
+location. Once circuit_breaker_threshold consecutive failures happen within
+circuit_breaker_window seconds the circuit opens, and requests fail at once
+instead of waiting for yet another connection failure. After
+circuit_breaker_cooldown seconds the circuit is half open: the next request
+is preceded by a probe of the server, which closes the circuit if the server
+answers or opens it again otherwise.
+"""
+
+import json
+import time
+
+import requests
+
+from qpc import messages, utils
+from qpc.translation import _
+from qpc.utils import (
+    CONFIG_CIRCUIT_BREAKER_COOLDOWN,
+    CONFIG_CIRCUIT_BREAKER_THRESHOLD,
+    CONFIG_CIRCUIT_BREAKER_WINDOW,
+    get_server_location,
+    get_server_setting,
+    logger,
+    read_snapshot,
+    write_json_atomically,
+)
+
+FAILURES_KEY = "failures"
+FIRST_FAILURE_KEY = "first_failure"
+OPENED_KEY = "opened"
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """The server is considered down and was not contacted."""
+
+
+def check(probe):
+    """Fail fast if the circuit of the configured server is open.
+
+    :param probe: callable sending a request to the server, raising
+        requests.exceptions.ConnectionError if it cannot be reached; it is
+        called when the cool-down period is over
+    :raises: CircuitOpenError if the server should not be contacted
+    """
+    if not get_server_setting(CONFIG_CIRCUIT_BREAKER_THRESHOLD):
+        return
+    state = _server_state()
+    opened = state.get(OPENED_KEY)
+    if opened is None:
+        return
+    remaining = opened + get_server_setting(CONFIG_CIRCUIT_BREAKER_COOLDOWN)
+    remaining -= time.time()
+    if remaining > 0:
+        raise CircuitOpenError(
+            _(messages.CIRCUIT_OPEN)
+            % {
+                "server": get_server_location(),
+                "failures": state.get(FAILURES_KEY),
+                "remaining": remaining,
+            }
+        )
+
+    # half open: other processes keep failing fast while this one probes
+    _save_state({**state, OPENED_KEY: time.time()})
+    try:
+        probe()
+    except requests.exceptions.ConnectionError:
+        logger.debug("Server at %s is still unreachable", get_server_location())
+        raise
+    record_success()
+
+
+def record_failure():
+    """Count a connection failure, opening the circuit at the threshold."""
+    threshold = get_server_setting(CONFIG_CIRCUIT_BREAKER_THRESHOLD)
+    if not threshold:
+        return
+    now = time.time()
+    state = _server_state()
+    window = get_server_setting(CONFIG_CIRCUIT_BREAKER_WINDOW)
+    if now - state.get(FIRST_FAILURE_KEY, now) > window:
+        state = {}
+    failures = state.get(FAILURES_KEY, 0) + 1
+    state = {
+        FAILURES_KEY: failures,
+        FIRST_FAILURE_KEY: state.get(FIRST_FAILURE_KEY, now),
+        OPENED_KEY: now if failures >= threshold else state.get(OPENED_KEY),
+    }
+    _save_state(state)
+
+
+def record_success():
+    """Close the circuit of the configured server after it answered."""
+    if _server_state():
+        _save_state(None)
+
+
+def _load_circuit_breaker():
+    with open(utils.QPC_CIRCUIT_BREAKER, encoding="utf-8") as state_file:
+        try:
+            states = json.load(state_file)
+        except ValueError:
+            return {}
+    if not isinstance(states, dict):
+        return {}
+    return states
+
+
+def _read_states():
+    try:
+        return read_snapshot(utils.QPC_CIRCUIT_BREAKER, _load_circuit_breaker)
+    except OSError:
+        return {}
+
+
+def _server_state():
+    state = _read_states().get(get_server_location())
+    if not isinstance(state, dict):
+        return {}
+    return state
+
+
+def _save_state(state):
+    """Replace the state of the configured server, None removing it."""
+    location = get_server_location()
+    states = dict(_read_states())
+    if state is None:
+        states.pop(location, None)
+    else:
+        states[location] = state
+    try:
+        write_json_atomically(utils.QPC_CIRCUIT_BREAKER, states)
+    except OSError as error:
+        logger.debug("Could not save circuit breaker state: %s", error)
@@ -1,58 +1,27 @@
 """QPC Command Line Interface."""
 
 import sys
-from argparse import ArgumentParser
-
-from qpc import cred, insights, messages, report, scan, server, source
-from qpc.cred.commands import (
-    CredAddCommand,
-    CredClearCommand,
-    CredEditCommand,
-    CredListCommand,
-    CredShowCommand,
-)
-from qpc.insights.commands import (
-    InsightsAddLoginCommand,
-    InsightsConfigureCommand,
-    InsightsPublishCommand,
-)
-from qpc.release import PKG_NAME, VERSION
-from qpc.report.commands import (
-    ReportDeploymentsCommand,
-    ReportDetailsCommand,
-    ReportDownloadCommand,
-    ReportInsightsCommand,
-    ReportMergeCommand,
-    ReportMergeStatusCommand,
-    ReportUploadCommand,
-)
-from qpc.scan.commands import (
-    ScanAddCommand,
-    ScanCancelCommand,
-    ScanClearCommand,
-    ScanEditCommand,
-    ScanJobCommand,
-    ScanListCommand,
-    ScanPauseCommand,
-    ScanRestartCommand,
-    ScanShowCommand,
-    ScanStartCommand,
-)
-from qpc.server.commands import (
-    ConfigureHostCommand,
-    LoginHostCommand,
-    LogoutHostCommand,
-    ServerStatusCommand,
-)
-from qpc.source.commands import (
-    SourceAddCommand,
-    SourceClearCommand,
-    SourceEditCommand,
-    SourceListCommand,
-    SourceShowCommand,
+from argparse import SUPPRESS, Action, ArgumentParser
+from copy import copy
+from importlib import import_module
+
+from qpc import (
+    batch,
+    completion,
+    cred,
+    insights,
+    messages,
+    report,
+    resolver,
+    scan,
+    server,
+    shell,
+    source,
 )
+from qpc.release import PKG_NAME
 from qpc.translation import _
 from qpc.utils import (
+    DEFAULT_JOBS,
     ensure_config_dir_exists,
     ensure_data_dir_exists,
     get_server_location,
@@ -60,8 +29,82 @@ from qpc.utils import (
     read_client_token,
     read_require_auth,
     setup_logging,
+    validate_positive_float,
+    validate_positive_int,
 )
 
+# actions of each subcommand, in --help order, mapped to the module and class
+# implementing them; a module is only imported when its action is run
+SUBCOMMANDS = {
+    server.SUBCOMMAND: (
+        (server.CONFIG, "qpc.server.configure_host", "ConfigureHostCommand"),
+        (server.LOGIN, "qpc.server.login_host", "LoginHostCommand"),
+        (server.LOGOUT, "qpc.server.logout_host", "LogoutHostCommand"),
+        (server.STATUS, "qpc.server.status", "ServerStatusCommand"),
+    ),
+    cred.SUBCOMMAND: (
+        (cred.ADD, "qpc.cred.add", "CredAddCommand"),
+        (cred.LIST, "qpc.cred.list", "CredListCommand"),
+        (cred.EDIT, "qpc.cred.edit", "CredEditCommand"),
+        (cred.SHOW, "qpc.cred.show", "CredShowCommand"),
+        (cred.CLEAR, "qpc.cred.clear", "CredClearCommand"),
+    ),
+    source.SUBCOMMAND: (
+        (source.ADD, "qpc.source.add", "SourceAddCommand"),
+        (source.LIST, "qpc.source.list", "SourceListCommand"),
+        (source.SHOW, "qpc.source.show", "SourceShowCommand"),
+        (source.CLEAR, "qpc.source.clear", "SourceClearCommand"),
+        (source.EDIT, "qpc.source.edit", "SourceEditCommand"),
+    ),
+    scan.SUBCOMMAND: (
+        (scan.ADD, "qpc.scan.add", "ScanAddCommand"),
+        (scan.START, "qpc.scan.start", "ScanStartCommand"),
+        (scan.LIST, "qpc.scan.list", "ScanListCommand"),
+        (scan.SHOW, "qpc.scan.show", "ScanShowCommand"),
+        (scan.PAUSE, "qpc.scan.pause", "ScanPauseCommand"),
+        (scan.CANCEL, "qpc.scan.cancel", "ScanCancelCommand"),
+        (scan.RESTART, "qpc.scan.restart", "ScanRestartCommand"),
+        (scan.EDIT, "qpc.scan.edit", "ScanEditCommand"),
+        (scan.CLEAR, "qpc.scan.clear", "ScanClearCommand"),
+        (scan.JOB, "qpc.scan.job", "ScanJobCommand"),
+    ),
+    report.SUBCOMMAND: (
+        (report.DEPLOYMENTS, "qpc.report.deployments", "ReportDeploymentsCommand"),
+        (report.DETAILS, "qpc.report.details", "ReportDetailsCommand"),
+        (report.INSIGHTS, "qpc.report.insights", "ReportInsightsCommand"),
+        (report.DOWNLOAD, "qpc.report.download", "ReportDownloadCommand"),
+        (report.MERGE, "qpc.report.merge", "ReportMergeCommand"),
+        (report.MERGE_STATUS, "qpc.report.merge_status", "ReportMergeStatusCommand"),
+        (report.UPLOAD, "qpc.report.upload", "ReportUploadCommand"),
+    ),
+    insights.SUBCOMMAND: (
+        (insights.CONFIG, "qpc.insights.configure", "InsightsConfigureCommand"),
+        (insights.ADD_LOGIN, "qpc.insights.login", "InsightsAddLoginCommand"),
+        (insights.PUBLISH, "qpc.insights.publish", "InsightsPublishCommand"),
+    ),
+}
+
+
+class VersionAction(Action):
+    """Print the qpc version and exit, reading the version only then."""
+
+    def __init__(self, option_strings, dest=SUPPRESS, default=SUPPRESS, help=None):
+        """Create an action taking no value."""
+        super().__init__(
+            option_strings,
+            dest=dest,
+            default=default,
+            nargs=0,
+            help=help or "show program's version number and exit",
+        )
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        """Print the version like argparse's version action."""
+        from qpc.release import VERSION
+
+        print(VERSION)
+        parser.exit()
+
 
 class CLI:
     """Defines the CLI class.
@@ -75,96 +118,108 @@ class CLI:
         self.shortdesc = shortdesc
         if shortdesc is not None and description is None:
             description = shortdesc
-        self.parser = ArgumentParser(usage=usage, description=description)
-        self.parser.add_argument("--version", action="version", version=VERSION)
-        self.parser.add_argument(
+        self.usage = usage
+        self.description = description
+        self.name = name
+        self.args = None
+        self.command = None
+        self.parser = self._build_parser()
+        # parsers built so far, with the command object each one runs, kept
+        # for the next command lines parsed
+        self.built = {None: (self.parser, None)}
+
+        ensure_data_dir_exists()
+        ensure_config_dir_exists()
+
+    def _build_parser(self, command=None):
+        """Build the argument parser.
+
+        Every action gets an empty placeholder parser, so the parser only
+        knows subcommand and action names, except for the (subcommand,
+        action) pair in command: its module is imported and its command
+        object, saved in self.command, adds the real parser.
+        """
+        parser = ArgumentParser(usage=self.usage, description=self.description)
+        parser.add_argument("--version", action=VersionAction)
+        parser.add_argument(
             "-v",
             dest="verbosity",
             action="count",
             default=0,
             help=_(messages.VERBOSITY_HELP),
         )
-        self.subparsers = self.parser.add_subparsers(dest="subcommand")
-        self.name = name
-        self.args = None
-        self.subcommands = {}
-        self._add_subcommand(
-            server.SUBCOMMAND,
-            [
-                ConfigureHostCommand,
-                LoginHostCommand,
-                LogoutHostCommand,
-                ServerStatusCommand,
-            ],
+        parser.add_argument(
+            "--jobs",
+            dest="jobs",
+            metavar="N",
+            type=validate_positive_int,
+            default=DEFAULT_JOBS,
+            help=_(messages.JOBS_HELP) % DEFAULT_JOBS,
         )
-        self._add_subcommand(
-            cred.SUBCOMMAND,
-            [
-                CredAddCommand,
-                CredListCommand,
-                CredEditCommand,
-                CredShowCommand,
-                CredClearCommand,
-            ],
+        parser.add_argument(
+            "--timeout",
+            dest="timeout",
+            metavar="SECONDS",
+            type=validate_positive_float,
+            help=_(messages.TIMEOUT_HELP),
         )
-        self._add_subcommand(
-            source.SUBCOMMAND,
-            [
-                SourceAddCommand,
-                SourceListCommand,
-                SourceShowCommand,
-                SourceClearCommand,
-                SourceEditCommand,
-            ],
+        parser.add_argument(
+            "--deadline",
+            dest="deadline",
+            metavar="SECONDS",
+            type=validate_positive_float,
+            help=_(messages.DEADLINE_HELP),
         )
+        subparsers = parser.add_subparsers(dest="subcommand")
+        for subcommand, actions in SUBCOMMANDS.items():
+            subcommand_parser = subparsers.add_parser(subcommand)
+            action_subparsers = subcommand_parser.add_subparsers(dest="action")
+            for action, module_name, class_name in actions:
+                if (subcommand, action) == command:
+                    command_class = getattr(import_module(module_name), class_name)
+                    self.command = command_class(action_subparsers)
+                else:
+                    # without help, "--help" is left for the real parser
+                    action_subparsers.add_parser(action, add_help=False)
+        batch.add_parser(subparsers)
+        shell.add_parser(subparsers)
+        return parser
 
-        self._add_subcommand(
-            scan.SUBCOMMAND,
-            [
-                ScanAddCommand,
-                ScanStartCommand,
-                ScanListCommand,
-                ScanShowCommand,
-                ScanPauseCommand,
-                ScanCancelCommand,
-                ScanRestartCommand,
-                ScanEditCommand,
-                ScanClearCommand,
-                ScanJobCommand,
-            ],
-        )
-        self._add_subcommand(
-            report.SUBCOMMAND,
-            [
-                ReportDeploymentsCommand,
-                ReportDetailsCommand,
-                ReportInsightsCommand,
-                ReportDownloadCommand,
-                ReportMergeCommand,
-                ReportMergeStatusCommand,
-                ReportUploadCommand,
-            ],
-        )
-        self._add_subcommand(
-            insights.SUBCOMMAND,
-            [
-                InsightsConfigureCommand,
-                InsightsAddLoginCommand,
-                InsightsPublishCommand,
-            ],
-        )
+    def build_command(self, subcommand, action):
+        """Build the parser running an action, returning its command object.
 
-        ensure_data_dir_exists()
-        ensure_config_dir_exists()
+        The parser is only built the first time an action runs. Every run
+        gets a copy of the command object as it was built, so the state a
+        previous run left in it is not seen.
+
+        :param subcommand: the subcommand of the action (i.e. cred)
+        :param action: the action (i.e. add)
+        :returns: the command object, None if the action does not exist
+        """
+        key = (subcommand, action)
+        if key not in self.built:
+            self.command = None
+            self.built[key] = (self._build_parser(key), self.command)
+        self.parser, command = self.built[key]
+        self.command = None if command is None else copy(command)
+        return self.command
 
-    def _add_subcommand(self, subcommand, actions):
-        subcommand_parser = self.subparsers.add_parser(subcommand)
-        action_subparsers = subcommand_parser.add_subparsers(dest="action")
-        self.subcommands[subcommand] = {}
-        for action in actions:
-            action_inst = action(action_subparsers)
-            action_dic = self.subcommands[action.SUBCOMMAND]
-            action_dic[action.ACTION] = action_inst
+    def parse_args(self, argv=None):
+        """Parse the command line, building the parser of the action run.
+
+        :param argv: the arguments to parse, defaults to sys.argv
+        :returns: the parsed arguments, also saved in self.args
+        """
+        # find out which action runs, then parse again with its real parser
+        self.args = None
+        self.command = None
+        self.parser = self.built[None][0]
+        args, _unknown = self.parser.parse_known_args(argv)
+        action = getattr(args, "action", None)
+        if args.subcommand is not None and action is not None:
+            self.build_command(args.subcommand, action)
+        self.args = self.parser.parse_args(argv)
+        return self.args
 
     def main(self):
         """Execute of subcommand operation.
@@ -173,8 +228,53 @@ class CLI:
         to find the best command match. If no match is found the
         usage is displayed
         """
-        self.args = self.parser.parse_args()
+        self.parse_args()
         setup_logging(self.args.verbosity)
+        # imported here so --help, --version and usage errors do not load
+        # requests; the command module has usually imported it already
+        from qpc.request import set_deadline, set_max_jobs, set_timeout
+
+        set_max_jobs(self.args.jobs)
+        set_timeout(self.args.timeout)
+        set_deadline(self.args.deadline)
+        if self.args.subcommand == batch.SUBCOMMAND:
+            sys.exit(batch.main(self.args))
+        if self.args.subcommand == shell.SUBCOMMAND:
+            sys.exit(shell.main(self.args))
+        self.run_command()
+
+    def run(self, argv):
+        """Run a command line in the running process, as qpc batch does.
+
+        Logging and request settings are left as the running process set
+        them, and qpc batch or qpc shell cannot be started again.
+
+        :param argv: the command line arguments, without the leading qpc
+        :returns: the exit code the command would have ended qpc with
+        """
+        try:
+            self.parse_args(argv)
+            if self.args.subcommand in (batch.SUBCOMMAND, shell.SUBCOMMAND):
+                logger.error(_(messages.NESTED_COMMAND_ERROR), self.args.subcommand)
+                return 1
+            self.run_command()
+        except SystemExit as exit_:
+            if exit_.code is None:
+                return 0
+            if isinstance(exit_.code, int):
+                return exit_.code
+            return 1
+        return 0
+
+    def run_command(self):
+        """Check the server configuration, then run the parsed command.
+
+        Errors end the command with sys.exit(), like when qpc runs it.
+        Every command gets a new retry budget and deadline.
+        """
+        from qpc.request import start_command
+
+        start_command()
         is_server_cmd = self.args.subcommand == server.SUBCOMMAND
         is_server_logout = is_server_cmd and self.args.action == server.LOGOUT
         is_server_config = is_server_cmd and self.args.action == server.CONFIG
@@ -191,12 +291,14 @@ class CLI:
                 logger.error(_(messages.SERVER_LOGIN_REQUIRED), PKG_NAME)
                 sys.exit(1)
 
-        if self.args.subcommand in self.subcommands:
-            subcommand = self.subcommands[self.args.subcommand]
-            if self.args.action in subcommand:
-                action = subcommand[self.args.action]
-                action.main(self.args)
-            else:
-                self.parser.print_help()
-        else:
+        if self.command is None:
             self.parser.print_help()
+            return
+        try:
+            self.command.main(self.args)
+        finally:
+            if self.args.action in completion.CHANGING_ACTIONS:
+                completion.forget_names(self.args.subcommand)
+                if self.args.subcommand in resolver.URIS:
+                    name = getattr(self.args, "name", None)
+                    resolver.forget(self.args.subcommand, [name] if name else None)
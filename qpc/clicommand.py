@@ -1,9 +1,30 @@
 """Base CLI Command Class."""
 
 import sys
+from http import HTTPStatus
 
-from qpc.request import request
-from qpc.utils import QPC_MIN_SERVER_VERSION, handle_error_response, log_args
+from qpc import messages, resolver
+from qpc.output import JSON, add_format_argument, get_format, write_records
+from qpc.pagination import Pager
+from qpc.request import DELETE, GET, request, request_many
+from qpc.translation import _
+from qpc.utils import (
+    CONFIG_PREFETCH_PAGES,
+    QPC_MIN_SERVER_VERSION,
+    get_server_setting,
+    handle_error_response,
+    log_args,
+    logger,
+    validate_page_size,
+)
+
+# query parameters of the server filtering lists by a substring of the name,
+# and sorting them
+NAME_CONTAINS_PARAM = "search_by_name"
+ORDERING_PARAM = "ordering"
+
+# errors answering a request sent with the stale id of a named object
+STALE_ID_CODES = (HTTPStatus.NOT_FOUND, HTTPStatus.BAD_REQUEST)
 
 
 class CliCommand:
@@ -23,7 +44,9 @@ class CliCommand:
         self.req_payload = None
         self.req_params = None
         self.req_headers = None
+        self.req_stream = False
         self.response = None
+        self.resolved = None
 
         # If you add or change API, you must update these versions
         # this includes self.min_server_version
@@ -32,6 +55,26 @@ class CliCommand:
     def _validate_args(self):
         """Sub-commands can override."""
 
+    def _resolve_names(self, fresh=False):
+        """Sub-commands taking objects by name override to resolve their ids.
+
+        Ids are set where the request uses them, i.e. in self.req_path.
+
+        :param fresh: True to look the names up on the server, ignoring the
+            ids saved by the resolver
+        :returns: the ids resolved, None if the command takes no names
+        """
+        return None
+
+    def _resolve_again(self):
+        """Look the names up on the server again, True if their ids changed."""
+        if self.resolved is None:
+            return False
+        resolved = self._resolve_names(fresh=True)
+        changed = resolved != self.resolved
+        self.resolved = resolved
+        return changed
+
     def _build_req_params(self):
         """Sub-commands can override to construct request parameters."""
 
@@ -54,6 +97,21 @@ class CliCommand:
         """
         self._build_req_params()
         self._build_data()
+        self._send_request()
+        if self.response.status_code in STALE_ID_CODES and self._resolve_again():
+            # the ids saved by the resolver were stale
+            self.response.close()
+            self._build_data()
+            self._send_request()
+
+        if self.response.status_code not in self.success_codes:
+            # handle error cases
+            self._handle_response_error()
+        else:
+            self._handle_response_success()
+
+    def _send_request(self):
+        """Send the command request, saving the response in self.response."""
         self.response = request(
             method=self.req_method,
             path=self.req_path,
@@ -62,14 +120,9 @@ class CliCommand:
             headers=self.req_headers,
             parser=self.parser,
             min_server_version=self.min_server_version,
+            stream=self.req_stream,
         )
 
-        if self.response.status_code not in self.success_codes:
-            # handle error cases
-            self._handle_response_error()
-        else:
-            self._handle_response_success()
-
     def main(self, args):
         """Trigger main command flow.
 
@@ -78,6 +131,280 @@ class CliCommand:
         """
         self.args = args
         self._validate_args()
+        self.resolved = self._resolve_names()
         log_args(self.args)
 
         self._do_command()
+
+
+class ClearCliCommand(CliCommand):
+    """Base class for commands deleting credentials, sources or scans.
+
+    The objects are found by a GET request to req_path, which is also the
+    path their ids are deleted under. Several objects are deleted
+    concurrently. Sub-classes set the REMOVED and FAILED_TO_REMOVE messages,
+    logged with the name of each object.
+    """
+
+    REMOVED = None
+    FAILED_TO_REMOVE = None
+
+    def _delete_uri(self, entry):
+        return self.req_path + str(entry["id"]) + "/"
+
+    def _delete_entry(self, entry, print_out=True):
+        response = request(DELETE, self._delete_uri(entry), parser=self.parser)
+        return self._check_deleted(entry, response, print_out)
+
+    def _check_deleted(self, entry, response, print_out=True):
+        deleted = False
+        name = entry["name"]
+        if response is not None and response.status_code == HTTPStatus.NO_CONTENT:
+            deleted = True
+            if print_out:
+                logger.info(_(self.REMOVED), name)
+        else:
+            if response is not None:
+                handle_error_response(response)
+            if print_out:
+                logger.error(_(self.FAILED_TO_REMOVE), name)
+        return deleted
+
+    def _delete_entries(self, entries):
+        """Delete entries concurrently, returning the ones that failed."""
+        specs = [(DELETE, self._delete_uri(entry), None, None) for entry in entries]
+        failed = []
+        for entry, result in zip(entries, request_many(specs, parser=self.parser)):
+            # errors in result.error were already logged by request_many
+            response = None if result.error else result.response
+            if not self._check_deleted(entry, response, print_out=False):
+                failed.append(entry)
+        return failed
+
+
+class ListCliCommand(CliCommand):
+    """Base class for commands listing objects a page at a time.
+
+    Each page of results is printed after the user asks for it. With --all,
+    the remaining pages are fetched concurrently once the first one tells
+    how many there are, and all the results are printed as a single list,
+    in order, as the pages arrive. The size of the pages is picked by a
+    Pager from --page-size; in auto mode, pages are requested one at a time
+    until the Pager settles on their size. The records are written in the
+    --format format.
+
+    Filters are sent to the server as query parameters, and applied again
+    to the results received, with a warning, in case the server ignored
+    them. Results are printed in the order of the server, which sorts them
+    by --ordering. The ids of the credentials, sources or scans listed are
+    saved by the resolver.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self, subcommand, action, parser, req_method, req_path, success_codes
+    ):
+        """Create list command base object."""
+        CliCommand.__init__(
+            self, subcommand, action, parser, req_method, req_path, success_codes
+        )
+        self.pager = None
+        self.filters = []
+        self.unapplied_filters = set()
+        self.listed = []
+        self.parser.add_argument(
+            "--all",
+            dest="all_pages",
+            action="store_true",
+            help=_(messages.LIST_ALL_HELP),
+        )
+        self.parser.add_argument(
+            "--page-size",
+            dest="page_size",
+            metavar="SIZE",
+            type=validate_page_size,
+            help=_(messages.PAGE_SIZE_HELP),
+        )
+        self.parser.add_argument(
+            "--fields",
+            dest="fields",
+            metavar="FIELD",
+            nargs="+",
+            help=_(messages.LIST_FIELDS_HELP),
+        )
+        add_format_argument(self.parser)
+
+    def _add_filter_arguments(self):
+        """Add the --name-contains and --ordering options."""
+        self.parser.add_argument(
+            "--name-contains",
+            dest="name_contains",
+            metavar="TEXT",
+            help=_(messages.LIST_NAME_CONTAINS_HELP),
+        )
+        self.parser.add_argument(
+            "--ordering",
+            dest="ordering",
+            metavar="FIELDS",
+            help=_(messages.LIST_ORDERING_HELP),
+        )
+
+    def _add_filter(self, param, value, matches=None):
+        """Filter the results on the server, and locally if it does not.
+
+        :param param: the query parameter of the filter
+        :param value: the value of the query parameter
+        :param matches: callable telling whether a result passes the filter,
+            by default when its param field is value
+        """
+        if matches is None:
+
+            def matches(result):
+                return result.get(param) == value
+
+        self.req_params[param] = value
+        self.filters.append((param, matches))
+
+    def _do_command(self):
+        page_size = None
+        if "page_size" in self.args:
+            page_size = self.args.page_size
+        self.pager = Pager(page_size)
+        # drop the parameters of a previous run
+        self.req_params = {}
+        self.filters = []
+        self.unapplied_filters = set()
+        self.listed = []
+        if "name_contains" in self.args and self.args.name_contains:
+            text = self.args.name_contains.casefold()
+            self._add_filter(
+                NAME_CONTAINS_PARAM,
+                self.args.name_contains,
+                lambda result: text in result.get("name", "").casefold(),
+            )
+        if "ordering" in self.args and self.args.ordering:
+            self.req_params[ORDERING_PARAM] = self.args.ordering
+        CliCommand._do_command(self)
+
+    def _send_request(self):
+        self.req_params = {**(self.req_params or {}), **self.pager.params()}
+        CliCommand._send_request(self)
+
+    def _handle_empty_list(self, json_data):
+        """Sub-commands override to report that there is nothing to list."""
+
+    def _handle_response_success(self):
+        json_data = self.response.json()
+        if not json_data.get("count", 0):
+            self._handle_empty_list(json_data)
+            return
+        output_format = get_format(self.args)
+        fields = _fields(self.args)
+        results = self._filter(self.pager.update(self.response, json_data))
+        all_pages = "all_pages" in self.args and self.args.all_pages
+        if all_pages:
+            pages = self._all_pages(results, json_data["count"])
+        else:
+            pages = self._next_pages(results, json_data["count"])
+        try:
+            if output_format == JSON and not all_pages:
+                # each page is printed as a list of its own
+                for page in pages:
+                    write_records([page], fields=fields)
+            else:
+                write_records(pages, output_format, fields)
+        finally:
+            resolver.remember(self.subcommand, self.listed)
+
+    def _filter(self, results):
+        """Drop the results that the server did not filter out."""
+        if self.req_path == resolver.URIS.get(self.subcommand):
+            self.listed.extend(resolver.entries(self.subcommand, results))
+        for param, matches in self.filters:
+            kept = [result for result in results if matches(result)]
+            if len(kept) < len(results) and param not in self.unapplied_filters:
+                logger.warning(_(messages.LIST_FILTER_NOT_APPLIED), param)
+                self.unapplied_filters.add(param)
+            results = kept
+        return results
+
+    def _next_pages(self, results, count):
+        """Yield the results of every page, asking before showing the next.
+
+        While a page is shown, the next prefetch_pages pages are fetched in
+        the background. They are dropped when the user stops paging.
+        """
+        yield results
+        while self.pager.tuning:
+            if not _ask_next_page():
+                return
+            yield self._tuned_page()
+        remaining = self.pager.remaining_params(count)
+        responses = self._request_pages(
+            remaining, prefetch=get_server_setting(CONFIG_PREFETCH_PAGES)
+        )
+        try:
+            for _params in remaining:
+                if not _ask_next_page():
+                    return
+                yield self._page_results(next(responses))
+        finally:
+            responses.close()
+
+    def _all_pages(self, results, count):
+        """Yield the results of every page, starting with the first one."""
+        yield results
+        while self.pager.tuning:
+            yield self._tuned_page()
+        for result in self._request_pages(self.pager.remaining_params(count)):
+            yield self._page_results(result)
+
+    def _request_pages(self, pages_params, prefetch=None):
+        """Request pages concurrently, returning a request_many() generator."""
+        specs = [
+            (GET, self.req_path, {**(self.req_params or {}), **params}, None)
+            for params in pages_params
+        ]
+        return request_many(
+            specs,
+            parser=self.parser,
+            min_server_version=self.min_server_version,
+            prefetch=prefetch,
+        )
+
+    def _tuned_page(self):
+        """Request the next page alone, sizing the pages after it from it."""
+        (result,) = self._request_pages([self.pager.params()])
+        return self._page_results(result, update=True)
+
+    def _page_results(self, result, update=False):
+        """Return the results of a page, exiting if it could not be fetched.
+
+        With update, the page is accounted for by the pager, which picks the
+        next one.
+        """
+        if result.error is not None:
+            # already logged by request_many
+            sys.exit(1)
+        if result.response.status_code not in self.success_codes:
+            self._handle_response_error(result.response)
+        json_data = result.response.json()
+        if update:
+            return self._filter(self.pager.update(result.response, json_data))
+        return self._filter(json_data.get("results", []))
+
+
+def _fields(args):
+    """Return the fields given to --fields, None to print all of them."""
+    if "fields" not in args or not args.fields:
+        return None
+    return [field for value in args.fields for field in value.split(",") if field]
+
+
+def _ask_next_page():
+    """Ask whether to show the next page, False if the user stops."""
+    try:
+        answer = input(_(messages.NEXT_RESULTS))
+    except EOFError:
+        print()
+        return False
+    return answer.strip().lower() != "q"
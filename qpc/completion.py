@@ -0,0 +1,289 @@
+"""Completion of qpc command lines for bash, zsh and qpc shell.
+
+``qpc __complete WORD...`` prints the completions of the last word of a qpc
+command line, one per line, for the scripts printed by
+``qpc __complete --script bash|zsh``. Credential, source and scan names are
+read from QPC_NAME_INDEX, keyed by server location, so completing never
+waits for the server: names older than the name_index_ttl seconds set in
+server.config are refreshed by a background ``qpc __complete --refresh``
+process, and commands adding, editing or clearing objects drop the names of
+their kind.
+"""
+
+import json
+import subprocess
+import sys
+import time
+
+from qpc import cred, messages, scan, source, utils
+from qpc.translation import _
+from qpc.utils import (
+    CONFIG_NAME_INDEX_TTL,
+    get_server_location,
+    get_server_setting,
+    logger,
+    read_snapshot,
+    write_json_atomically,
+)
+
+COMMAND = "__complete"
+SCRIPT_OPTION = "--script"
+REFRESH_OPTION = "--refresh"
+
+NAMES_KEY = "names"
+UPDATED_KEY = "updated"
+REFRESHING_KEY = "refreshing"
+
+# seconds after which a refresh that did not complete may be started again
+REFRESH_TIMEOUT = 60
+
+# objects whose names are completed, with the list returning them
+NAME_URIS = {
+    cred.SUBCOMMAND: cred.CREDENTIAL_URI,
+    source.SUBCOMMAND: source.SOURCE_URI,
+    scan.SUBCOMMAND: scan.SCAN_URI,
+}
+
+# options taking names, per subcommand, mapped to the kind of name
+NAME_OPTIONS = {
+    cred.SUBCOMMAND: {"--name": cred.SUBCOMMAND},
+    source.SUBCOMMAND: {"--name": source.SUBCOMMAND, "--cred": cred.SUBCOMMAND},
+    scan.SUBCOMMAND: {"--name": scan.SUBCOMMAND, "--sources": source.SUBCOMMAND},
+}
+
+# actions changing the names of the objects of their subcommand; the same
+# for cred, source and scan
+CHANGING_ACTIONS = (cred.ADD, cred.EDIT, cred.CLEAR)
+
+SCRIPTS = {
+    "bash": """\
+_qpc_complete() {
+    local IFS=$'\\n'
+    COMPREPLY=($(qpc __complete "${COMP_WORDS[@]:1:COMP_CWORD}" 2>/dev/null))
+}
+complete -o default -F _qpc_complete qpc
+""",
+    "zsh": """\
+#compdef qpc
+_qpc_complete() {
+    local -a candidates
+    candidates=("${(@f)$(qpc __complete "${(@)words[2,CURRENT]}" 2>/dev/null)}")
+    compadd -a candidates
+}
+compdef _qpc_complete qpc
+""",
+}
+
+
+def main(argv):
+    """Answer qpc __complete.
+
+    :param argv: the arguments following __complete
+    :returns: the exit code of qpc __complete
+    """
+    if argv[:1] == [SCRIPT_OPTION]:
+        if len(argv) != 2 or argv[1] not in SCRIPTS:
+            logger.error(_(messages.COMPLETE_SCRIPT_USAGE), ",".join(SCRIPTS))
+            return 2
+        print(SCRIPTS[argv[1]], end="")
+        return 0
+    if argv[:1] == [REFRESH_OPTION]:
+        if len(argv) != 2 or argv[1] not in NAME_URIS:
+            return 2
+        refresh_names(argv[1])
+        return 0
+    for candidate in candidates(argv or [""], get_names):
+        print(candidate)
+    return 0
+
+
+def candidates(words, names):
+    """Return the completions of the last of the words of a command line.
+
+    :param words: the words following qpc, the last one being completed
+    :param names: callable returning the names of a kind of objects
+    :returns: list of completions starting with the last word
+    """
+    from qpc import batch, shell
+    from qpc.cli import CLI, SUBCOMMANDS
+
+    *previous, text = words
+    previous = [word for word in previous if word != "="]
+    global_options = _options(CLI().parser)
+    while previous and previous[0].startswith("-"):
+        option = previous.pop(0)
+        if global_options.get(option) and previous:
+            # skip the option value
+            previous.pop(0)
+
+    if not previous:
+        if text.startswith("-"):
+            found = list(global_options)
+        else:
+            found = [*SUBCOMMANDS, batch.SUBCOMMAND, shell.SUBCOMMAND]
+    elif previous[0] not in SUBCOMMANDS:
+        found = []
+    elif len(previous) == 1:
+        found = [action for action, *_module in SUBCOMMANDS[previous[0]]]
+    elif text.startswith("-"):
+        found = list(_action_options(previous[0], previous[1]))
+    else:
+        found = _names_for(previous, names)
+    return [candidate for candidate in found if candidate.startswith(text)]
+
+
+def get_names(kind):
+    """Return the indexed names of a kind of objects of the configured server.
+
+    Names older than name_index_ttl seconds, or not indexed yet, are
+    returned as they are while a background process refreshes them.
+
+    :param kind: the subcommand managing the objects (i.e. cred)
+    :returns: list of names
+    """
+    if get_server_location() is None:
+        return []
+    entry = _server_index().get(kind)
+    if not isinstance(entry, dict):
+        entry = {}
+    now = time.time()
+    age = now - entry.get(UPDATED_KEY, 0)
+    refreshing = now - entry.get(REFRESHING_KEY, 0)
+    if not (
+        0 <= age < get_server_setting(CONFIG_NAME_INDEX_TTL)
+        or 0 <= refreshing < REFRESH_TIMEOUT
+    ):
+        _update_entry(kind, {**entry, REFRESHING_KEY: now})
+        _start_refresh(kind)
+    return entry.get(NAMES_KEY, [])
+
+
+def refresh_names(kind):
+    """Fetch the names of a kind of objects and save them in the index.
+
+    :param kind: the subcommand managing the objects (i.e. cred)
+    """
+    names = fetch_names(NAME_URIS[kind])
+    if names is not None:
+        _update_entry(kind, {NAMES_KEY: names, UPDATED_KEY: time.time()})
+
+
+def forget_names(kind):
+    """Drop the indexed names of a kind of objects of the configured server.
+
+    :param kind: the subcommand managing the objects (i.e. cred)
+    """
+    if kind in _server_index():
+        _update_entry(kind, None)
+
+
+def fetch_names(uri):
+    """Return the names of all the objects listed at uri.
+
+    :param uri: the list of objects (i.e. /api/v1/credentials/)
+    :returns: list of names, or None if they could not be fetched
+    """
+    from http import HTTPStatus
+
+    from qpc.pagination import Pager
+    from qpc.request import GET, request
+
+    names = []
+    pager = Pager()
+    try:
+        while pager.more:
+            response = request(GET, uri, params=pager.params())
+            if response.status_code != HTTPStatus.OK:
+                return None
+            results = pager.update(response, response.json())
+            names.extend(result["name"] for result in results)
+    except SystemExit:
+        # the error was already reported
+        return None
+    return names
+
+
+def _options(parser):
+    """Map the options of parser to whether they take a value."""
+    return {
+        option: action.nargs != 0
+        for action in parser._actions
+        for option in action.option_strings
+    }
+
+
+def _action_options(subcommand, action):
+    from qpc.cli import CLI
+
+    command = CLI().build_command(subcommand, action)
+    if command is None:
+        return {}
+    return _options(command.parser)
+
+
+def _names_for(previous, names):
+    """Return the names taken by the last option of a command line."""
+    subcommand, action, *arguments = previous
+    options = [word for word in arguments if word.startswith("-")]
+    if not options or (action == cred.ADD and options[-1] == "--name"):
+        return []
+    kind = NAME_OPTIONS.get(subcommand, {}).get(options[-1])
+    if kind is None:
+        return []
+    return names(kind)
+
+
+def _start_refresh(kind):
+    try:
+        subprocess.Popen(  # noqa: S603
+            [sys.executable, "-m", "qpc", COMMAND, REFRESH_OPTION, kind],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as error:
+        logger.debug("Could not refresh the %s names: %s", kind, error)
+
+
+def _load_name_index():
+    with open(utils.QPC_NAME_INDEX, encoding="utf-8") as index_file:
+        try:
+            index = json.load(index_file)
+        except ValueError:
+            return {}
+    if not isinstance(index, dict):
+        return {}
+    return index
+
+
+def _read_index():
+    try:
+        return read_snapshot(utils.QPC_NAME_INDEX, _load_name_index)
+    except OSError:
+        return {}
+
+
+def _server_index():
+    server_index = _read_index().get(get_server_location())
+    if not isinstance(server_index, dict):
+        return {}
+    return server_index
+
+
+def _update_entry(kind, entry):
+    """Replace the names of a kind of objects, None removing them."""
+    location = get_server_location()
+    if location is None:
+        return
+    index = dict(_read_index())
+    server_index = dict(_server_index())
+    if entry is None:
+        server_index.pop(kind, None)
+    else:
+        server_index[kind] = entry
+    index[location] = server_index
+    try:
+        write_json_atomically(utils.QPC_NAME_INDEX, index)
+    except OSError as error:
+        logger.debug("Could not save the name index: %s", error)
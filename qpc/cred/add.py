@@ -1,9 +1,8 @@
 """CredAddCommand is used to add authentication credentials."""
 
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
 import qpc.cred as credential
 from qpc import messages
 from qpc.clicommand import CliCommand
@@ -34,7 +33,7 @@ class CredAddCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             POST,
             credential.CREDENTIAL_URI,
-            [codes.created],
+            [HTTPStatus.CREATED],
         )
 
         self.parser.add_argument(
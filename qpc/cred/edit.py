@@ -1,15 +1,14 @@
 """CredEditCommand is used to edit credentials."""
 
 import sys
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
 import qpc.cred as credential
-from qpc import messages
+from qpc import messages, resolver
 from qpc.clicommand import CliCommand
 from qpc.cred.utils import build_credential_payload
-from qpc.request import GET, PATCH, request
+from qpc.request import PATCH
 from qpc.translation import _
 
 logger = getLogger(__name__)
@@ -34,7 +33,7 @@ class CredEditCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             PATCH,
             credential.CREDENTIAL_URI,
-            [codes.ok],
+            [HTTPStatus.OK],
         )
         self.parser.add_argument(
             "--name",
@@ -113,27 +112,18 @@ class CredEditCommand(CliCommand):
             self.parser.print_help()
             sys.exit(1)
 
+    def _resolve_names(self, fresh=False):
         # check for existence of credential
-        response = request(
-            parser=self.parser,
-            method=GET,
-            path=credential.CREDENTIAL_URI,
-            params={"name": self.args.name},
-            payload=None,
+        found = resolver.resolve(
+            credential.SUBCOMMAND, [self.args.name], self.parser, fresh
         )
-        if response.status_code == codes.ok:
-            json_data = response.json()
-            count = json_data.get("count", 0)
-            if count == 1:
-                cred_entry = json_data.get("results")[0]
-                self.cred_type = cred_entry["cred_type"]
-                self.req_path = self.req_path + str(cred_entry["id"]) + "/"
-            else:
-                logger.error(_(messages.CRED_DOES_NOT_EXIST), self.args.name)
-                sys.exit(1)
-        else:
+        if not found:
             logger.error(_(messages.CRED_DOES_NOT_EXIST), self.args.name)
             sys.exit(1)
+        cred_entry = found[self.args.name]
+        self.cred_type = cred_entry["cred_type"]
+        self.req_path = credential.CREDENTIAL_URI + str(cred_entry["id"]) + "/"
+        return cred_entry["id"]
 
     def _build_data(self):
         """Construct the dictionary credential given our arguments.
@@ -1,16 +1,15 @@
 """CredShowCommand is used to show a specific credential."""
 
 import sys
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
 import qpc.cred as credential
-from qpc import messages
+from qpc import messages, resolver
 from qpc.clicommand import CliCommand
+from qpc.output import add_format_argument, get_format, write_record
 from qpc.request import GET
 from qpc.translation import _
-from qpc.utils import pretty_print
 
 logger = getLogger(__name__)
 
@@ -34,7 +33,7 @@ class CredShowCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             GET,
             credential.CREDENTIAL_URI,
-            [codes.ok],
+            [HTTPStatus.OK],
         )
         self.parser.add_argument(
             "--name",
@@ -43,6 +42,7 @@ class CredShowCommand(CliCommand):
             help=_(messages.CRED_NAME_HELP),
             required=True,
         )
+        add_format_argument(self.parser)
 
     def _build_req_params(self):
         self.req_params = {"name": self.args.name}
@@ -52,8 +52,8 @@ class CredShowCommand(CliCommand):
         count = json_data.get("count", 0)
         if count == 1:
             cred_entry = json_data.get("results")[0]
-            data = pretty_print(cred_entry)
-            print(data)
+            resolver.remember(self.SUBCOMMAND, [cred_entry])
+            write_record(cred_entry, get_format(self.args))
         else:
             logger.error(_(messages.CRED_DOES_NOT_EXIST), self.args.name)
             sys.exit(1)
@@ -1,4 +1,5 @@
 """Test the CLI module."""
+import json
 import sys
 import unittest
 from argparse import ArgumentParser, Namespace  # noqa: I100
@@ -146,3 +147,106 @@ class CredentialListCliTests(unittest.TestCase):
                     cred_out.getvalue().replace("\n", "").replace(" ", "").strip(),
                     expected,
                 )
+
+    @patch("builtins.input")
+    def test_list_cred_all(self, b_input):
+        """Testing the list credential command printing every page at once."""
+        cred_out = StringIO()
+        url = get_server_location() + CREDENTIAL_URI
+        pages = [
+            {
+                "count": 5,
+                "next": f"{url}?page={page + 1}" if page < 3 else None,
+                "results": [{"id": id_, "name": f"cred{id_}"} for id_ in ids],
+            }
+            for page, ids in ((1, (1, 2)), (2, (3, 4)), (3, (5,)))
+        ]
+        with requests_mock.Mocker() as mocker:
+            mocker.get(url, status_code=200, json=pages[0])
+            mocker.get(f"{url}?page=2", status_code=200, json=pages[1])
+            mocker.get(f"{url}?page=3", status_code=200, json=pages[2])
+
+            args = Namespace(all_pages=True)
+            with redirect_stdout(cred_out):
+                self.command.main(args)
+            self.assertEqual(
+                json.loads(cred_out.getvalue()),
+                [{"id": id_, "name": f"cred{id_}"} for id_ in range(1, 6)],
+            )
+            self.assertEqual(mocker.call_count, 3)
+            b_input.assert_not_called()
+
+    def test_list_cred_all_page_err(self):
+        """Testing the list credential command with a failing page and --all."""
+        cred_out = StringIO()
+        url = get_server_location() + CREDENTIAL_URI
+        data = {
+            "count": 2,
+            "next": f"{url}?page=2",
+            "results": [{"id": 1, "name": "cred1"}],
+        }
+        with requests_mock.Mocker() as mocker:
+            mocker.get(url, status_code=200, json=data)
+            mocker.get(f"{url}?page=2", status_code=500, json={"error": ["Failed"]})
+
+            args = Namespace(all_pages=True)
+            with self.assertRaises(SystemExit):
+                with redirect_stdout(cred_out):
+                    self.command.main(args)
+
+    def test_list_cred_page_size(self):
+        """Testing the list credential command with a page size."""
+        cred_out = StringIO()
+        url = get_server_location() + CREDENTIAL_URI
+        data = {"count": 1, "next": None, "results": [{"id": 1, "name": "cred1"}]}
+        with requests_mock.Mocker() as mocker:
+            mocker.get(url, status_code=200, json=data)
+
+            args = Namespace(page_size=500)
+            with redirect_stdout(cred_out):
+                self.command.main(args)
+            self.assertEqual(mocker.last_request.qs, {"page_size": ["500"]})
+
+    @patch("builtins.input")
+    def test_list_cred_ndjson(self, b_input):
+        """Testing the list credential command writing a record per line."""
+        cred_out = StringIO()
+        url = get_server_location() + CREDENTIAL_URI
+        data = {
+            "count": 2,
+            "next": f"{url}?page=2",
+            "results": [{"id": 1, "name": "cred1"}],
+        }
+        data2 = {"count": 2, "next": None, "results": [{"id": 2, "name": "cred2"}]}
+        with requests_mock.Mocker() as mocker:
+            mocker.get(url, status_code=200, json=data)
+            mocker.get(f"{url}?page=2", status_code=200, json=data2)
+
+            args = Namespace(output_format="ndjson")
+            with redirect_stdout(cred_out):
+                self.command.main(args)
+            self.assertEqual(
+                cred_out.getvalue(),
+                '{"id": 1, "name": "cred1"}\n{"id": 2, "name": "cred2"}\n',
+            )
+            b_input.assert_called_once()
+
+    @patch("builtins.input", side_effect=["q", EOFError])
+    def test_list_cred_stop_paging(self, b_input):
+        """Testing the list credential command when the user stops paging."""
+        url = get_server_location() + CREDENTIAL_URI
+        data = {
+            "count": 3,
+            "next": f"{url}?page=2",
+            "results": [{"id": 1, "name": "cred1"}],
+        }
+        with requests_mock.Mocker() as mocker:
+            mocker.get(url, status_code=200, json=data)
+            for _attempt in range(2):
+                cred_out = StringIO()
+                with redirect_stdout(cred_out):
+                    self.command.main(Namespace())
+                self.assertEqual(
+                    json.loads(cred_out.getvalue()), [{"id": 1, "name": "cred1"}]
+                )
+            self.assertEqual(b_input.call_count, 2)
@@ -8,3 +8,11 @@ class QPCError(Exception):
         """Take message as mandatory attribute."""
         super().__init__(message, *args)
         self.message = message
+
+
+class QPCRequestError(QPCError):
+    """Class for errors returned while talking to the server."""
+
+
+class QPCDeadlineError(QPCRequestError):
+    """The command deadline passed before a request could be sent."""
@@ -0,0 +1,348 @@
+"""On-disk HTTP validation cache for GET requests.
+
+Every entry is a pair of files in QPC_HTTP_CACHE named after the cache key:
+``<key>.body`` holds the response body and ``<key>.json`` the response
+headers. Entries are only kept for responses carrying an ETag or a
+Last-Modified header, and are always revalidated with the server, which
+answers 304 Not Modified when the stored body is still current. The
+modification time of the headers file records the last use of an entry for
+the least recently used eviction.
+"""
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from qpc import utils
+from qpc.utils import (
+    CONFIG_HTTP_CACHE_SIZE,
+    STREAM_CHUNK_SIZE,
+    get_server_setting,
+    logger,
+    write_json_atomically,
+)
+
+BODY_SUFFIX = ".body"
+HEADERS_SUFFIX = ".json"
+
+# response headers saved with a cached body
+STORED_HEADERS = (
+    "Content-Disposition",
+    "Content-Type",
+    "ETag",
+    "Last-Modified",
+    "X-Server-Version",
+)
+
+# headers describing the wire encoding of a body that iter_content() decodes
+ENCODING_HEADERS = ("Content-Encoding", "Content-Length", "Transfer-Encoding")
+
+
+def cache_key(url, params=None, headers=None):
+    """Return the key identifying the cached response to a GET request.
+
+    :param url: full url of the request, including the server location
+    :param params: uri encoding params of the request
+    :param headers: request headers; only Accept selects a cached variant
+    :returns: hex digest naming the cache entry
+    """
+    params = sorted((str(key), str(value)) for key, value in (params or {}).items())
+    accept = (headers or {}).get("Accept", "")
+    material = json.dumps([url, params, accept])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def lookup(key):
+    """Return the stored headers of a cache entry.
+
+    :param key: the cache key of the request
+    :returns: dict of stored headers, or None on a cache miss
+    """
+    headers_path, body_path = _entry_paths(key)
+    try:
+        with open(headers_path, encoding="utf-8") as headers_file:
+            stored_headers = json.load(headers_file)
+    except (OSError, ValueError):
+        return None
+    if not os.path.exists(body_path):
+        return None
+    return stored_headers
+
+
+def validators(stored_headers):
+    """Return the conditional request headers for a cache entry.
+
+    :param stored_headers: headers returned by lookup()
+    :returns: dict with If-None-Match and/or If-Modified-Since
+    """
+    conditional_headers = {}
+    if stored_headers.get("ETag"):
+        conditional_headers["If-None-Match"] = stored_headers["ETag"]
+    if stored_headers.get("Last-Modified"):
+        conditional_headers["If-Modified-Since"] = stored_headers["Last-Modified"]
+    return conditional_headers
+
+
+def revalidated(key, stored_headers, not_modified, stream=False):
+    """Serve the cached body of an entry the server answered 304 for.
+
+    Headers sent with the 304 response replace the stored ones.
+
+    :param key: the cache key of the request
+    :param stored_headers: headers returned by lookup()
+    :param not_modified: the 304 response
+    :param stream: leave the body unread, as for a streamed request
+    :returns: a 200 response with the cached body, or None if the entry
+        disappeared since it was looked up
+    """
+    headers_path, body_path = _entry_paths(key)
+    try:
+        body_file = open(body_path, "rb")  # noqa: SIM115
+    except OSError:
+        return None
+    not_modified.close()
+    stored_headers = dict(
+        stored_headers,
+        **{
+            name: not_modified.headers[name]
+            for name in STORED_HEADERS
+            if name in not_modified.headers
+        },
+    )
+    try:
+        write_json_atomically(headers_path, stored_headers)
+    except OSError as error:
+        logger.debug("Could not update HTTP cache entry %s: %s", key, error)
+    return _file_response(not_modified, stored_headers, body_file, stream)
+
+
+def store(key, response, stream=False):
+    """Save a 200 response carrying validators in the cache.
+
+    A streamed body is copied to the cache while the caller reads it, so the
+    response to use afterwards is a new one passing the body through.
+
+    :param key: the cache key of the request
+    :param response: the 200 response of the request
+    :param stream: whether the request was sent with stream=True
+    :returns: the response the caller should use
+    """
+    if not (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+        return response
+    stored_headers = {
+        name: response.headers[name]
+        for name in STORED_HEADERS
+        if name in response.headers
+    }
+    max_size = get_server_setting(CONFIG_HTTP_CACHE_SIZE) * 1024 * 1024
+    if not stream and len(response.content) > max_size:
+        return response
+    try:
+        os.makedirs(utils.QPC_HTTP_CACHE, exist_ok=True)
+        spool = tempfile.NamedTemporaryFile(  # noqa: SIM115
+            dir=utils.QPC_HTTP_CACHE, prefix=".", delete=False
+        )
+    except OSError as error:
+        logger.debug("Could not write HTTP cache entry %s: %s", key, error)
+        return response
+
+    if stream:
+        headers = response.headers.copy()
+        for name in ENCODING_HEADERS:
+            headers.pop(name, None)
+        body = _CachingReader(key, response, spool, stored_headers, max_size)
+        return _file_response(response, headers, body, stream)
+
+    try:
+        with spool:
+            spool.write(response.content)
+    except OSError as error:
+        logger.debug("Could not write HTTP cache entry %s: %s", key, error)
+        _remove_file(spool.name)
+        return response
+    if _save_entry(key, spool.name, stored_headers):
+        _evict(max_size)
+    else:
+        _remove_file(spool.name)
+    return response
+
+
+class _CachingReader(io.RawIOBase):
+    """Body of a streamed response, copied to the cache as it is read.
+
+    The entry is saved once the whole body was read. It is dropped if the
+    body grows past max_size, cannot be spooled, or is not read to the end;
+    the caller still reads all of it.
+    """
+
+    def __init__(self, key, response, spool, stored_headers, max_size):  # noqa: PLR0913
+        """Read the body of response, spooling it for the entry of key."""
+        super().__init__()
+        self.key = key
+        self.response = response
+        self.chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+        self.spool = spool
+        self.stored_headers = stored_headers
+        self.max_size = max_size
+        self.pending = bytearray()
+
+    def readable(self):
+        """Tell the body can be read."""
+        return True
+
+    def read(self, size=-1):
+        """Return up to size bytes of the body, all of it if size < 0."""
+        while self.chunks is not None and (size < 0 or len(self.pending) < size):
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                self._finish()
+            else:
+                self._spool(chunk)
+                self.pending += chunk
+        if size < 0:
+            size = len(self.pending)
+        data = bytes(self.pending[:size])
+        del self.pending[:size]
+        return data
+
+    def close(self):
+        """Drop the entry if the body was not read to the end."""
+        if self.chunks is not None:
+            self.chunks = None
+            self._drop()
+            self.response.close()
+        super().close()
+
+    def _spool(self, chunk):
+        if self.spool is None:
+            return
+        try:
+            self.spool.write(chunk)
+        except OSError as error:
+            logger.debug("Could not write HTTP cache entry %s: %s", self.key, error)
+            self._drop()
+            return
+        if self.spool.tell() > self.max_size:
+            # too big to keep
+            self._drop()
+
+    def _finish(self):
+        self.chunks = None
+        self.response.close()
+        if self.spool is None:
+            return
+        spool_path = self.spool.name
+        try:
+            self.spool.close()
+        except OSError as error:
+            logger.debug("Could not write HTTP cache entry %s: %s", self.key, error)
+            self._drop()
+            return
+        self.spool = None
+        if _save_entry(self.key, spool_path, self.stored_headers):
+            _evict(self.max_size)
+        else:
+            _remove_file(spool_path)
+
+    def _drop(self):
+        if self.spool is None:
+            return
+        try:
+            self.spool.close()
+        except OSError:
+            pass
+        _remove_file(self.spool.name)
+        self.spool = None
+
+
+def _save_entry(key, spool_path, stored_headers):
+    """Move a spooled body into the cache, then write its headers.
+
+    The headers of a previous body are removed first, and the new ones only
+    written once the body is in place, so they never validate another body.
+    """
+    headers_path, body_path = _entry_paths(key)
+    try:
+        try:
+            os.remove(headers_path)
+        except FileNotFoundError:
+            pass
+        os.replace(spool_path, body_path)
+        write_json_atomically(headers_path, stored_headers)
+    except OSError as error:
+        logger.debug("Could not write HTTP cache entry %s: %s", key, error)
+        _remove_entry(key)
+        return False
+    return True
+
+
+def _entry_paths(key):
+    path = os.path.join(utils.QPC_HTTP_CACHE, key)
+    return path + HEADERS_SUFFIX, path + BODY_SUFFIX
+
+
+def _entry_keys():
+    try:
+        names = os.listdir(utils.QPC_HTTP_CACHE)
+    except OSError:
+        return []
+    return [
+        name[: -len(HEADERS_SUFFIX)]
+        for name in names
+        if name.endswith(HEADERS_SUFFIX) and not name.startswith(".")
+    ]
+
+
+def _remove_entry(key):
+    for path in _entry_paths(key):
+        _remove_file(path)
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _evict(max_size):
+    """Remove the least recently used entries until the cache fits max_size."""
+    entries = []
+    for key in _entry_keys():
+        headers_path, body_path = _entry_paths(key)
+        try:
+            last_used = os.stat(headers_path).st_mtime_ns
+            size = os.stat(body_path).st_size
+        except OSError:
+            continue
+        entries.append((last_used, size, key))
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, key in sorted(entries):
+        if total_size <= max_size:
+            break
+        _remove_entry(key)
+        total_size -= size
+
+
+def _file_response(original, headers, body_file, stream):
+    """Build a 200 response whose body is read from body_file."""
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = "OK"
+    response.url = original.url
+    response.request = original.request
+    response.elapsed = original.elapsed
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.raw = body_file
+    if not stream:
+        with body_file:
+            # reads the whole body into response.content
+            response.content  # noqa: B018
+    return response
@@ -14,7 +14,11 @@ from qpc.insights.http import InsightsClient
 from qpc.request import GET
 from qpc.request import request as qpc_request
 from qpc.translation import _
-from qpc.utils import read_insights_config, read_insights_login_config
+from qpc.utils import (
+    STREAM_CHUNK_SIZE,
+    read_insights_config,
+    read_insights_login_config,
+)
 
 logger = getLogger(__name__)
 
@@ -166,16 +170,18 @@ class InsightsPublishCommand(CliCommand):
             method=GET,
             path=path,
             headers={"Accept": "application/gzip"},
+            stream=True,
         )
 
-        if not response.ok:
-            self._handle_response_error(response)
+        with response:
+            if not response.ok:
+                self._handle_response_error(response)
 
-        logger.info(_(messages.INSIGHTS_REPORT_DOWNLOAD_SUCCESSFUL))
+            logger.info(_(messages.INSIGHTS_REPORT_DOWNLOAD_SUCCESSFUL))
 
-        output_file = NamedTemporaryFile(suffix=".tar.gz", delete=False)
-        output_file_path = Path(output_file.name)
-        output_file_path.write_bytes(response.content)
+            with NamedTemporaryFile(suffix=".tar.gz", delete=False) as output_file:
+                for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    output_file.write(chunk)
 
         return output_file.name
 
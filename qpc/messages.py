@@ -276,6 +276,43 @@ DISABLE_OPT_PRODUCTS_HELP = (
 )
 
 VERBOSITY_HELP = "Verbose mode. Use up to -vvvv for more verbosity."
+JOBS_HELP = (
+    "Maximum number of requests sent to the server at the same time by "
+    "commands that work on several objects. The default is %s."
+)
+POSITIVE_INT_ERROR = "%s should be a positive integer."
+POSITIVE_NUMBER_ERROR = "%s should be a positive number."
+PAGE_SIZE_ERROR = "%s should be a positive integer or auto."
+TIMEOUT_HELP = (
+    "Seconds to wait for the server to accept a connection and then for "
+    "each response, instead of the connect_timeout and read_timeout "
+    "server.config settings."
+)
+DEADLINE_HELP = (
+    "Maximum number of seconds the command may spend on all of its requests "
+    "to the server."
+)
+
+BATCH_FILE_HELP = (
+    "File with one qpc command per line, without the leading qpc. Blank "
+    "lines separate groups of independent commands. Defaults to stdin."
+)
+BATCH_PARALLEL_HELP = (
+    "Maximum number of commands of a group run at the same time. The default "
+    "is 1. Unlike qpc --jobs, which limits the requests sent at the same time "
+    "by each command, this runs several commands at once."
+)
+BATCH_SYNTAX_ERROR = "Line %(line)s of the batch cannot be parsed: %(error)s"
+NESTED_COMMAND_ERROR = "qpc %s cannot be run from a batch or a shell."
+BATCH_LINE_SUCCEEDED = "Line %(line)s succeeded: %(command)s"
+BATCH_LINE_FAILED = "Line %(line)s failed with exit code %(code)s: %(command)s"
+BATCH_LINE_ERROR = "Line %(line)s stopped with an unexpected error: %(error)r"
+BATCH_FAILED = "%(failed)s of %(total)s batch commands failed."
+COMPLETE_SCRIPT_USAGE = "Usage: qpc __complete --script {%s}"
+SHELL_INTRO = (
+    "Type qpc commands without the leading qpc, help for usage, and exit "
+    "or Ctrl-D to leave."
+)
 
 
 CONNECTION_ERROR_MSG = (
@@ -284,6 +321,26 @@ CONNECTION_ERROR_MSG = (
     'configured to be contacted via "%(protocol)s" at host "%(host)s" '
     'with port "%(port)s" but is not responding.'
 )
+REQUEST_FAILED = 'Request "%(method)s %(url)s" failed: %(error)s'
+REQUEST_TIMEOUT = (
+    'Request "%(method)s %(url)s" timed out waiting for the server. Try '
+    "again later or increase the timeout with --timeout."
+)
+DEADLINE_EXCEEDED = (
+    'Request "%(method)s %(url)s" did not complete before the command '
+    "deadline set with --deadline."
+)
+DEADLINE_EXCEEDED_ERROR = "The command deadline has passed."
+CIRCUIT_OPEN = (
+    "The server at %(server)s failed %(failures)s consecutive connection "
+    "attempts and is considered down. It will be contacted again in "
+    "%(remaining).0f seconds."
+)
+REQUEST_RETRY = (
+    'Request "%(method)s %(url)s" failed with %(reason)s. Retrying in '
+    "%(delay).1f seconds (retry %(attempt)s of %(retries)s, %(time_spent).1f "
+    "seconds spent waiting on retries so far)."
+)
 
 READ_FILE_ERROR = "Error reading from %(path)s: %(error)s."
 WRITE_FILE_ERROR = "Error writing to %(path)s: %(error)s."
@@ -348,7 +405,29 @@ LOGIN_SUCCESS = "Login successful."
 
 LOGOUT_SUCCESS = "Logged out."
 
-NEXT_RESULTS = "Press enter to see the next set of results."
+NEXT_RESULTS = "Press enter to see the next set of results, or q to stop."
+LIST_ALL_HELP = (
+    "Print all the results at once instead of a page at a time, fetching "
+    "up to --jobs pages at the same time."
+)
+LIST_FIELDS_HELP = (
+    "Fields of the results to print, separated by commas or spaces. "
+    "Defaults to all the fields."
+)
+LIST_NAME_CONTAINS_HELP = "List only the results whose name contains TEXT."
+LIST_ORDERING_HELP = (
+    "Fields sorting the results, separated by commas. Fields starting with - "
+    "sort in descending order, i.e. --ordering=-name."
+)
+LIST_FILTER_NOT_APPLIED = (
+    "The server did not filter the results by %s, qpc filters them instead."
+)
+OUTPUT_FORMAT_HELP = "Output format. Valid values: %s. Defaults to json."
+PAGE_SIZE_HELP = (
+    "Number of results requested in each page, or auto to pick it from the "
+    "time and size of the pages received. Defaults to the page_size setting "
+    "of server.config, or to the page size of the server."
+)
 BAD_INSIGHTS_INSTALL = (
     "Insights installation check failed. Checked if "
     'Insights was installed and configured with command "%s"'
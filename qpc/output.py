@@ -0,0 +1,227 @@
+"""Writers printing the records of list, show and job commands.
+
+Records are written in the format given to --format as soon as each page
+of results arrives, and the output is flushed after every page, so a
+reader like ``jq`` sees the first records while the next pages are still
+being fetched:
+
+- json: one pretty printed list, the default
+- ndjson: one JSON object per line
+- csv: a header line with the fields of the first page, then a line per
+  record
+- table: the same columns as csv, aligned on the values of the first page
+
+With --fields, only the given fields are printed, in the csv and table
+columns in the given order.
+
+Nested values are written as compact JSON in the csv and table formats.
+"""
+
+import csv
+import json
+import sys
+import textwrap
+
+from qpc import messages
+from qpc.translation import _
+from qpc.utils import pretty_print
+
+JSON = "json"
+NDJSON = "ndjson"
+CSV = "csv"
+TABLE = "table"
+FORMATS = (JSON, NDJSON, CSV, TABLE)
+
+TABLE_SEPARATOR = "  "
+
+
+def add_format_argument(parser):
+    """Add the --format option to the parser of a command.
+
+    :param parser: the parser of the command
+    """
+    parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=FORMATS,
+        default=JSON,
+        metavar="FORMAT",
+        help=_(messages.OUTPUT_FORMAT_HELP) % ", ".join(FORMATS),
+    )
+
+
+def get_format(args):
+    """Return the format given to --format.
+
+    :param args: the parsed arguments of the command
+    :returns: one of FORMATS, json if the command has no --format
+    """
+    if "output_format" in args:
+        return args.output_format
+    return JSON
+
+
+def write_records(pages, output_format=JSON, fields=None):
+    """Print the records of pages as a single list, page by page.
+
+    :param pages: iterable of lists of records
+    :param output_format: one of FORMATS
+    :param fields: list of the fields to print, None for all of them
+    """
+    writer = WRITERS[output_format](fields)
+    for records in pages:
+        writer.write(records)
+        sys.stdout.flush()
+    writer.close()
+
+
+def write_record(record, output_format=JSON):
+    """Print a single record, i.e. the object of a show command.
+
+    :param record: the record to print
+    :param output_format: one of FORMATS
+    """
+    if output_format == JSON:
+        print(pretty_print(record))
+    else:
+        write_records([[record]], output_format)
+
+
+class RecordWriter:
+    """Base class of the writers of records."""
+
+    def __init__(self, fields=None):
+        """Create a writer.
+
+        :param fields: list of the fields to print, None for all of them
+        """
+        self.fields = fields
+
+    def write(self, records):
+        """Write the records of a page."""
+
+    def close(self):
+        """Write what follows the last record."""
+
+    def _project(self, record):
+        """Return the printed fields of a record."""
+        if self.fields is None:
+            return record
+        return {field: record[field] for field in self.fields if field in record}
+
+
+class JSONWriter(RecordWriter):
+    """Write records as a pretty printed list.
+
+    The output is the same as print(pretty_print(all_records)).
+    """
+
+    def __init__(self, fields=None):
+        """Create the writer of an empty list."""
+        RecordWriter.__init__(self, fields)
+        self.separator = "[\n"
+
+    def write(self, records):
+        """Write the records of a page."""
+        for record in records:
+            sys.stdout.write(
+                self.separator
+                + textwrap.indent(pretty_print(self._project(record)), "    ")
+            )
+            self.separator = ",\n"
+
+    def close(self):
+        """End the list."""
+        print("[]" if self.separator == "[\n" else "\n]")
+
+
+class NDJSONWriter(RecordWriter):
+    """Write a JSON object per line."""
+
+    def write(self, records):
+        """Write the records of a page."""
+        for record in records:
+            sys.stdout.write(json.dumps(self._project(record), sort_keys=True) + "\n")
+
+
+class CSVWriter(RecordWriter):
+    """Write records as comma separated values, after a header line."""
+
+    def __init__(self, fields=None):
+        """Create the writer, taking the fields from the first page by default."""
+        RecordWriter.__init__(self, fields)
+        self.writer = None
+
+    def write(self, records):
+        """Write the records of a page."""
+        if not records:
+            return
+        if self.writer is None:
+            self.fields = self.fields or _fields(records)
+            self.writer = csv.DictWriter(
+                sys.stdout,
+                fieldnames=self.fields,
+                extrasaction="ignore",
+                lineterminator="\n",
+            )
+            self.writer.writeheader()
+        self.writer.writerows(_row(record) for record in records)
+
+
+class TableWriter(RecordWriter):
+    """Write records as aligned columns, after a header line."""
+
+    def __init__(self, fields=None):
+        """Create the writer, sizing the columns from the first page."""
+        RecordWriter.__init__(self, fields)
+        self.widths = None
+
+    def write(self, records):
+        """Write the records of a page."""
+        if not records:
+            return
+        rows = [_row(record) for record in records]
+        if self.widths is None:
+            self.fields = self.fields or _fields(records)
+            self.widths = [
+                max(len(field), *(len(row.get(field, "")) for row in rows))
+                for field in self.fields
+            ]
+            self._write_line(self.fields)
+            self._write_line("-" * width for width in self.widths)
+        for row in rows:
+            self._write_line(row.get(field, "") for field in self.fields)
+
+    def _write_line(self, values):
+        line = TABLE_SEPARATOR.join(
+            value.ljust(width) for value, width in zip(values, self.widths)
+        )
+        sys.stdout.write(line.rstrip() + "\n")
+
+
+WRITERS = {
+    JSON: JSONWriter,
+    NDJSON: NDJSONWriter,
+    CSV: CSVWriter,
+    TABLE: TableWriter,
+}
+
+
+def _fields(records):
+    """Return the sorted fields of records."""
+    return sorted({field for record in records for field in record})
+
+
+def _row(record):
+    """Return the values of a record as strings, by field."""
+    return {field: _cell(value) for field, value in record.items()}
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, separators=(",", ":"))
+    if isinstance(value, bool):
+        return json.dumps(value)
+    return str(value)
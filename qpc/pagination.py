@@ -0,0 +1,196 @@
+"""Page sizes of the paginated lists of the server.
+
+Lists are requested a page at a time with the page_size given to
+--page-size or set in server.config, or with the page size of the server
+when neither is set. In auto mode, the size of each page is picked from the
+time and the payload size of the previous one, aiming for pages taking the
+page_target_time seconds set in server.config. The largest page size a
+server accepts, and the last size picked in auto mode, are remembered in
+QPC_SERVER_INFO so the next commands start from them.
+
+Pages are addressed by number, so a page of a new size can only start where
+a page of that size would: the size of the next page is a divisor of the
+number of results already received, which lets it double at each page.
+While auto mode has not settled on a size it can use, pages are requested
+one at a time, each sized from the ones received so far; the pages left are
+then requested concurrently, with the settled size.
+"""
+
+from qpc import server_info
+from qpc.utils import (
+    CONFIG_PAGE_SIZE,
+    CONFIG_PAGE_TARGET_TIME,
+    PAGE_SIZE_AUTO,
+    get_server_setting,
+    logger,
+)
+
+# capabilities remembered in QPC_SERVER_INFO
+MAX_PAGE_SIZE = "max_page_size"
+AUTO_PAGE_SIZE = "auto_page_size"
+
+# size of the first page requested in auto mode for a new server
+AUTO_INITIAL_PAGE_SIZE = 100
+# largest factor by which a page picked in auto mode exceeds the last one
+AUTO_MAX_GROWTH = 4
+# largest payload, in bytes, of a page picked in auto mode
+AUTO_MAX_PAGE_BYTES = 4 * 1024 * 1024
+
+
+class Pager:
+    """Pick the page and page_size parameters of the pages of a list.
+
+    Call params() before requesting each page and update() with every page
+    received, while more is True.
+    """
+
+    def __init__(self, page_size=None):
+        """Create the pager of a list.
+
+        :param page_size: the size of the pages, PAGE_SIZE_AUTO, or None to
+            use the page_size setting of server.config
+        """
+        if page_size is None:
+            page_size = get_server_setting(CONFIG_PAGE_SIZE)
+        self.auto = page_size == PAGE_SIZE_AUTO
+        if self.auto:
+            page_size = server_info.get_capability(
+                AUTO_PAGE_SIZE, AUTO_INITIAL_PAGE_SIZE
+            )
+        # page_size sent to the server, None to use the server page size
+        self.page_size = self._limit(page_size)
+        # page number and size of the next page
+        self.page = 1
+        self.size = page_size
+        # size picked by auto mode for the next page, before it is fitted
+        self.wanted = None
+        self.offset = 0
+        self.more = True
+
+    @property
+    def tuning(self):
+        """Tell whether auto mode could not use the size it picked yet.
+
+        The next page should then be requested alone, so that the pages
+        after it can grow to the picked size.
+        """
+        return (
+            self.auto
+            and self.more
+            and self.wanted is not None
+            and self.size < self.wanted
+        )
+
+    def params(self):
+        """Return the query parameters of the next page.
+
+        :returns: dict with the page and page_size parameters to send
+        """
+        params = {}
+        if self.page > 1:
+            params["page"] = self.page
+        if self.page_size is not None:
+            params["page_size"] = self.page_size
+        return params
+
+    def update(self, response, json_data):
+        """Account for a page received, picking the next one.
+
+        :param response: the response to the request of the page
+        :param json_data: the decoded body of the response
+        :returns: the results of the page not received yet, in order
+        """
+        results = json_data.get("results") or []
+        self.more = bool(json_data.get("next")) and bool(results)
+        if self.page == 1:
+            start = 0
+        elif self.more:
+            # only the last page is not full
+            start = (self.page - 1) * len(results)
+        else:
+            start = (self.page - 1) * self.size
+        if self.more:
+            self._learn_page_size(len(results))
+        if start > self.offset:
+            logger.debug(
+                "The list changed, %s results were skipped", start - self.offset
+            )
+        new_results = results[max(self.offset - start, 0) :]
+        self.offset = max(self.offset, start + len(results))
+        if self.more:
+            size = len(results)
+            if self.auto:
+                size = self.wanted = self.tune(response, len(results))
+            elif self.page_size is not None:
+                size = self.page_size
+            size = _largest_divisor(self.offset, size)
+            if self.page_size is not None:
+                self.page_size = size
+            self.size = size
+            self.page = self.offset // size + 1
+        return new_results
+
+    def remaining_params(self, count):
+        """Return the query parameters of all the pages left, at once.
+
+        The pages all have the size picked for the next page, so that they
+        can be requested concurrently.
+
+        :param count: the number of results of the whole list
+        :returns: list of the query parameter dicts of the pages left
+        """
+        if not self.more:
+            return []
+        # the next page exists, even if count is off
+        pages = max(-(-count // self.size), self.page)
+        return [{**self.params(), "page": page} for page in range(self.page, pages + 1)]
+
+    def tune(self, response, count):
+        """Pick the page size of auto mode from a page received.
+
+        The picked size is remembered for the next commands.
+
+        :param response: the response to the request of the page
+        :param count: the number of results of the page
+        :returns: the page size picked
+        """
+        elapsed = response.elapsed.total_seconds()
+        payload_size = len(response.content)
+        size = count * AUTO_MAX_GROWTH
+        if elapsed > 0:
+            target_time = get_server_setting(CONFIG_PAGE_TARGET_TIME)
+            size = min(size, int(count * target_time / elapsed))
+        if payload_size > 0:
+            size = min(size, count * AUTO_MAX_PAGE_BYTES // payload_size)
+        size = self._limit(max(size, 1))
+        if size != server_info.get_capability(AUTO_PAGE_SIZE):
+            server_info.set_capability(AUTO_PAGE_SIZE, size)
+        return size
+
+    def _learn_page_size(self, count):
+        """Follow the page size of the server when it differs from ours."""
+        if self.page_size is None or count == self.page_size:
+            return
+        if count < self.page_size:
+            logger.debug("The server limits pages to %s results", count)
+            server_info.set_capability(MAX_PAGE_SIZE, count)
+            self.page_size = count
+        else:
+            # the server ignores page_size
+            self.page_size = None
+        self.auto = False
+
+    @staticmethod
+    def _limit(page_size):
+        max_page_size = server_info.get_capability(MAX_PAGE_SIZE)
+        if page_size is None or max_page_size is None:
+            return page_size
+        return min(page_size, max_page_size)
+
+
+def _largest_divisor(number, limit):
+    """Return the largest divisor of number not above limit."""
+    for divisor in range(min(number, limit), 0, -1):
+        if number % divisor == 0:
+            return divisor
+    return 1
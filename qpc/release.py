@@ -1,9 +1,16 @@
 """File to hold release constants."""
-from . import __package__version__
 
-VERSION = __package__version__
 AUTHOR = "QPC Team"
 AUTHOR_EMAIL = "qpc@redhat.com"
 PKG_NAME = "qpc"
 ENTRYPOINT = f"{PKG_NAME}=qpc.__main__:main"
 URL = "https://github.com/quipucords/qpc"
+
+
+def __getattr__(name):
+    """Read VERSION on first use, like the package version it comes from."""
+    if name == "VERSION":
+        from . import __package__version__
+
+        return __package__version__
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
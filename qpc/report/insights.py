@@ -1,15 +1,15 @@
 """ReportInsightsCommand is to show insights report."""
 
 import sys
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
-from qpc import messages, report, scan
+from qpc import messages, report
 from qpc.clicommand import CliCommand
-from qpc.request import GET, request
+from qpc.report.utils import get_report_id
+from qpc.request import GET, handle_body_error
 from qpc.translation import _
-from qpc.utils import check_extension, validate_write_file, write_file
+from qpc.utils import check_extension, validate_write_file, write_response
 
 logger = getLogger(__name__)
 
@@ -32,7 +32,7 @@ class ReportInsightsCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             GET,
             report.REPORT_URI,
-            [codes.ok],
+            [HTTPStatus.OK],
         )
         id_group = self.parser.add_mutually_exclusive_group(required=True)
         id_group.add_argument(
@@ -57,6 +57,7 @@ class ReportInsightsCommand(CliCommand):
         # Don't change this when you upgrade versions
         self.min_server_version = "0.9.0"
         self.report_id = None
+        self.req_stream = True
 
     def _validate_args(self):
         CliCommand._validate_args(self)
@@ -73,46 +74,42 @@ class ReportInsightsCommand(CliCommand):
             logger.error(error)
             sys.exit(1)
 
-        if self.args.report_id is None:
-            # Lookup scan job id
-            response = request(
-                parser=self.parser,
-                method=GET,
-                path=f"{scan.SCAN_JOB_URI}{self.args.scan_job_id}",
-                payload=None,
-            )
-            if response.status_code == codes.ok:
-                json_data = response.json()
-                self.report_id = json_data.get("report_id")
-                if self.report_id:
-                    self.req_path = (
-                        f"{self.req_path}{self.report_id}{report.INSIGHTS_PATH_SUFFIX}"
-                    )
-                else:
-                    logger.error(
-                        _(messages.REPORT_NO_INSIGHTS_REPORT_FOR_SJ),
-                        self.args.scan_job_id,
-                    )
-                    sys.exit(1)
-            else:
-                logger.error(
-                    _(messages.REPORT_SJ_DOES_NOT_EXIST), self.args.scan_job_id
-                )
-                sys.exit(1)
-        else:
+        if self.args.report_id is not None:
             self.report_id = self.args.report_id
             self.req_path = (
                 f"{self.req_path}{self.report_id}{report.INSIGHTS_PATH_SUFFIX}"
             )
 
+    def _resolve_names(self, fresh=False):
+        if self.args.report_id is not None:
+            return None
+        job_found, self.report_id = get_report_id(
+            self.parser, self.args.scan_job_id, fresh
+        )
+        if not job_found:
+            logger.error(_(messages.REPORT_SJ_DOES_NOT_EXIST), self.args.scan_job_id)
+            sys.exit(1)
+        if not self.report_id:
+            logger.error(
+                _(messages.REPORT_NO_INSIGHTS_REPORT_FOR_SJ), self.args.scan_job_id
+            )
+            sys.exit(1)
+        self.req_path = (
+            f"{report.REPORT_URI}{self.report_id}{report.INSIGHTS_PATH_SUFFIX}"
+        )
+        return self.report_id
+
     def _handle_response_success(self):
+        from requests.exceptions import RequestException
+
         try:
-            if self.args.path:
-                file_content = self.response.content
-            else:
-                file_content = self.response.text
-            write_file(self.args.path, file_content, binary=True)
+            with self.response:
+                write_response(self.args.path, self.response)
             logger.info(_(messages.REPORT_SUCCESSFULLY_WRITTEN))
+        except RequestException as error:
+            # an OSError too, but raised while receiving the body
+            handle_body_error(self.response, error)
+            sys.exit(1)
         except EnvironmentError as err:
             logger.error(
                 _(messages.WRITE_FILE_ERROR), {"path": self.args.path, "error": err}
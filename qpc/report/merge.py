@@ -4,16 +4,14 @@ import json
 import os
 import sys
 from glob import glob
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
 from qpc import messages, report
 from qpc.clicommand import CliCommand
 from qpc.release import PKG_NAME
 from qpc.report import utils
-from qpc.request import GET, POST, PUT, request
-from qpc.scan import SCAN_JOB_URI
+from qpc.request import POST, PUT
 from qpc.translation import _
 
 logger = getLogger(__name__)
@@ -44,7 +42,7 @@ class ReportMergeCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             PUT,
             report.ASYNC_MERGE_URI,
-            [codes.created],
+            [HTTPStatus.CREATED],
         )
         group = self.parser.add_mutually_exclusive_group(required=True)
         group.add_argument(
@@ -90,24 +88,20 @@ class ReportMergeCommand(CliCommand):
         report_ids = []
         job_not_found = []
         report_not_found = []
-        for scan_job_id in set(self.args.scan_job_ids):
+        scan_job_ids = list(dict.fromkeys(self.args.scan_job_ids))
+        found = utils.get_report_ids(self.parser, scan_job_ids)
+        for scan_job_id in scan_job_ids:
             # check for existence of scan_job
-            path = SCAN_JOB_URI + str(scan_job_id) + "/"
-            response = request(
-                parser=self.parser, method=GET, path=path, params=None, payload=None
-            )
-            if response.status_code == codes.ok:
-                json_data = response.json()
-                report_id = json_data.get("report_id", None)
-                if report_id:
-                    report_ids.append(report_id)
-                else:
-                    # there is not a report id associated with this scan job
-                    report_not_found.append(scan_job_id)
-                    not_found = True
-            else:
+            job_found, report_id = found[scan_job_id]
+            if not job_found:
                 job_not_found.append(scan_job_id)
                 not_found = True
+            elif report_id:
+                report_ids.append(report_id)
+            else:
+                # there is not a report id associated with this scan job
+                report_not_found.append(scan_job_id)
+                not_found = True
         return not_found, report_ids, job_not_found, report_not_found
 
     def _validate_create_json(self, files):
@@ -1,10 +1,9 @@
 """ReportMergeStatusCommand is used to show job merge information."""
 
 import sys
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
 from qpc import messages, report
 from qpc.clicommand import CliCommand
 from qpc.release import PKG_NAME
@@ -32,7 +31,7 @@ class ReportMergeStatusCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             GET,
             report.ASYNC_MERGE_URI,
-            [codes.ok],
+            [HTTPStatus.OK],
         )
         self.parser.add_argument(
             "--job",
@@ -0,0 +1,80 @@
+"""Test the report ids of scan jobs are saved once the jobs completed."""
+
+import pytest
+
+from qpc import scan
+from qpc.cli import CLI
+from qpc.release import VERSION
+from qpc.report.utils import get_report_id, get_report_ids
+from qpc.utils import get_server_location
+
+
+@pytest.fixture
+def job_url():
+    """Return the URL of the scan job 1."""
+    return f"{get_server_location()}{scan.SCAN_JOB_URI}1"
+
+
+def test_completed_job_saved(requests_mock, job_url):
+    """Test the report id of a completed job is only requested once."""
+    requests_mock.get(job_url, json={"report_id": 5, "status": "completed"})
+    assert get_report_id(None, 1) == (True, 5)
+    assert get_report_id(None, "1") == (True, 5)
+    assert requests_mock.call_count == 1
+    assert get_report_id(None, 1, fresh=True) == (True, 5)
+    assert requests_mock.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "job,expected",
+    [
+        ({"report_id": 5, "status": "running"}, (True, 5)),
+        ({"status": "running"}, (True, None)),
+        ({"report_id": None, "status": "completed"}, (True, None)),
+    ],
+)
+def test_job_not_saved(requests_mock, job_url, job, expected):
+    """Test jobs that did not complete with a report are always requested."""
+    requests_mock.get(job_url, json=job)
+    assert get_report_id(None, 1) == expected
+    assert get_report_id(None, 1) == expected
+    assert requests_mock.call_count == 2
+
+
+def test_report_ids(requests_mock, job_url):
+    """Test scan jobs without a saved report id are requested together."""
+    requests_mock.get(job_url, json={"report_id": 5, "status": "completed"})
+    get_report_id(None, 1)
+    jobs_url = job_url[: -len("1")]
+    requests_mock.get(f"{jobs_url}2/", json={"report_id": 6, "status": "completed"})
+    requests_mock.get(f"{jobs_url}3/", status_code=404, json={})
+    assert get_report_ids(None, [1, 2, 3]) == {
+        1: (True, 5),
+        2: (True, 6),
+        3: (False, None),
+    }
+    assert requests_mock.call_count == 3
+    assert get_report_ids(None, [2]) == {2: (True, 6)}
+    assert requests_mock.call_count == 3
+
+
+def test_missing_job(requests_mock, job_url):
+    """Test a missing job is reported as such."""
+    requests_mock.get(job_url, status_code=404, json={})
+    assert get_report_id(None, 1) == (False, None)
+
+
+def test_stale_report_id(requests_mock, job_url, tmp_path):
+    """Test a saved report id that is gone is requested again."""
+    requests_mock.get(job_url, json={"report_id": 5, "status": "completed"})
+    get_report_id(None, 1)
+    requests_mock.get(job_url, json={"report_id": 6, "status": "completed"})
+    report_url = f"{get_server_location()}/api/v1/reports/"
+    headers = {"X-Server-Version": VERSION}
+    requests_mock.get(f"{report_url}5", status_code=404, json={}, headers=headers)
+    requests_mock.get(f"{report_url}6", content=b"report", headers=headers)
+    path = tmp_path / "report.tar.gz"
+    argv = ["report", "download", "--scan-job", "1", "--output-file", str(path)]
+    assert CLI().run(argv) == 0
+    assert path.read_bytes() == b"report"
+    assert get_report_id(None, 1) == (True, 6)
@@ -247,7 +247,7 @@ class ReportDeploymentsTests(unittest.TestCase):
                         messages.REPORT_NO_DEPLOYMENTS_REPORT_FOR_SJ,
                     )
 
-    @patch("qpc.report.deployments.write_file")
+    @patch("qpc.report.deployments.write_json_from_tar_response")
     def test_deployments_file_fails_to_write(self, file):
         """Testing deployments failure while writing to file."""
         file.side_effect = EnvironmentError()
@@ -232,7 +232,7 @@ class ReportDetailsTests(unittest.TestCase):
                         report_out.getvalue(), messages.REPORT_NO_DETAIL_REPORT_FOR_SJ
                     )
 
-    @patch("qpc.report.details.write_file")
+    @patch("qpc.report.details.write_json_from_tar_response")
     def test_details_file_fails_to_write(self, file):
         """Testing details failure while writing to file."""
         file.side_effect = EnvironmentError()
@@ -7,7 +7,9 @@ import unittest
 from argparse import ArgumentParser, Namespace  # noqa: I100
 from unittest.mock import patch
 
+import requests
 import requests_mock
+from urllib3.exceptions import ReadTimeoutError
 
 from qpc import messages
 from qpc.cli import CLI
@@ -189,7 +191,7 @@ class ReportDownloadTests(unittest.TestCase):
                 )
                 self.assertIn(err_msg, log.output[0])
 
-    @patch("qpc.report.download.write_file")
+    @patch("qpc.report.download.write_response")
     def test_file_fails_to_write(self, file):
         """Testing download failure while writing to file."""
         err = "Mock Fail"
@@ -218,6 +220,61 @@ class ReportDownloadTests(unittest.TestCase):
                 }
                 self.assertIn(err_msg, log.output[0])
 
+    @patch("qpc.report.download.write_response")
+    def test_report_times_out_while_streaming(self, file):
+        """Testing a read timeout while the report streams is a request error."""
+        file.side_effect = requests.exceptions.ConnectionError(
+            ReadTimeoutError(None, None, "Read timed out.")
+        )
+        get_report_url = get_server_location() + REPORT_URI + "1"
+        with requests_mock.Mocker() as mocker:
+            mocker.get(
+                get_report_url,
+                status_code=200,
+                headers={"X-Server-Version": VERSION},
+                content=b"",
+            )
+
+            args = Namespace(
+                scan_job_id=None, report_id="1", path=self.test_tar_filename, mask=False
+            )
+            with self.assertLogs(level="ERROR") as log:
+                with self.assertRaises(SystemExit):
+                    self.command.main(args)
+                err_msg = messages.REQUEST_TIMEOUT % {
+                    "method": "GET",
+                    "url": get_report_url,
+                }
+                self.assertIn(err_msg, log.output[0])
+
+    @patch("qpc.report.download.write_response")
+    def test_report_connection_lost_while_streaming(self, file):
+        """Testing a dropped connection while the report streams."""
+        err = "Connection reset by peer"
+        file.side_effect = requests.exceptions.ConnectionError(err)
+        get_report_url = get_server_location() + REPORT_URI + "1"
+        with requests_mock.Mocker() as mocker:
+            mocker.get(
+                get_report_url,
+                status_code=200,
+                headers={"X-Server-Version": VERSION},
+                content=b"",
+            )
+
+            args = Namespace(
+                scan_job_id=None, report_id="1", path=self.test_tar_filename, mask=False
+            )
+            with self.assertLogs(level="ERROR") as log:
+                with self.assertRaises(SystemExit):
+                    self.command.main(args)
+                err_msg = messages.REQUEST_FAILED % {
+                    "method": "GET",
+                    "url": get_report_url,
+                    "error": err,
+                }
+                self.assertIn(err_msg, log.output[0])
+                self.assertNotIn("Error writing", log.output[0])
+
     def test_download_report_id_not_exist(self):
         """Test download with nonexistent report id."""
         get_report_url = get_server_location() + REPORT_URI + "1"
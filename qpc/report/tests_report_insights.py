@@ -166,7 +166,7 @@ class ReportInsightsTests(unittest.TestCase):
                         messages.REPORT_NO_DEPLOYMENTS_REPORT_FOR_SJ,
                     )
 
-    @patch("qpc.report.insights.write_file")
+    @patch("qpc.report.insights.write_response")
     def test_insights_file_fails_to_write(self, file):
         """Testing insights failure while writing to file."""
         file.side_effect = EnvironmentError()
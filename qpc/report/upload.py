@@ -2,10 +2,9 @@
 
 import json
 import sys
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
 from qpc import messages, report
 from qpc.clicommand import CliCommand
 from qpc.release import PKG_NAME
@@ -41,7 +40,7 @@ class ReportUploadCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             POST,
             report.ASYNC_MERGE_URI,
-            [codes.created],
+            [HTTPStatus.CREATED],
         )
         self.parser.add_argument(
             "--json-file",
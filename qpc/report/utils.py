@@ -2,9 +2,11 @@
 
 import json
 import os
+import sys
 from logging import getLogger
 
-from qpc import messages
+from qpc import messages, scan
+from qpc import utils as qpc_utils
 from qpc.translation import _
 
 logger = getLogger(__name__)
@@ -25,6 +27,89 @@ DEFAULT_REPORT_VERSION = "0.0.44.legacy"
 DETAILS_REPORT_TYPE = "details"
 
 
+def get_report_id(parser, scan_job_id, fresh=False):
+    """Return the id of the report of a scan job.
+
+    The report id of a completed scan job never changes, so it is saved in
+    QPC_REPORT_INDEX, keyed by server location, and the next commands read
+    it from there. Scan jobs that did not complete are always requested.
+
+    :param parser: the parser of the command, to report request errors
+    :param scan_job_id: the id of the scan job
+    :param fresh: True to request the scan job, ignoring the saved report id
+    :returns: tuple of whether the scan job exists and the id of its report,
+        None if it has none
+    """
+    from qpc.request import GET, request
+
+    key = str(scan_job_id)
+    if not fresh:
+        report_id = _server_report_index().get(key)
+        if report_id is not None:
+            return True, report_id
+    response = request(
+        parser=parser,
+        method=GET,
+        path=f"{scan.SCAN_JOB_URI}{scan_job_id}",
+        payload=None,
+    )
+    job_found, report_id, completed = _job_report_id(response)
+    if completed:
+        _save_report_ids({key: report_id})
+    return job_found, report_id
+
+
+def get_report_ids(parser, scan_job_ids):
+    """Return the ids of the reports of scan jobs.
+
+    Like get_report_id(), the saved report ids are used, and the scan jobs
+    without one are requested, concurrently.
+
+    :param parser: the parser of the command, to report request errors
+    :param scan_job_ids: the ids of the scan jobs
+    :returns: dict mapping each scan job id to a tuple of whether the scan
+        job exists and the id of its report, None if it has none
+    """
+    from qpc.request import GET, request_many
+
+    saved = _server_report_index()
+    found = {}
+    missing = []
+    for scan_job_id in scan_job_ids:
+        report_id = saved.get(str(scan_job_id))
+        if report_id is not None:
+            found[scan_job_id] = (True, report_id)
+        else:
+            missing.append(scan_job_id)
+    # the scan job URL report merge has always requested
+    specs = [(GET, f"{scan.SCAN_JOB_URI}{job_id}/", None, None) for job_id in missing]
+    completed_ids = {}
+    for result in request_many(specs, parser=parser):
+        if result.error is not None:
+            # already logged by request_many
+            sys.exit(1)
+        scan_job_id = missing[result.index]
+        job_found, report_id, completed = _job_report_id(result.response)
+        found[scan_job_id] = (job_found, report_id)
+        if completed:
+            completed_ids[str(scan_job_id)] = report_id
+    if completed_ids:
+        _save_report_ids(completed_ids)
+    return found
+
+
+def _job_report_id(response):
+    """Return whether a scan job exists, its report id, and if it completed."""
+    from http import HTTPStatus
+
+    if response.status_code != HTTPStatus.OK:
+        return False, None, False
+    json_data = response.json()
+    report_id = json_data.get("report_id")
+    completed = json_data.get("status") == scan.SCAN_STATUS_COMPLETED
+    return True, report_id, bool(report_id) and completed
+
+
 def validate_and_create_json(file):
     """Validate the details report file and create sources JSON.
 
@@ -99,3 +184,41 @@ def validate_and_create_json(file):
         return None
 
     return sources
+
+
+def _load_report_index():
+    with open(qpc_utils.QPC_REPORT_INDEX, encoding="utf-8") as index_file:
+        try:
+            index = json.load(index_file)
+        except ValueError:
+            return {}
+    if not isinstance(index, dict):
+        return {}
+    return index
+
+
+def _read_report_index():
+    try:
+        return qpc_utils.read_snapshot(qpc_utils.QPC_REPORT_INDEX, _load_report_index)
+    except OSError:
+        return {}
+
+
+def _server_report_index():
+    server_index = _read_report_index().get(qpc_utils.get_server_location())
+    if not isinstance(server_index, dict):
+        return {}
+    return server_index
+
+
+def _save_report_ids(report_ids):
+    """Save the report ids of completed scan jobs of the configured server."""
+    location = qpc_utils.get_server_location()
+    if location is None:
+        return
+    index = dict(_read_report_index())
+    index[location] = {**_server_report_index(), **report_ids}
+    try:
+        qpc_utils.write_json_atomically(qpc_utils.QPC_REPORT_INDEX, index)
+    except OSError as error:
+        logger.debug("Could not save the report index: %s", error)
@@ -1,20 +1,46 @@
 """Common module for handling request calls to the server."""
 
+import atexit
+import contextvars
+import gzip
+import hashlib
 import json
+import logging
+import random
 import sys
-
-import requests
-from packaging.version import Version
-
-from qpc import messages
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import parsedate_to_datetime
+from functools import partial
+
+from qpc import messages, server_info
+from qpc.exceptions import QPCDeadlineError, QPCRequestError
 from qpc.release import PKG_NAME
+from qpc.server import STATUS_URI
 from qpc.translation import _
 from qpc.utils import (
+    CONFIG_CLIENT_CERT,
+    CONFIG_CONNECT_TIMEOUT,
+    CONFIG_GZIP_LEVEL,
+    CONFIG_GZIP_THRESHOLD,
     CONFIG_HOST_KEY,
+    CONFIG_HTTP_CACHE,
+    CONFIG_KEEP_ALIVE,
+    CONFIG_LOG_PAYLOAD_SIZE,
+    CONFIG_POOL_SIZE,
     CONFIG_PORT_KEY,
+    CONFIG_READ_TIMEOUT,
+    CONFIG_RETRIES,
+    CONFIG_RETRY_BACKOFF,
+    CONFIG_RETRY_BUDGET,
     CONFIG_USE_HTTP,
+    DEFAULT_JOBS,
+    DEFAULT_POOL_SIZE,
     QPC_MIN_SERVER_VERSION,
     get_server_location,
+    get_server_setting,
     get_ssl_verify,
     handle_error_response,
     log_request_info,
@@ -32,53 +58,404 @@ DELETE = "DELETE"
 PUT = "PUT"
 
 CONNECTION_ERROR_MSG = messages.CONNECTION_ERROR_MSG
+STREAMED_CONTENT = "<streamed content>"
+ENCODED_CONTENT = "<encoded blob ignored>"
+
+RequestResult = namedtuple("RequestResult", ["index", "response", "error"])
+
+# only requests that can safely be repeated are retried
+RETRY_METHODS = (GET, PUT, DELETE)
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+RETRY_AFTER_STATUS_CODES = (429, 503)
 
 try:
     exception_class = json.decoder.JSONDecodeError
 except AttributeError:
     exception_class = ValueError
 
+_session = None
+# request_many() threads may ask for the session before any request was sent
+_session_lock = threading.Lock()
+_max_jobs = DEFAULT_JOBS
+# retry budget and deadline of the running command, shared by its threads
+_command = contextvars.ContextVar("command")
+_timeout = None
+_deadline_seconds = None
 
-def handle_general_errors(response, min_server_version):
-    """Handle general errors.
+
+class QPCResponse:
+    """Wrap a requests.Response so its JSON body is decoded at most once.
+
+    The first call to json() decodes the body and every later call returns
+    the same object, so callers must not modify it. Any other attribute is
+    read from the wrapped response.
+    """
+
+    def __init__(self, response):
+        """Wrap response."""
+        self.response = response
+        self._decoded = False
+        self._json = None
+        self._json_error = None
+
+    def __getattr__(self, name):
+        """Read attributes missing here from the wrapped response."""
+        return getattr(self.response, name)
+
+    def __bool__(self):
+        """Return True if the status code is lower than 400."""
+        return bool(self.response)
+
+    def __iter__(self):
+        """Iterate over the body in chunks."""
+        return iter(self.response)
+
+    def __enter__(self):
+        """Use the response as a context manager that closes it."""
+        return self
+
+    def __exit__(self, *args):
+        """Release the connection of the response."""
+        self.response.close()
+
+    def __repr__(self):
+        """Represent the response like the wrapped one."""
+        return repr(self.response)
+
+    def json(self, **kwargs):
+        """Return the JSON body, decoding it on the first call.
+
+        :param kwargs: optional arguments for json.loads; passing any skips
+            the memoized result
+        :raises: requests.JSONDecodeError if the body is not valid JSON
+        """
+        if kwargs:
+            return self.response.json(**kwargs)
+        if not self._decoded:
+            try:
+                self._json = self.response.json()
+            except ValueError as error:
+                self._json_error = error
+            self._decoded = True
+        if self._json_error is not None:
+            raise self._json_error
+        return self._json
+
+
+def is_json_response(response):
+    """Check if the Content-Type of a response is JSON."""
+    content_type = response.headers.get("Content-Type", "")
+    media_type = content_type.split(";")[0].strip().lower()
+    return media_type == "application/json" or media_type.endswith("+json")
+
+
+def set_max_jobs(jobs):
+    """Set how many requests request_many() may send at the same time.
+
+    :param jobs: positive number of concurrent requests
+    """
+    global _max_jobs  # noqa: PLW0603
+    _max_jobs = jobs
+
+
+def set_timeout(seconds):
+    """Override the connect and read timeouts set in server.config.
+
+    :param seconds: timeout in seconds, or None to use server.config
+    """
+    global _timeout  # noqa: PLW0603
+    _timeout = seconds
+
+
+def set_deadline(seconds):
+    """Limit the time all the requests of each command may take.
+
+    Every request, retry delay included, is cut short so the command ends
+    before its deadline. The deadline of the running command starts now,
+    and the one of every following command when start_command() is called.
+
+    :param seconds: seconds from the start of a command, or None for no
+        deadline
+    """
+    global _deadline_seconds  # noqa: PLW0603
+    _deadline_seconds = seconds
+    _current_command().deadline = _new_deadline()
+
+
+def _new_deadline():
+    if _deadline_seconds is None:
+        return None
+    return time.monotonic() + _deadline_seconds
+
+
+def _deadline_passed(delay=0):
+    deadline = _current_command().deadline
+    return deadline is not None and time.monotonic() + delay >= deadline
+
+
+def _request_timeout():
+    """Return the (connect, read) timeout of the next request.
+
+    :raises: QPCDeadlineError if the command deadline has passed
+    """
+    if _timeout is not None:
+        timeouts = (_timeout, _timeout)
+    else:
+        # 0 disables a timeout
+        timeouts = (
+            get_server_setting(CONFIG_CONNECT_TIMEOUT) or None,
+            get_server_setting(CONFIG_READ_TIMEOUT) or None,
+        )
+    deadline = _current_command().deadline
+    if deadline is None:
+        return timeouts
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise QPCDeadlineError(_(messages.DEADLINE_EXCEEDED_ERROR))
+    return tuple(remaining if t is None else min(t, remaining) for t in timeouts)
+
+
+class _CommandState:
+    """Time a command spent waiting before retries, and its deadline."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.retry_time_spent = 0.0
+        self.deadline = _new_deadline()
+
+
+def start_command():
+    """Start the retry budget and the deadline of a command.
+
+    They apply to the command run by the calling thread, so the commands run
+    concurrently by qpc batch each start their own.
+    """
+    _command.set(_CommandState())
+
+
+def _current_command():
+    try:
+        return _command.get()
+    except LookupError:
+        state = _CommandState()
+        _command.set(state)
+        return state
+
+
+def _reserve_retry_time(delay):
+    """Take delay seconds from the retry budget.
+
+    :param delay: seconds to wait before the next attempt
+    :returns: the total time spent on retries including this delay, or None
+        if the budget or the command deadline does not allow waiting that long
+    """
+    if _deadline_passed(delay):
+        return None
+    state = _current_command()
+    with state.lock:
+        if state.retry_time_spent + delay > get_server_setting(CONFIG_RETRY_BUDGET):
+            return None
+        state.retry_time_spent += delay
+        return state.retry_time_spent
+
+
+def _retry_after(response):
+    """Return the delay in seconds requested by a Retry-After header."""
+    if response.status_code not in RETRY_AFTER_STATUS_CODES:
+        return None
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_date.timestamp() - time.time(), 0.0)
+
+
+def _retry_delay(response, attempt):
+    """Return how long to wait before retrying a failed attempt.
+
+    :param response: the failed response, or None after a connection error
+    :param attempt: number of retries already made
+    :returns: delay in seconds
+    """
+    delay = None
+    if response is not None:
+        delay = _retry_after(response)
+    if delay is None:
+        # exponential backoff with full jitter
+        backoff = get_server_setting(CONFIG_RETRY_BACKOFF)
+        delay = random.uniform(0, backoff * 2**attempt)
+    return delay
+
+
+def get_session():
+    """Return the process-wide HTTP session, creating it on first use.
+
+    The session keeps a pool of keep-alive connections to the server so
+    consecutive requests don't pay for a new TCP and TLS handshake each time.
+    Pool size, keep-alive and the client certificate are read from
+    server.config when the session is created.
+
+    :returns: requests.Session object
+    """
+    global _session  # noqa: PLW0603
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            config = read_server_config() or {}
+            # keep a pooled connection for each concurrent request_many() worker
+            pool_size = max(config.get(CONFIG_POOL_SIZE, DEFAULT_POOL_SIZE), _max_jobs)
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            if not config.get(CONFIG_KEEP_ALIVE, True):
+                session.headers["Connection"] = "close"
+            if config.get(CONFIG_CLIENT_CERT):
+                session.cert = config[CONFIG_CLIENT_CERT]
+            _session = session
+            atexit.register(close_session)
+        return _session
+
+
+def close_session():
+    """Close the process-wide HTTP session and its pooled connections."""
+    global _session  # noqa: PLW0603
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+            atexit.unregister(close_session)
+
+
+def check_general_errors(response, min_server_version):
+    """Check a response for errors that no command can recover from.
 
     :param response: The response object.
+    :param min_server_version: min qpc server version allowed
     :returns: The response object.
+    :raises: QPCRequestError for a server that is too old, a missing or
+        expired login, or an internal server error
     """
     server_version = response.headers.get("X-Server-Version")
-    if not server_version:
+    if server_version:
+        server_info.record_server_version(server_version)
+    else:
         server_version = QPC_MIN_SERVER_VERSION
+    check_server_version(server_version, min_server_version)
 
-    if "0.0.0" not in server_version and Version(server_version) < Version(
-        min_server_version
+    if response.status_code == 401 or (
+        response.status_code == 400 and _is_token_expired(response)
     ):
-        logger.error(
-            _(messages.SERVER_TOO_OLD_FOR_CLI),
-            {"min_version": min_server_version, "current_version": server_version},
-        )
-        sys.exit(1)
+        handle_error_response(response)
+        logger.error(_(messages.SERVER_LOGIN_REQUIRED), PKG_NAME)
+        raise QPCRequestError(_(messages.SERVER_LOGIN_REQUIRED) % PKG_NAME)
+    if response.status_code == 500:
+        handle_error_response(response)
+        logger.error(_(messages.SERVER_INTERNAL_ERROR))
+        raise QPCRequestError(_(messages.SERVER_INTERNAL_ERROR))
+
+    return response
+
 
+def check_server_version(server_version, min_server_version):
+    """Check a server version against the version a command requires.
+
+    :param server_version: version of the server, or None if unknown
+    :param min_server_version: min qpc server version allowed
+    :raises: QPCRequestError if the server is too old
+    """
+    if server_version is None or server_info.is_version_supported(
+        server_version, min_server_version
+    ):
+        return
+    version_info = {
+        "min_version": min_server_version,
+        "current_version": server_version,
+    }
+    logger.error(_(messages.SERVER_TOO_OLD_FOR_CLI), version_info)
+    raise QPCRequestError(_(messages.SERVER_TOO_OLD_FOR_CLI) % version_info)
+
+
+def _is_token_expired(response):
+    """Check if a 400 response says the login token has expired."""
     token_expired = {"detail": "Token has expired"}
-    response_data = None
     try:
-        response_data = response.json()
+        return response.json() == token_expired
     except exception_class:
-        pass
+        return False
 
-    if response.status_code == 401:
-        handle_error_response(response)
-        logger.error(_(messages.SERVER_LOGIN_REQUIRED), PKG_NAME)
-        sys.exit(1)
-    elif response.status_code == 400 and response_data == token_expired:
-        handle_error_response(response)
-        logger.error(_(messages.SERVER_LOGIN_REQUIRED), PKG_NAME)
-        sys.exit(1)
-    elif response.status_code == 500:
-        handle_error_response(response)
-        logger.error(_(messages.SERVER_INTERNAL_ERROR))
+
+def handle_general_errors(response, min_server_version):
+    """Handle general errors.
+
+    :param response: The response object.
+    :returns: The response object.
+    """
+    try:
+        return check_general_errors(response, min_server_version)
+    except QPCRequestError:
         sys.exit(1)
 
-    return response
+
+def _send_json(send, url, payload, headers=None):
+    """Send a JSON payload with one of the session methods.
+
+    Payloads of at least gzip_threshold bytes are sent gzip compressed. If
+    the server answers 415 Unsupported Media Type, the payload is sent again
+    uncompressed and compression stays off for that server.
+
+    :param send: bound session method (i.e. get_session().post)
+    :param url: the server, port, and path
+    :param payload: dictionary of payload to be sent
+    :param headers: headers to include
+    :returns: reponse object
+    """
+    ssl_verify = get_ssl_verify()
+    if payload is None:
+        return send(
+            url,
+            json=payload,
+            headers=headers,
+            verify=ssl_verify,
+            timeout=_request_timeout(),
+        )
+    # serialized the same way as requests does for json=payload
+    data = json.dumps(payload, allow_nan=False).encode("utf-8")
+    json_headers = {**(headers or {}), "Content-Type": "application/json"}
+    level = get_server_setting(CONFIG_GZIP_LEVEL)
+    if (
+        level > 0
+        and server_info.get_capability(server_info.GZIP_REQUESTS, True)
+        and len(data) >= get_server_setting(CONFIG_GZIP_THRESHOLD)
+    ):
+        response = send(
+            url,
+            data=gzip.compress(data, compresslevel=level, mtime=0),
+            headers={**json_headers, "Content-Encoding": "gzip"},
+            verify=ssl_verify,
+            timeout=_request_timeout(),
+        )
+        if response.status_code != 415:
+            return response
+        logger.debug("Server rejected gzip request body, sending it uncompressed")
+        server_info.set_capability(server_info.GZIP_REQUESTS, False)
+        response.close()
+    return send(
+        url,
+        data=data,
+        headers=json_headers,
+        verify=ssl_verify,
+        timeout=_request_timeout(),
+    )
 
 
 def post(url, payload, headers=None):
@@ -89,20 +466,27 @@ def post(url, payload, headers=None):
     :param payload: dictionary of payload to be posted
     :returns: reponse object
     """
-    ssl_verify = get_ssl_verify()
-    return requests.post(url, json=payload, headers=headers, verify=ssl_verify)
+    return _send_json(get_session().post, url, payload, headers)
 
 
-def get(url, params=None, headers=None):
+def get(url, params=None, headers=None, stream=False):
     """Get JSON data from the given url.
 
     :param url: the server, port, and path
     (i.e. http://127.0.0.1:8000/api/v1/credentials)
     :param params: uri encoding params (i.e. ?param1=hello&param2=world)
+    :param stream: defer downloading the body until it is iterated
     :returns: reponse object
     """
     ssl_verify = get_ssl_verify()
-    return requests.get(url, params=params, headers=headers, verify=ssl_verify)
+    return get_session().get(
+        url,
+        params=params,
+        headers=headers,
+        verify=ssl_verify,
+        stream=stream,
+        timeout=_request_timeout(),
+    )
 
 
 def patch(url, payload, headers=None):
@@ -114,7 +498,13 @@ def patch(url, payload, headers=None):
     :returns: reponse object
     """
     ssl_verify = get_ssl_verify()
-    return requests.patch(url, json=payload, headers=headers, verify=ssl_verify)
+    return get_session().patch(
+        url,
+        json=payload,
+        headers=headers,
+        verify=ssl_verify,
+        timeout=_request_timeout(),
+    )
 
 
 def delete(url, headers=None):
@@ -125,7 +515,9 @@ def delete(url, headers=None):
     :returns: reponse object
     """
     ssl_verify = get_ssl_verify()
-    return requests.delete(url, headers=headers, verify=ssl_verify)
+    return get_session().delete(
+        url, headers=headers, verify=ssl_verify, timeout=_request_timeout()
+    )
 
 
 def put(url, payload, headers=None):
@@ -136,8 +528,7 @@ def put(url, payload, headers=None):
     :param payload: dictionary of payload to be posted
     :returns: reponse object
     """
-    ssl_verify = get_ssl_verify()
-    return requests.put(url, json=payload, headers=headers, verify=ssl_verify)
+    return _send_json(get_session().put, url, payload, headers)
 
 
 methods = {
@@ -149,6 +540,21 @@ methods = {
 }
 
 
+def _prepare_request(path, headers=None):
+    """Build the request url and headers, including the authorization token.
+
+    :param path: path after server and port (i.e. /api/v1/credentials)
+    :param headers: headers to include
+    :returns: tuple with the url and the request headers
+    """
+    token = read_client_token()
+    url = get_server_location() + path
+    req_headers = dict(headers or {})
+    if token:
+        req_headers["Authorization"] = f"Token {token}"
+    return url, req_headers
+
+
 def request(  # noqa: PLR0913
     method,
     path,
@@ -157,6 +563,7 @@ def request(  # noqa: PLR0913
     parser=None,
     headers=None,
     min_server_version=QPC_MIN_SERVER_VERSION,
+    stream=False,
 ):
     """Create a generic handler for passing to specific request methods.
 
@@ -167,6 +574,8 @@ def request(  # noqa: PLR0913
     :param parser: parser for printing usage on failure
     :param headers: headers to include
     :param min_server_version: min qpc server version allowed
+    :param stream: for GET, leave the body unread so it can be consumed in
+        chunks with iter_content() (the caller must close the response)
     :returns: reponse object
     :raises: AssertionError error if method is not supported
     """
@@ -174,32 +583,160 @@ def request(  # noqa: PLR0913
     log_command = None
     if parser is not None:
         log_command = parser.prog
-    token = read_client_token()
-    url = get_server_location() + path
-    req_headers = headers or {}
-    if token:
-        req_headers["Authorization"] = f"Token {token}"
+    url, req_headers = _prepare_request(path, headers)
 
     if method not in methods:
         logger.error("Unsupported request method %s", method)
         parser.print_help()
         sys.exit(1)
 
+    try:
+        # fail before sending anything to a server known to be too old
+        check_server_version(server_info.get_server_version(), min_server_version)
+    except QPCRequestError:
+        sys.exit(1)
+
+    import requests
+
+    from qpc import circuit_breaker
+
     try:
         result = perform_request(
-            method, url, params, payload, req_headers, min_server_version
+            method, url, params, payload, req_headers, min_server_version, stream
         )
 
+    except (requests.exceptions.Timeout, QPCDeadlineError):
+        handle_timeout_error(method, url)
+        sys.exit(1)
+    except circuit_breaker.CircuitOpenError as error:
+        logger.error(error)
+        sys.exit(1)
     except (requests.exceptions.ConnectionError, requests.exceptions.SSLError):
         handle_connection_error()
         sys.exit(1)
 
-    log_request_info(
-        method, log_command, url, decode_response_json(result), result.status_code
-    )
+    _log_response(method, log_command, url, result, stream)
     return result
 
 
+def request_many(  # noqa: PLR0913
+    specs,
+    parser=None,
+    headers=None,
+    min_server_version=QPC_MIN_SERVER_VERSION,
+    ordered=True,
+    jobs=None,
+    prefetch=None,
+):
+    """Send several requests at once using a bounded pool of threads.
+
+    Unlike request(), a failed request does not terminate the command.
+    Connection errors and general server errors are returned in the error
+    field of the matching result so the caller can report them per item.
+    Requests are only sent once the returned generator is iterated.
+
+    :param specs: iterable of (method, path, params, payload) tuples
+    :param parser: parser of the running command, used for logging
+    :param headers: headers to include in every request
+    :param min_server_version: min qpc server version allowed
+    :param ordered: yield results in the order of specs if True, otherwise
+        as soon as each request completes
+    :param jobs: max number of concurrent requests (defaults to --jobs)
+    :param prefetch: if set, only the requests of the next prefetch results
+        not consumed yet are sent, starting with the first result
+        requested, and results are yielded in order; requests not sent yet
+        are dropped when the generator is closed
+    :returns: generator of RequestResult(index, response, error)
+    """
+    specs = list(specs)
+    log_command = None
+    if parser is not None:
+        log_command = parser.prog
+    max_workers = min(jobs or _max_jobs, len(specs))
+    if prefetch is not None:
+        max_workers = min(max_workers, prefetch)
+    send = partial(
+        _request_item,
+        headers=headers,
+        min_server_version=min_server_version,
+        log_command=log_command,
+        command=_current_command(),
+    )
+    if prefetch is not None:
+        return _request_ahead(specs, send, max(max_workers, 1), prefetch)
+    return _request_all(specs, send, max_workers, ordered)
+
+
+def _request_all(specs, send, max_workers, ordered):
+    if not specs:
+        return
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = [executor.submit(send, index, spec) for index, spec in enumerate(specs)]
+    try:
+        for future in futures if ordered else as_completed(futures):
+            yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _request_ahead(specs, send, max_workers, prefetch):
+    # the requests start with the first result asked for, so a generator closed
+    # before then has no thread nor request to stop
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = []
+
+    def send_until(index):
+        while len(futures) < min(index, len(specs)):
+            futures.append(executor.submit(send, len(futures), specs[len(futures)]))
+
+    try:
+        send_until(prefetch)
+        for index in range(len(specs)):
+            send_until(index + 1)
+            result = futures[index].result()
+            send_until(index + 1 + prefetch)
+            yield result
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _request_item(  # noqa: PLR0913
+    index, spec, headers, min_server_version, log_command, command
+):
+    """Send one request_many() request, capturing errors in the result."""
+    # the request threads share the retry budget and deadline of the command
+    _command.set(command)
+    method, path, params, payload = spec
+    if method not in methods:
+        error = QPCRequestError(f"Unsupported request method {method}")
+        return RequestResult(index, None, error)
+    url, req_headers = _prepare_request(path, headers)
+    try:
+        check_server_version(server_info.get_server_version(), min_server_version)
+    except QPCRequestError as error:
+        return RequestResult(index, None, error)
+
+    import requests
+
+    try:
+        response = QPCResponse(send_request(method, url, params, payload, req_headers))
+    except (requests.exceptions.RequestException, QPCDeadlineError) as error:
+        logger.error(
+            _(messages.REQUEST_FAILED), {"method": method, "url": url, "error": error}
+        )
+        return RequestResult(index, None, error)
+    _log_response(method, log_command, url, response)
+    try:
+        check_general_errors(response, min_server_version)
+    except QPCRequestError as error:
+        return RequestResult(index, response, error)
+    return RequestResult(index, response, None)
+
+
 def handle_connection_error():
     """Log connection error."""
     config = read_server_config()
@@ -215,6 +752,135 @@ def handle_connection_error():
     logger.error(_(messages.SERVER_CONFIG_REQUIRED), PKG_NAME)
 
 
+def handle_timeout_error(method, url):
+    """Log a request timeout."""
+    request_info = {"method": method, "url": url}
+    if _deadline_passed():
+        logger.error(_(messages.DEADLINE_EXCEEDED), request_info)
+    else:
+        logger.error(_(messages.REQUEST_TIMEOUT), request_info)
+
+
+def handle_body_error(response, error):
+    """Log an error receiving the body of a streamed response.
+
+    :param response: the response whose body was being received
+    :param error: the requests exception raised while receiving it
+    """
+    import requests
+    from urllib3.exceptions import ReadTimeoutError
+
+    method = response.request.method if response.request is not None else GET
+    # requests raises read timeouts of a streamed body as connection errors
+    if isinstance(error, requests.exceptions.Timeout) or any(
+        isinstance(arg, ReadTimeoutError) for arg in error.args
+    ):
+        handle_timeout_error(method, response.url)
+    else:
+        logger.error(
+            _(messages.REQUEST_FAILED),
+            {"method": method, "url": response.url, "error": error},
+        )
+
+
+def _send(  # noqa: PLR0913
+    method, url, params=None, payload=None, req_headers=None, stream=False
+):
+    request_method = methods[method]
+    if method == "GET":
+        return request_method(url, params, req_headers, stream)
+    if method == "DELETE":
+        return request_method(url, req_headers)
+    return request_method(url, payload, req_headers)
+
+
+def send_request(  # noqa: PLR0913
+    method, url, params=None, payload=None, req_headers=None, stream=False
+):
+    """Send the api request and return the response, without error handling.
+
+    Requests to a server that keeps failing to connect are stopped by the
+    circuit breaker, raising circuit_breaker.CircuitOpenError.
+    """
+    import requests
+
+    from qpc import circuit_breaker
+
+    circuit_breaker.check(_probe_server)
+    try:
+        response = _send_with_retries(method, url, params, payload, req_headers, stream)
+    except requests.exceptions.SSLError:
+        raise
+    except requests.exceptions.ConnectionError:
+        circuit_breaker.record_failure()
+        raise
+    circuit_breaker.record_success()
+    return response
+
+
+def _probe_server():
+    """Check the server answers at all, closing the response."""
+    get_session().get(
+        get_server_location() + STATUS_URI,
+        verify=get_ssl_verify(),
+        timeout=_request_timeout(),
+    ).close()
+
+
+def _send_with_retries(  # noqa: PLR0913
+    method, url, params=None, payload=None, req_headers=None, stream=False
+):
+    """Send the api request, retrying transient failures.
+
+    Idempotent requests that fail with a connection error or a transient
+    status code (429, 502, 503, 504) are retried with exponential backoff and
+    jitter, honoring Retry-After. The number of retries, the backoff base and
+    the total time a command may spend waiting on retries come from
+    server.config.
+    """
+    import requests
+
+    retries = get_server_setting(CONFIG_RETRIES) if method in RETRY_METHODS else 0
+    attempt = 0
+    while True:
+        response = None
+        try:
+            response = _send(method, url, params, payload, req_headers, stream)
+        except requests.exceptions.SSLError:
+            raise
+        except requests.exceptions.ConnectionError as error:
+            if attempt >= retries:
+                raise
+            reason = error
+        else:
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= retries:
+                return response
+            reason = f"status code {response.status_code}"
+        delay = _retry_delay(response, attempt)
+        time_spent = _reserve_retry_time(delay)
+        if time_spent is None:
+            # out of retry budget, surface the last failure
+            if response is None:
+                raise reason
+            return response
+        attempt += 1
+        logger.warning(
+            _(messages.REQUEST_RETRY),
+            {
+                "method": method,
+                "url": url,
+                "reason": reason,
+                "delay": delay,
+                "attempt": attempt,
+                "retries": retries,
+                "time_spent": time_spent,
+            },
+        )
+        if response is not None:
+            response.close()
+        time.sleep(delay)
+
+
 def perform_request(  # noqa: PLR0913
     method,
     url,
@@ -222,25 +888,72 @@ def perform_request(  # noqa: PLR0913
     payload=None,
     req_headers=None,
     min_server_version=QPC_MIN_SERVER_VERSION,
+    stream=False,
 ):
     """Perform the api request and return the response."""
-    request_method = methods[method]
-    if method == "GET":
-        return handle_general_errors(
-            request_method(url, params, req_headers), min_server_version
-        )
-    if method == "DELETE":
-        return handle_general_errors(
-            request_method(url, req_headers), min_server_version
-        )
-    return handle_general_errors(
-        request_method(url, payload, req_headers), min_server_version
-    )
+    if method == GET and get_server_setting(CONFIG_HTTP_CACHE):
+        response = _send_cached(url, params, req_headers, stream)
+    else:
+        response = send_request(method, url, params, payload, req_headers, stream)
+    return handle_general_errors(QPCResponse(response), min_server_version)
 
 
-def decode_response_json(response):
-    """Return either a json or text to avoid saving binary to logs."""
-    try:
-        return response.json()
-    except ValueError:
-        return "<encoded blob ignored>"
+def _send_cached(url, params=None, req_headers=None, stream=False):
+    """Send a GET request through the on-disk HTTP validation cache.
+
+    A cached response is revalidated with If-None-Match/If-Modified-Since
+    and its body is served from disk when the server answers 304.
+    """
+    from qpc import http_cache
+
+    key = http_cache.cache_key(url, params, req_headers)
+    stored_headers = http_cache.lookup(key)
+    if stored_headers is not None:
+        conditional_headers = {
+            **(req_headers or {}),
+            **http_cache.validators(stored_headers),
+        }
+        response = send_request(GET, url, params, None, conditional_headers, stream)
+        if response.status_code == 304:
+            cached = http_cache.revalidated(key, stored_headers, response, stream)
+            if cached is not None:
+                return cached
+            # the entry was evicted since the lookup
+            response.close()
+            response = send_request(GET, url, params, None, req_headers, stream)
+    else:
+        response = send_request(GET, url, params, None, req_headers, stream)
+    if response.status_code == 200:
+        response = http_cache.store(key, response, stream)
+    return response
+
+
+def _log_response(method, log_command, url, response, stream=False):
+    """Log a response at DEBUG level, doing no work if DEBUG is disabled."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    response_info = STREAMED_CONTENT if stream else summarize_response_body(response)
+    log_request_info(method, log_command, url, response_info, response.status_code)
+
+
+def summarize_response_body(response):
+    """Return a loggable summary of a response body, bounded in size.
+
+    JSON bodies that fit in the log_payload_size budget are decoded. Bigger
+    text bodies are cut at the budget and followed by their size and sha256
+    digest, and binary bodies such as gzip reports are only summarized.
+    """
+    body = response.content
+    budget = get_server_setting(CONFIG_LOG_PAYLOAD_SIZE)
+    is_json = is_json_response(response)
+    if is_json and len(body) <= budget:
+        try:
+            return response.json()
+        except ValueError:
+            return ENCODED_CONTENT
+    summary = f"{len(body)} bytes, sha256 {hashlib.sha256(body).hexdigest()}"
+    content_type = response.headers.get("Content-Type", "")
+    if is_json or content_type.startswith("text/"):
+        text = body[:budget].decode(response.encoding or "utf-8", errors="replace")
+        return f"{text}... <truncated, {summary}>"
+    return f"<encoded blob ignored, {summary}>"
@@ -0,0 +1,294 @@
+"""Ids of credentials, sources and scans, resolved from their names.
+
+Commands take objects by name while the server addresses them by id. The
+ids seen in list and lookup responses are saved in QPC_ID_INDEX, keyed by
+server location, so a command naming known objects sends no lookup request;
+the names not known are looked up in as few requests as possible.
+Commands adding, editing or clearing objects drop the ids of the names they
+were given, or of their whole kind when they were given no name. An id may
+still be stale when another client changed the objects: a command failing
+with it resolves its names on the server again and retries when they changed.
+"""
+
+import json
+from urllib.parse import quote
+
+from qpc import cred, scan, server_info, source, utils
+from qpc.pagination import Pager
+from qpc.utils import (
+    get_server_location,
+    logger,
+    read_snapshot,
+    write_json_atomically,
+)
+
+# objects resolved, with the list looking them up
+URIS = {
+    cred.SUBCOMMAND: cred.CREDENTIAL_URI,
+    source.SUBCOMMAND: source.SOURCE_URI,
+    scan.SUBCOMMAND: scan.SCAN_URI,
+}
+
+# fields of the objects kept in the index, which never change for a name
+FIELDS = {
+    cred.SUBCOMMAND: ("name", "id", "cred_type"),
+    source.SUBCOMMAND: ("name", "id"),
+    scan.SUBCOMMAND: ("name", "id"),
+}
+
+# objects looked up many names at a time, joined by commas; the names not
+# matched are looked up one by one, concurrently, and when that finds some of
+# them while the joined lookup found none, the next lookups of that server are
+# one by one too
+JOINED_LOOKUPS = (cred.SUBCOMMAND, source.SUBCOMMAND)
+JOINED_SEPARATOR = "%2C"
+
+# longest joined names, URL encoded, sent in a single lookup request
+MAX_LOOKUP_LENGTH = 2000
+
+# capability remembered in QPC_SERVER_INFO, False when the server matches
+# joined names as a single name
+MULTI_NAME_LOOKUPS = "multi_name_lookups"
+
+# objects whose lookup results must match the name exactly; for the others,
+# the only result of the lookup of a single name is taken, but its id is not
+# saved unless its name matches
+EXACT_LOOKUPS = (scan.SUBCOMMAND,)
+
+
+def resolve(kind, names, parser=None, fresh=False):
+    """Return the entries of objects of a kind, by name.
+
+    Names missing from the index, or all of them if fresh, are looked up on
+    the server.
+
+    :param kind: the subcommand managing the objects (i.e. cred)
+    :param names: the names of the objects
+    :param parser: the parser of the command, to report request errors
+    :param fresh: True to ignore the index
+    :returns: dict mapping the names found to their entries, dicts with the
+        FIELDS of their kind, or None if the lookup request failed
+    """
+    names = list(dict.fromkeys(names))
+    known = _server_index().get(kind, {})
+    resolved = {}
+    if not fresh:
+        resolved = {name: known[name] for name in names if _valid(known.get(name))}
+    missing = [name for name in names if name not in resolved]
+    if missing:
+        found = _lookup(kind, missing, parser)
+        if found is None:
+            return None
+        # results not named exactly as looked up are only used by this command
+        exact = {name: entry for name, entry in found.items() if entry["name"] == name}
+        gone = [name for name in missing if name not in exact and name in known]
+        if gone or any(known.get(name) != entry for name, entry in exact.items()):
+            _update(kind, exact, gone)
+        resolved.update(found)
+    return {name: resolved[name] for name in names if name in resolved}
+
+
+def remember(kind, results):
+    """Save the ids of objects received from the server.
+
+    :param kind: the subcommand managing the objects (i.e. cred)
+    :param results: the objects, as listed by the server
+    """
+    found = _by_name(entries(kind, results))
+    known = _server_index().get(kind, {})
+    if any(known.get(name) != entry for name, entry in found.items()):
+        _update(kind, found)
+
+
+def forget(kind, names=None):
+    """Drop the saved ids of objects of a kind.
+
+    :param kind: the subcommand managing the objects (i.e. cred)
+    :param names: the names of the objects, None for all of them
+    """
+    known = _server_index().get(kind, {})
+    if names is None:
+        if known:
+            _update(kind, None)
+    elif any(name in known for name in names):
+        _update(kind, {}, names)
+
+
+def _lookup(kind, names, parser):
+    """Look names up on the server, returning the entries found."""
+    if (
+        kind not in JOINED_LOOKUPS
+        or len(names) == 1
+        or not server_info.get_capability(MULTI_NAME_LOOKUPS, True)
+    ):
+        return _lookup_each(kind, names, parser)
+    found = _lookup_joined(kind, names, parser)
+    if found is None:
+        return None
+    # a name may only match a result named otherwise, taken when looked up alone
+    missing = [name for name in names if name not in found]
+    if missing:
+        found_each = _lookup_each(kind, missing, parser)
+        if found_each is None:
+            return None
+        if found_each and not found:
+            # none of the names matched: the server may have taken them for one
+            logger.debug("The server does not look up many %s names at once", kind)
+            server_info.set_capability(MULTI_NAME_LOOKUPS, False)
+        found.update(found_each)
+    return found
+
+
+def _lookup_joined(kind, names, parser):
+    """Look names up by chunks of names joined by commas, a page at a time."""
+    from http import HTTPStatus
+
+    from qpc.request import GET, request
+
+    found = {}
+    for chunk in _chunks(names):
+        pager = Pager(len(chunk))
+        while pager.more:
+            response = request(
+                parser=parser,
+                method=GET,
+                path=URIS[kind],
+                params={"name": ",".join(chunk), **pager.params()},
+                payload=None,
+            )
+            if response.status_code != HTTPStatus.OK:
+                return None
+            results = pager.update(response, response.json())
+            found.update(_matching(kind, chunk, results))
+    return found
+
+
+def _lookup_each(kind, names, parser):
+    """Look names up concurrently, one request per name."""
+    from http import HTTPStatus
+
+    from qpc.request import GET, request_many
+
+    specs = [(GET, URIS[kind], {"name": name}, None) for name in names]
+    found = {}
+    results = request_many(specs, parser=parser)
+    try:
+        for result in results:
+            if result.error is not None:
+                return None
+            if result.response.status_code != HTTPStatus.OK:
+                return None
+            found.update(
+                _matching(
+                    kind,
+                    [names[result.index]],
+                    result.response.json().get("results") or [],
+                )
+            )
+    finally:
+        results.close()
+    return found
+
+
+def _chunks(names):
+    """Split names into chunks whose joined query stays under MAX_LOOKUP_LENGTH."""
+    chunk = []
+    length = 0
+    for name in names:
+        # the name and its comma, URL encoded
+        name_length = len(quote(name, safe="")) + len(JOINED_SEPARATOR)
+        if chunk and length + name_length > MAX_LOOKUP_LENGTH:
+            yield chunk
+            chunk = []
+            length = 0
+        chunk.append(name)
+        length += name_length
+    if chunk:
+        yield chunk
+
+
+def _matching(kind, names, results):
+    """Return the entries of the results matching the looked up names.
+
+    The only result of the lookup of a single name is taken, with its own
+    name, unless the kind is in EXACT_LOOKUPS.
+    """
+    if kind not in EXACT_LOOKUPS and len(names) == 1 and len(results) == 1:
+        return dict(zip(names, entries(kind, results)))
+    names = set(names)
+    return _by_name(
+        entries(kind, [result for result in results if result.get("name") in names])
+    )
+
+
+def entries(kind, results):
+    """Return the fields of objects kept in the index.
+
+    :param kind: the subcommand managing the objects (i.e. cred)
+    :param results: the objects, as listed by the server
+    :returns: list of the entries of the objects having a name and an id
+    """
+    return [
+        {field: result.get(field) for field in FIELDS[kind]}
+        for result in results
+        if "name" in result and "id" in result
+    ]
+
+
+def _by_name(kind_entries):
+    return {entry["name"]: entry for entry in kind_entries}
+
+
+def _valid(entry):
+    return isinstance(entry, dict) and "id" in entry
+
+
+def _load_id_index():
+    with open(utils.QPC_ID_INDEX, encoding="utf-8") as index_file:
+        try:
+            index = json.load(index_file)
+        except ValueError:
+            return {}
+    if not isinstance(index, dict):
+        return {}
+    return index
+
+
+def _read_index():
+    try:
+        return read_snapshot(utils.QPC_ID_INDEX, _load_id_index)
+    except OSError:
+        return {}
+
+
+def _server_index():
+    server_index = _read_index().get(get_server_location())
+    if not isinstance(server_index, dict):
+        return {}
+    return {
+        kind: kind_entries
+        for kind, kind_entries in server_index.items()
+        if isinstance(kind_entries, dict)
+    }
+
+
+def _update(kind, found, dropped=()):
+    """Add the found entries of a kind and drop others, None dropping all."""
+    location = get_server_location()
+    if location is None:
+        return
+    index = dict(_read_index())
+    server_index = _server_index()
+    if found is None:
+        server_index.pop(kind, None)
+    else:
+        kind_entries = dict(server_index.get(kind, {}))
+        for name in dropped:
+            kind_entries.pop(name, None)
+        kind_entries.update(found)
+        server_index[kind] = kind_entries
+    index[location] = server_index
+    try:
+        write_json_atomically(utils.QPC_ID_INDEX, index)
+    except OSError as error:
+        logger.debug("Could not save the id index: %s", error)
@@ -1,10 +1,9 @@
 """ScanAddCommand is used to create a scan."""
 
 import sys
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
 from qpc import messages, scan
 from qpc.clicommand import CliCommand
 from qpc.request import POST
@@ -32,7 +31,7 @@ class ScanAddCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             POST,
             scan.SCAN_URI,
-            [codes.created],
+            [HTTPStatus.CREATED],
         )
         self.parser.add_argument(
             "--name",
@@ -86,15 +85,17 @@ class ScanAddCommand(CliCommand):
         )
         self.source_ids = []
 
-    def _validate_args(self):
-        CliCommand._validate_args(self)
+    def _resolve_names(self, fresh=False):
         source_ids = []
         if self.args.sources:
             # check for existence of sources
-            not_found, source_ids = get_source_ids(self.parser, self.args.sources)
+            not_found, source_ids = get_source_ids(
+                self.parser, self.args.sources, fresh
+            )
             if not_found is True:
                 sys.exit(1)
         self.source_ids = source_ids
+        return source_ids
 
     def _build_data(self):
         """Construct the payload for a scan given our arguments.
@@ -1,8 +1,7 @@
 """ScanCancelCommand is used to cancel a specific system scan."""
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
 from qpc import messages, scan
 from qpc.clicommand import CliCommand
 from qpc.request import PUT
@@ -29,7 +28,7 @@ class ScanCancelCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             PUT,
             scan.SCAN_JOB_URI,
-            [codes.ok],
+            [HTTPStatus.OK],
         )
         self.parser.add_argument(
             "--id",
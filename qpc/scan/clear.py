@@ -1,20 +1,18 @@
 """ScanClearCommand is used to clear one or all host scans."""
 
 import sys
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
 from qpc import messages, scan
-from qpc.clicommand import CliCommand
-from qpc.request import DELETE, GET, request
+from qpc.clicommand import ClearCliCommand
+from qpc.request import GET
 from qpc.translation import _
-from qpc.utils import handle_error_response
 
 logger = getLogger(__name__)
 
 
-class ScanClearCommand(CliCommand):
+class ScanClearCommand(ClearCliCommand):
     """Defines the clear command.
 
     This command is for clearing a specific scan or all scans.
@@ -22,17 +20,19 @@ class ScanClearCommand(CliCommand):
 
     SUBCOMMAND = scan.SUBCOMMAND
     ACTION = scan.CLEAR
+    REMOVED = messages.SCAN_REMOVED
+    FAILED_TO_REMOVE = messages.SCAN_FAILED_TO_REMOVE
 
     def __init__(self, subparsers):
         """Create command."""
-        CliCommand.__init__(
+        ClearCliCommand.__init__(
             self,
             self.SUBCOMMAND,
             self.ACTION,
             subparsers.add_parser(self.ACTION),
             GET,
             scan.SCAN_URI,
-            [codes.ok],
+            [HTTPStatus.OK],
         )
         group = self.parser.add_mutually_exclusive_group(required=True)
         group.add_argument(
@@ -49,21 +49,6 @@ class ScanClearCommand(CliCommand):
         if self.args.name:
             self.req_params = {"name": self.args.name}
 
-    def _delete_entry(self, scan_entry, print_out=True):
-        deleted = False
-        delete_uri = scan.SCAN_URI + str(scan_entry["id"]) + "/"
-        response = request(DELETE, delete_uri, parser=self.parser)
-        name = scan_entry["name"]
-        if response.status_code == codes.no_content:
-            deleted = True
-            if print_out:
-                logger.info(_(messages.SCAN_REMOVED), name)
-        else:
-            handle_error_response(response)
-            if print_out:
-                logger.error(_(messages.SCAN_FAILED_TO_REMOVE), name)
-        return deleted
-
     def _handle_response_success(self):  # noqa: C901 PLR0912
         json_data = self.response.json()
         count = json_data.get("count", 0)
@@ -86,11 +71,8 @@ class ScanClearCommand(CliCommand):
             sys.exit(1)
         else:
             # remove all scan entries
-            remove_error = []
             next_link = json_data.get("next")
-            for entry in results:
-                if self._delete_entry(entry, print_out=False) is False:
-                    remove_error.append(entry["id"])
+            remove_error = [entry["id"] for entry in self._delete_entries(results)]
             if remove_error:
                 scan_err = ",".join(str(remove_error))
                 logger.error(_(messages.SCAN_PARTIAL_REMOVE), scan_err)
@@ -1,17 +1,17 @@
 """ScanEditCommand is used to edit existing scans."""
 
 import sys
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
 from qpc import messages, scan
 from qpc.clicommand import CliCommand
-from qpc.request import GET, PATCH, request
+from qpc.request import PATCH
 from qpc.scan.utils import (
     build_scan_payload,
     get_enabled_products,
     get_optional_products,
+    get_scan_object_id,
     get_source_ids,
 )
 from qpc.translation import _
@@ -37,7 +37,7 @@ class ScanEditCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             PATCH,
             scan.SCAN_URI,
-            [codes.ok],
+            [HTTPStatus.OK],
         )
         self.parser.add_argument(
             "--name",
@@ -115,40 +115,24 @@ class ScanEditCommand(CliCommand):
             self.parser.print_help()
             sys.exit(1)
 
+    def _resolve_names(self, fresh=False):
         # check for existence of scan
-        exists = False
-        response = request(
-            parser=self.parser,
-            method=GET,
-            path=scan.SCAN_URI,
-            params={"name": self.args.name},
-            payload=None,
-        )
-        if response.status_code == codes.ok:
-            json_data = response.json()
-            count = json_data.get("count", 0)
-            results = json_data.get("results", [])
-            if count >= 1:
-                for result in results:
-                    if result["name"] == self.args.name:
-                        scan_entry = result
-                        self.req_path = self.req_path + str(scan_entry["id"]) + "/"
-                        exists = True
-            if not exists or count == 0:
-                logger.error(_(messages.SCAN_DOES_NOT_EXIST), self.args.name)
-                sys.exit(1)
-        else:
-            logger.error(_(messages.SCAN_DOES_NOT_EXIST), self.args.name)
+        found, scan_object_id = get_scan_object_id(self.parser, self.args.name, fresh)
+        if not found:
             sys.exit(1)
+        self.req_path = scan.SCAN_URI + scan_object_id
 
         # check for valid source values
         source_ids = []
         if self.args.sources:
             # check for existence of sources
-            not_found, source_ids = get_source_ids(self.parser, self.args.sources)
+            not_found, source_ids = get_source_ids(
+                self.parser, self.args.sources, fresh
+            )
             if not_found is True:
                 sys.exit(1)
         self.source_ids = source_ids
+        return scan_object_id, source_ids
 
     def _build_data(self):
         """Construct the payload for a scan edit given our arguments.
@@ -1,22 +1,20 @@
 """ScanListCommand is used to list system scans."""
 
 import sys
-import urllib.parse as urlparse
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
 from qpc import messages, scan
-from qpc.clicommand import CliCommand
+from qpc.clicommand import ListCliCommand
+from qpc.output import get_format, write_record
 from qpc.request import GET
 from qpc.scan.utils import get_scan_object_id
 from qpc.translation import _
-from qpc.utils import pretty_print
 
 logger = getLogger(__name__)
 
 
-class ScanJobCommand(CliCommand):
+class ScanJobCommand(ListCliCommand):
     """Defines the job command.
 
     This command is for listing the existing scan jobs for each scan.
@@ -27,14 +25,14 @@ class ScanJobCommand(CliCommand):
 
     def __init__(self, subparsers):
         """Create command."""
-        CliCommand.__init__(
+        ListCliCommand.__init__(
             self,
             self.SUBCOMMAND,
             self.ACTION,
             subparsers.add_parser(self.ACTION),
             GET,
             scan.SCAN_URI,
-            [codes.ok],
+            [HTTPStatus.OK],
         )
         group = self.parser.add_mutually_exclusive_group(required=True)
         group.add_argument(
@@ -62,7 +60,7 @@ class ScanJobCommand(CliCommand):
 
     def _validate_args(self):
         """Validate the scan job arguments."""
-        CliCommand._validate_args(self)
+        ListCliCommand._validate_args(self)
         if self.args.id and self.args.name:
             self.parser.print_usage()
             sys.exit(1)
@@ -71,46 +69,26 @@ class ScanJobCommand(CliCommand):
             self.parser.print_usage()
             sys.exit(1)
 
+    def _resolve_names(self, fresh=False):
+        if "name" not in self.args or not self.args.name:
+            return None
+        found, scan_object_id = get_scan_object_id(self.parser, self.args.name, fresh)
+        if not found:
+            sys.exit(1)
+        self.req_path = scan.SCAN_URI + scan_object_id + "jobs/"
+        return scan_object_id
+
     def _build_req_params(self):
         """Add filter by scan_type/state query param."""
-        if "name" in self.args and self.args.name:
-            found, scan_object_id = get_scan_object_id(self.parser, self.args.name)
-            if found:
-                self.req_path += scan_object_id + "jobs/"
-            else:
-                sys.exit(1)
         if "id" in self.args and self.args.id:
             self.req_path = scan.SCAN_JOB_URI + str(self.args.id) + "/"
         if "status" in self.args and self.args.status:
-            self.req_params = {"status": self.args.status}
+            self._add_filter("status", self.args.status)
 
-    def _handle_response_success(self):
-        if self.response.status_code in [codes.ok]:
-            json_data = self.response.json()
-            count = json_data.get("count", 0)
-            results = json_data.get("results", [])
-            if count == 0:
-                # if GET is used for single scan job,
-                # count doesn't exist and will be 0
-                if "id" in self.args and self.args.id:
-                    data = pretty_print(json_data)
-                    print(data)
-                else:
-                    logger.error(_(messages.SCAN_LIST_NO_SCANS))
-                    sys.exit(1)
-            else:
-                data = pretty_print(results)
-                print(data)
-            if json_data.get("next"):
-                next_link = json_data.get("next")
-                params = urlparse.parse_qs(urlparse.urlparse(next_link).query)
-                page = params.get("page", ["1"])[0]
-                if self.req_params:
-                    self.req_params["page"] = page
-                else:
-                    self.req_params = {"page": page}
-                input(_(messages.NEXT_RESULTS))
-                self._do_command()
+    def _handle_empty_list(self, json_data):
+        # if GET is used for single scan job, count doesn't exist and will be 0
+        if "id" in self.args and self.args.id:
+            write_record(json_data, get_format(self.args))
         else:
             logger.error(_(messages.SCAN_LIST_NO_SCANS))
             sys.exit(1)
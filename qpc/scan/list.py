@@ -1,20 +1,17 @@
 """ScanListCommand is used to list system scans."""
 
-import urllib.parse as urlparse
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
 from qpc import messages, scan
-from qpc.clicommand import CliCommand
+from qpc.clicommand import ListCliCommand
 from qpc.request import GET
 from qpc.translation import _
-from qpc.utils import pretty_print
 
 logger = getLogger(__name__)
 
 
-class ScanListCommand(CliCommand):
+class ScanListCommand(ListCliCommand):
     """Defines the list command.
 
     This command is for listing sources scans used to gather system facts.
@@ -25,14 +22,14 @@ class ScanListCommand(CliCommand):
 
     def __init__(self, subparsers):
         """Create command."""
-        CliCommand.__init__(
+        ListCliCommand.__init__(
             self,
             self.SUBCOMMAND,
             self.ACTION,
             subparsers.add_parser(self.ACTION),
             GET,
             scan.SCAN_URI,
-            [codes.ok],
+            [HTTPStatus.OK],
         )
         self.parser.add_argument(
             "--type",
@@ -42,30 +39,13 @@ class ScanListCommand(CliCommand):
             help=_(messages.SCAN_TYPE_FILTER_HELP),
             required=False,
         )
+        self._add_filter_arguments()
         self.req_params = {}
 
     def _build_req_params(self):
         """Add filter by scan_type/state query param."""
         if "type" in self.args and self.args.type:
-            self.req_params["scan_type"] = self.args.type
-
-    def _handle_response_success(self):
-        json_data = self.response.json()
-        count = json_data.get("count", 0)
-        results = json_data.get("results", [])
-        if count == 0:
-            logger.error(_(messages.SCAN_LIST_NO_SCANS))
-        else:
-            data = pretty_print(results)
-            print(data)
+            self._add_filter("scan_type", self.args.type)
 
-        if json_data.get("next"):
-            next_link = json_data.get("next")
-            params = urlparse.parse_qs(urlparse.urlparse(next_link).query)
-            page = params.get("page", ["1"])[0]
-            if self.req_params:
-                self.req_params["page"] = page
-            else:
-                self.req_params = {"page": page}
-            input(_(messages.NEXT_RESULTS))
-            self._do_command()
+    def _handle_empty_list(self, json_data):
+        logger.error(_(messages.SCAN_LIST_NO_SCANS))
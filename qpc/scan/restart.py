@@ -1,9 +1,8 @@
 """ScanRestartCommand is used to restart a specific system scan."""
 
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
 from qpc import messages, scan
 from qpc.clicommand import CliCommand
 from qpc.request import PUT
@@ -30,7 +29,7 @@ class ScanRestartCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             PUT,
             scan.SCAN_JOB_URI,
-            [codes.ok],
+            [HTTPStatus.OK],
         )
         self.parser.add_argument(
             "--id",
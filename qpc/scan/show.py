@@ -1,15 +1,15 @@
 """ScanShowCommand is used to show info on a specific system scan."""
 
 import sys
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
 from qpc import messages, scan
 from qpc.clicommand import CliCommand
-from qpc.request import GET, request
+from qpc.output import add_format_argument, get_format, write_record
+from qpc.request import GET
+from qpc.scan.utils import get_scan_object_id
 from qpc.translation import _
-from qpc.utils import pretty_print
 
 logger = getLogger(__name__)
 
@@ -33,7 +33,7 @@ class ScanShowCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             GET,
             scan.SCAN_URI,
-            [codes.ok],
+            [HTTPStatus.OK],
         )
         self.parser.add_argument(
             "--name",
@@ -42,34 +42,18 @@ class ScanShowCommand(CliCommand):
             help=_(messages.SCAN_NAME_HELP),
             required=True,
         )
+        add_format_argument(self.parser)
 
-    def _validate_args(self):
-        CliCommand._validate_args(self)
-        found = False
-        response = request(
-            parser=self.parser,
-            method=GET,
-            path=scan.SCAN_URI,
-            params={"name": self.args.name},
-            payload=None,
-        )
-        if response.status_code == codes.ok:
-            json_data = response.json()
-            count = json_data.get("count", 0)
-            results = json_data.get("results", [])
-            if count >= 1:
-                for result in results:
-                    if result["name"] == self.args.name:
-                        self.req_path = self.req_path + str(result["id"]) + "/"
-                        found = True
-            if not found or count == 0:
-                logger.error(_(messages.SCAN_DOES_NOT_EXIST), self.args.name)
-                sys.exit(1)
+    def _resolve_names(self, fresh=False):
+        found, scan_object_id = get_scan_object_id(self.parser, self.args.name, fresh)
+        if not found:
+            sys.exit(1)
+        self.req_path = scan.SCAN_URI + scan_object_id
+        return scan_object_id
 
     def _handle_response_success(self):
         json_data = self.response.json()
-        data = pretty_print(json_data)
-        print(data)
+        write_record(json_data, get_format(self.args))
 
     def _handle_response_error(self):
         logger.error(_(messages.SCAN_DOES_NOT_EXIST), self.args.name)
@@ -1,10 +1,9 @@
 """ScanStartCommand is used to trigger a host scan."""
 
 import sys
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
 from qpc import messages, scan
 from qpc.clicommand import CliCommand
 from qpc.request import POST
@@ -33,7 +32,7 @@ class ScanStartCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             POST,
             scan.SCAN_URI,
-            [codes.created],
+            [HTTPStatus.CREATED],
         )
         self.parser.add_argument(
             "--name",
@@ -43,15 +42,13 @@ class ScanStartCommand(CliCommand):
             required=True,
         )
 
-    def _validate_args(self):
-        CliCommand._validate_args(self)
-        if self.args.name:
-            # check for existence of scan object
-            found, scan_object_id = get_scan_object_id(self.parser, self.args.name)
-            if found is False:
-                sys.exit(1)
-            else:
-                self.req_path = scan.SCAN_URI + scan_object_id + "jobs/"
+    def _resolve_names(self, fresh=False):
+        # check for existence of scan object
+        found, scan_object_id = get_scan_object_id(self.parser, self.args.name, fresh)
+        if found is False:
+            sys.exit(1)
+        self.req_path = scan.SCAN_URI + scan_object_id + "jobs/"
+        return scan_object_id
 
     def _handle_response_success(self):
         json_data = self.response.json()
@@ -2,77 +2,45 @@
 
 from logging import getLogger
 
-from requests import codes
-
-from qpc import messages, scan, source
-from qpc.request import GET, request
+from qpc import messages, resolver, scan, source
 from qpc.translation import _
 
 logger = getLogger(__name__)
 
 
-def get_source_ids(parser, source_names):
+def get_source_ids(parser, source_names, fresh=False):
     """Grab the source ids from the source if it exists.
 
+    :param fresh: True to look the sources up on the server, ignoring the
+        ids saved by the resolver
     :returns Boolean regarding the existence of source &
     the source ids
     """
     not_found = False
     source_ids = []
-    for source_name in set(source_names):
-        # check for existence of source
-        response = request(
-            parser=parser,
-            method=GET,
-            path=source.SOURCE_URI,
-            params={"name": source_name},
-            payload=None,
-        )
-        if response.status_code == codes.ok:
-            json_data = response.json()
-            count = json_data.get("count", 0)
-            results = json_data.get("results", [])
-            if count == 1:
-                source_entry = results[0]
-                source_ids.append(source_entry["id"])
-            else:
-                logger.error(_(messages.SOURCE_DOES_NOT_EXIST), source_name)
-                not_found = True
+    found = resolver.resolve(source.SUBCOMMAND, source_names, parser, fresh) or {}
+    for source_name in dict.fromkeys(source_names):
+        if source_name in found:
+            source_ids.append(found[source_name]["id"])
         else:
             logger.error(_(messages.SOURCE_DOES_NOT_EXIST), source_name)
             not_found = True
     return not_found, source_ids
 
 
-def get_scan_object_id(parser, name):
+def get_scan_object_id(parser, name, fresh=False):
     """Grab the scan id from the scan object if it exists.
 
+    :param fresh: True to look the scan up on the server, ignoring the id
+        saved by the resolver
     :returns Boolean regarding the existence of the object &
     the scan object id
     """
-    found = False
-    scan_object_id = None
-    response = request(
-        parser=parser,
-        method=GET,
-        path=scan.SCAN_URI,
-        params={"name": name},
-        payload=None,
-    )
-    if response.status_code == codes.ok:
-        json_data = response.json()
-        count = json_data.get("count", 0)
-        results = json_data.get("results", [])
-        if count >= 1:
-            for result in results:
-                if result["name"] == name:
-                    scan_object_id = str(result["id"]) + "/"
-                    found = True
-        if not found or count == 0:
-            logger.error(_(messages.SCAN_DOES_NOT_EXIST), name)
-    else:
+    found = resolver.resolve(scan.SUBCOMMAND, [name], parser, fresh) or {}
+    if name not in found:
         logger.error(_(messages.SCAN_DOES_NOT_EXIST), name)
-    return found, scan_object_id
+        return False, None
+    return True, str(found[name]["id"]) + "/"
 
 
 def get_optional_products(disabled_optional_products):
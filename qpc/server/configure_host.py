@@ -8,7 +8,7 @@ from qpc import messages
 from qpc.clicommand import CliCommand
 from qpc.source.utils import validate_port
 from qpc.translation import _
-from qpc.utils import write_server_config
+from qpc.utils import update_server_config
 
 logger = getLogger(__name__)
 
@@ -81,7 +81,7 @@ class ConfigureHostCommand(CliCommand):
             "ssl_verify": self.args.ssl_verify,
             "require_token": self.args.require_token,
         }
-        write_server_config(server_config)
+        update_server_config(server_config)
         protocol = "https"
         if self.args.use_http:
             protocol = "http"
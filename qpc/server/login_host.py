@@ -1,10 +1,9 @@
 """LoginHostCommand is used to login with username and password."""
 
 from getpass import getpass
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
 from qpc import messages, server
 from qpc.clicommand import CliCommand
 from qpc.request import POST
@@ -33,7 +32,7 @@ class LoginHostCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             POST,
             server.LOGIN_URI,
-            [codes.ok],
+            [HTTPStatus.OK],
         )
 
         self.parser.add_argument(
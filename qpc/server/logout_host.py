@@ -1,9 +1,8 @@
 """LogoutHostCommand is used to remove any existing login token."""
 
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
 from qpc import messages, server
 from qpc.clicommand import CliCommand
 from qpc.request import PUT
@@ -31,7 +30,7 @@ class LogoutHostCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             PUT,
             server.LOGOUT_URI,
-            [codes.ok],
+            [HTTPStatus.OK],
         )
 
     def _handle_response_success(self):
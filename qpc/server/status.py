@@ -1,10 +1,9 @@
 """ServerStatusCommand is used to show the server status."""
 
 import sys
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
 from qpc import messages, server
 from qpc.clicommand import CliCommand
 from qpc.request import GET
@@ -32,7 +31,7 @@ class ServerStatusCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             GET,
             server.STATUS_URI,
-            [codes.ok],
+            [HTTPStatus.OK],
         )
         self.parser.add_argument(
             "--output-file",
@@ -91,6 +91,17 @@ class ConfigureHostTests(unittest.TestCase):
             }
             self.assertIn(expected_message, log.output[-1])
 
+    def test_config_server_keeps_settings(self):
+        """Testing the configure server keeps the other settings."""
+        write_server_config(
+            {"host": "127.0.0.1", "port": 8000, "use_http": True, "retries": 7}
+        )
+        sys.argv = ["/bin/qpc", "server", "config", "--host", "10.0.0.1"]
+        CLI().main()
+        config = read_server_config()
+        self.assertEqual(config["host"], "10.0.0.1")
+        self.assertEqual(config["retries"], 7)
+
     def test_config_server_default_port(self):
         """Testing the configure server default port."""
         sys.argv = ["/bin/qpc", "server", "config", "--host", "127.0.0.1"]
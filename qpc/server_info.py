@@ -0,0 +1,145 @@
+"""Cache of the version and capabilities of each quipucords server.
+
+The version reported in the X-Server-Version header of every response, and
+the capabilities learned while talking to a server, are saved in
+QPC_SERVER_INFO keyed by server location. Entries expire after the
+server_info_ttl seconds set in server.config, so an upgraded server is
+negotiated again.
+"""
+
+import json
+import time
+from functools import lru_cache
+
+from qpc import utils
+from qpc.utils import (
+    CONFIG_SERVER_INFO_TTL,
+    get_server_location,
+    get_server_setting,
+    logger,
+    read_snapshot,
+    write_json_atomically,
+)
+
+VERSION_KEY = "version"
+CAPABILITIES_KEY = "capabilities"
+UPDATED_KEY = "updated"
+
+# False once the server rejected a gzip compressed request body
+GZIP_REQUESTS = "gzip_requests"
+
+# development servers report versions like 0.0.0.<commit>
+DEVELOPMENT_VERSION = "0.0.0"
+
+
+@lru_cache(maxsize=None)
+def is_version_supported(server_version, min_server_version):
+    """Check if a server version is at least min_server_version.
+
+    Results are memoized, as every response carries the same version.
+
+    :param server_version: version reported by the server
+    :param min_server_version: min qpc server version allowed
+    :returns: True if the server version is supported
+    """
+    if DEVELOPMENT_VERSION in server_version:
+        return True
+    from packaging.version import Version
+
+    return Version(server_version) >= Version(min_server_version)
+
+
+def get_server_version():
+    """Return the cached version of the configured server.
+
+    :returns: the version string, or None if it is unknown or expired
+    """
+    entry = _server_entry()
+    if entry is None:
+        return None
+    return entry.get(VERSION_KEY)
+
+
+def record_server_version(server_version):
+    """Remember the version reported by the configured server.
+
+    The file is only rewritten when the version changed or the entry expired.
+    A new version forgets the capabilities learned from the previous one;
+    the capabilities learned before any version was recorded are kept.
+
+    :param server_version: version reported by the server
+    """
+    entry = _server_entry() or {}
+    recorded_version = entry.get(VERSION_KEY)
+    if recorded_version == server_version:
+        return
+    if recorded_version is None:
+        _update_entry({**entry, VERSION_KEY: server_version})
+    else:
+        _update_entry({VERSION_KEY: server_version, CAPABILITIES_KEY: {}})
+
+
+def get_capability(name, default=None):
+    """Return a capability learned from the configured server.
+
+    :param name: the capability name (i.e. GZIP_REQUESTS)
+    :param default: value returned when the capability is unknown
+    :returns: the capability value
+    """
+    entry = _server_entry()
+    if entry is None:
+        return default
+    return entry.get(CAPABILITIES_KEY, {}).get(name, default)
+
+
+def set_capability(name, value):
+    """Remember a capability of the configured server.
+
+    :param name: the capability name (i.e. GZIP_REQUESTS)
+    :param value: JSON serializable capability value
+    """
+    entry = _server_entry() or {}
+    capabilities = dict(entry.get(CAPABILITIES_KEY, {}), **{name: value})
+    _update_entry({**entry, CAPABILITIES_KEY: capabilities})
+
+
+def _load_server_info():
+    with open(utils.QPC_SERVER_INFO, encoding="utf-8") as server_info_file:
+        try:
+            server_info = json.load(server_info_file)
+        except ValueError:
+            return {}
+    if not isinstance(server_info, dict):
+        return {}
+    return server_info
+
+
+def _read_server_info():
+    try:
+        return read_snapshot(utils.QPC_SERVER_INFO, _load_server_info)
+    except OSError:
+        return {}
+
+
+def _server_entry():
+    """Return the unexpired entry of the configured server, if any."""
+    entry = _read_server_info().get(get_server_location())
+    if not isinstance(entry, dict):
+        return None
+    age = time.time() - entry.get(UPDATED_KEY, 0)
+    if not 0 <= age < get_server_setting(CONFIG_SERVER_INFO_TTL):
+        return None
+    return entry
+
+
+def _update_entry(entry):
+    """Save the entry of the configured server, replacing the file atomically."""
+    location = get_server_location()
+    if location is None or not get_server_setting(CONFIG_SERVER_INFO_TTL):
+        return
+    server_info = dict(_read_server_info())
+    server_info[location] = {**entry, UPDATED_KEY: time.time()}
+    try:
+        write_json_atomically(utils.QPC_SERVER_INFO, server_info)
+    except OSError as error:
+        logger.debug("Could not save server info: %s", error)
@@ -0,0 +1,143 @@
+"""Interactive qpc shell running commands in a single process.
+
+Commands typed in the shell run like qpc would run them, but the imported
+command modules and their parsers, the server config, the client token and
+the HTTP session stay loaded between commands, so they answer without paying the process
+startup. Credential, source and scan names are fetched from the server the
+first time they are completed and kept in memory until a command adds,
+edits or clears some of them. History is saved in QPC_SHELL_HISTORY.
+"""
+
+import cmd
+import shlex
+
+from qpc import completion, messages, utils
+from qpc.translation import _
+from qpc.utils import logger
+
+SUBCOMMAND = "shell"
+PROMPT = "qpc> "
+EXIT_COMMANDS = ("exit", "quit")
+HISTORY_LENGTH = 1000
+
+
+def add_parser(subparsers):
+    """Add the shell subcommand parser.
+
+    :param subparsers: subparsers of the qpc parser
+    """
+    subparsers.add_parser(SUBCOMMAND)
+
+
+def main(_args):
+    """Run the interactive shell until the user leaves it.
+
+    :param _args: the parsed qpc shell arguments
+    :returns: 0, the exit code of qpc shell
+    """
+    QPCShell().cmdloop()
+    return 0
+
+
+class QPCShell(cmd.Cmd):
+    """Read qpc commands and run them in the running process."""
+
+    prompt = PROMPT
+    intro = _(messages.SHELL_INTRO)
+
+    def __init__(self, *args, **kwargs):
+        """Create the shell with an empty name cache."""
+        super().__init__(*args, **kwargs)
+        self.names = {}
+        self.exit_code = 0
+        # kept between commands, with the parsers it built
+        self.cli = None
+
+    def preloop(self):
+        """Load the history of previous sessions."""
+        import readline
+
+        readline.set_history_length(HISTORY_LENGTH)
+        try:
+            readline.read_history_file(utils.QPC_SHELL_HISTORY)
+        except OSError:
+            pass
+
+    def postloop(self):
+        """Save the history for the next sessions."""
+        import readline
+
+        try:
+            readline.write_history_file(utils.QPC_SHELL_HISTORY)
+        except OSError as error:
+            logger.debug("Could not save the shell history: %s", error)
+
+    def emptyline(self):
+        """Do nothing, instead of running the last command again."""
+
+    def onecmd(self, line):
+        """Run a command line, returning True to leave the shell."""
+        try:
+            argv = shlex.split(line, comments=True)
+        except ValueError as error:
+            logger.error(error)
+            return False
+        if argv and argv[0] == "qpc":
+            argv = argv[1:]
+        if not argv:
+            return False
+        if argv[0] in EXIT_COMMANDS:
+            return True
+        if argv == ["EOF"]:
+            # Ctrl-D
+            print()
+            return True
+        if argv[0] == "help":
+            argv = [*argv[1:], "--help"]
+        self.run(argv)
+        return False
+
+    def run(self, argv):
+        """Run a qpc command, forgetting the names it may have changed."""
+        if self.cli is None:
+            from qpc.cli import CLI
+
+            self.cli = CLI()
+        self.exit_code = self.cli.run(argv)
+        subcommand = getattr(self.cli.args, "subcommand", None)
+        if getattr(self.cli.args, "action", None) in completion.CHANGING_ACTIONS:
+            self.names.pop(subcommand, None)
+
+    def completenames(self, text, *_args):
+        """Complete the subcommand names."""
+        from qpc.cli import SUBCOMMANDS
+
+        candidates = [*SUBCOMMANDS, "help", *EXIT_COMMANDS]
+        return [name for name in candidates if name.startswith(text)]
+
+    def completedefault(self, text, line, begidx, _endidx):
+        """Complete actions, options and the names they take."""
+        try:
+            words = shlex.split(line[:begidx])
+        except ValueError:
+            return []
+        if words and words[0] == "qpc":
+            words = words[1:]
+        if words and words[0] == "help":
+            words = words[1:]
+        return completion.candidates([*words, text], self.get_names)
+
+    complete_help = completedefault
+
+    def get_names(self, kind):
+        """Return the names of the objects of a kind, fetching them once.
+
+        :param kind: the subcommand managing the objects (i.e. cred)
+        :returns: list of names, empty if they could not be fetched
+        """
+        if kind not in self.names:
+            names = completion.fetch_names(completion.NAME_URIS[kind])
+            if names is None:
+                return []
+            self.names[kind] = names
+        return self.names[kind]
@@ -1,14 +1,13 @@
 """SourceAddCommand is used to add sources for system scans."""
 
 import sys
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
-from qpc import cred, messages, source
+from qpc import cred, messages, resolver, source
 from qpc.clicommand import CliCommand
 from qpc.release import PKG_NAME
-from qpc.request import GET, POST, request
+from qpc.request import POST
 from qpc.source.utils import build_source_payload, validate_port
 from qpc.translation import _
 from qpc.utils import read_in_file
@@ -34,7 +33,7 @@ class SourceAddCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             POST,
             source.SOURCE_URI,
-            [codes.created],
+            [HTTPStatus.CREATED],
         )
         self.parser.add_argument(
             "--name",
@@ -139,37 +138,21 @@ class SourceAddCommand(CliCommand):
             except ValueError:
                 pass
 
+    def _resolve_names(self, fresh=False):
         # check for valid cred values
-        cred_list = ",".join(self.args.cred)
-        response = request(
-            parser=self.parser,
-            method=GET,
-            path=cred.CREDENTIAL_URI,
-            params={"name": cred_list},
-            payload=None,
-        )
-        if response.status_code == codes.ok:
-            json_data = response.json()
-            count = json_data.get("count", 0)
-            results = json_data.get("results", [])
-            if count == len(self.args.cred):
-                self.args.credentials = []
-                results_by_name_dict = {cred["name"]: cred for cred in results}
-                for cred_name in self.args.cred:
-                    self.args.credentials.append(results_by_name_dict[cred_name]["id"])
-            else:
-                for cred_entry in results:
-                    cred_name = cred_entry["name"]
-                    self.args.cred.remove(cred_name)
-                not_found_str = ",".join(self.args.cred)
-                logger.error(
-                    _(messages.SOURCE_ADD_CREDS_NOT_FOUND),
-                    {"reference": not_found_str, "source": self.args.name},
-                )
-                sys.exit(1)
-        else:
+        found = resolver.resolve(cred.SUBCOMMAND, self.args.cred, self.parser, fresh)
+        if found is None:
             logger.error(_(messages.SOURCE_ADD_CRED_PROCESS_ERR), self.args.name)
             sys.exit(1)
+        not_found = [name for name in self.args.cred if name not in found]
+        if not_found:
+            logger.error(
+                _(messages.SOURCE_ADD_CREDS_NOT_FOUND),
+                {"reference": ",".join(not_found), "source": self.args.name},
+            )
+            sys.exit(1)
+        self.args.credentials = [found[name]["id"] for name in self.args.cred]
+        return self.args.credentials
 
     def _build_data(self):
         """Construct the dictionary cred given our arguments.
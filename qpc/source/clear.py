@@ -1,20 +1,18 @@
 """SourceClearCommand is used to clear a or all sources."""
 
 import sys
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
 from qpc import messages, source
-from qpc.clicommand import CliCommand
-from qpc.request import DELETE, GET, request
+from qpc.clicommand import ClearCliCommand
+from qpc.request import GET
 from qpc.translation import _
-from qpc.utils import handle_error_response
 
 logger = getLogger(__name__)
 
 
-class SourceClearCommand(CliCommand):
+class SourceClearCommand(ClearCliCommand):
     """Defines the clear command.
 
     This command is for clearing a specific source or all source
@@ -23,17 +21,19 @@ class SourceClearCommand(CliCommand):
 
     SUBCOMMAND = source.SUBCOMMAND
     ACTION = source.CLEAR
+    REMOVED = messages.SOURCE_REMOVED
+    FAILED_TO_REMOVE = messages.SOURCE_FAILED_TO_REMOVE
 
     def __init__(self, subparsers):
         """Create command."""
-        CliCommand.__init__(
+        ClearCliCommand.__init__(
             self,
             self.SUBCOMMAND,
             self.ACTION,
             subparsers.add_parser(self.ACTION),
             GET,
             source.SOURCE_URI,
-            [codes.ok],
+            [HTTPStatus.OK],
         )
         group = self.parser.add_mutually_exclusive_group(required=True)
         group.add_argument(
@@ -50,21 +50,6 @@ class SourceClearCommand(CliCommand):
         if self.args.name:
             self.req_params = {"name": self.args.name}
 
-    def _delete_entry(self, source_entry, print_out=True):
-        deleted = False
-        delete_uri = source.SOURCE_URI + str(source_entry["id"]) + "/"
-        response = request(DELETE, delete_uri, parser=self.parser)
-        name = source_entry["name"]
-        if response.status_code == codes.no_content:
-            deleted = True
-            if print_out:
-                logger.info(_(messages.SOURCE_REMOVED), name)
-        else:
-            handle_error_response(response)
-            if print_out:
-                logger.error(_(messages.SOURCE_FAILED_TO_REMOVE), name)
-        return deleted
-
     def _handle_response_success(self):
         json_data = self.response.json()
         count = json_data.get("count", 0)
@@ -82,11 +67,8 @@ class SourceClearCommand(CliCommand):
             sys.exit(1)
         else:
             # remove all entries
-            remove_error = []
             next_link = json_data.get("next")
-            for entry in results:
-                if self._delete_entry(entry, print_out=False) is False:
-                    remove_error.append(entry["name"])
+            remove_error = [entry["name"] for entry in self._delete_entries(results)]
             if remove_error:
                 cred_err = ",".join(remove_error)
                 logger.error(_(messages.SOURCE_PARTIAL_REMOVE), cred_err)
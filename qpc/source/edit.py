@@ -1,14 +1,13 @@
 """SourceEditCommand is used to edit existing sources for system scans."""
 
 import sys
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
-from qpc import cred, messages, source
+from qpc import cred, messages, resolver, source
 from qpc.clicommand import CliCommand
 from qpc.release import PKG_NAME
-from qpc.request import GET, PATCH, request
+from qpc.request import PATCH
 from qpc.source.utils import build_source_payload, validate_port
 from qpc.translation import _
 from qpc.utils import read_in_file
@@ -34,7 +33,7 @@ class SourceEditCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             PATCH,
             source.SOURCE_URI,
-            [codes.ok],
+            [HTTPStatus.OK],
         )
         self.parser.add_argument(
             "--name",
@@ -143,62 +142,36 @@ class SourceEditCommand(CliCommand):
             except ValueError:
                 pass
 
+    def _resolve_names(self, fresh=False):
         # check for existence of source
-        response = request(
-            parser=self.parser,
-            method=GET,
-            path=source.SOURCE_URI,
-            params={"name": self.args.name},
-            payload=None,
+        found = resolver.resolve(
+            source.SUBCOMMAND, [self.args.name], self.parser, fresh
         )
-        if response.status_code == codes.ok:
-            json_data = response.json()
-            count = json_data.get("count", 0)
-            results = json_data.get("results", [])
-            if count == 1:
-                source_entry = results[0]
-                self.req_path = self.req_path + str(source_entry["id"]) + "/"
-            else:
-                logger.error(_(messages.SOURCE_DOES_NOT_EXIST), self.args.name)
-                sys.exit(1)
-        else:
+        if not found:
             logger.error(_(messages.SOURCE_DOES_NOT_EXIST), self.args.name)
             sys.exit(1)
+        source_id = found[self.args.name]["id"]
+        self.req_path = source.SOURCE_URI + str(source_id) + "/"
 
         # check for valid cred values
+        credential_ids = None
         if len(self.args.cred) > 0:
-            cred_list = ",".join(self.args.cred)
-            response = request(
-                parser=self.parser,
-                method=GET,
-                path=cred.CREDENTIAL_URI,
-                params={"name": cred_list},
-                payload=None,
+            found = resolver.resolve(
+                cred.SUBCOMMAND, self.args.cred, self.parser, fresh
             )
-            if response.status_code == codes.ok:
-                json_data = response.json()
-                count = json_data.get("count", 0)
-                results = json_data.get("results", [])
-                if count == len(self.args.cred):
-                    self.args.credentials = []
-                    for cred_entry in results:
-                        self.args.credentials.append(cred_entry["id"])
-                else:
-                    for cred_entry in results:
-                        cred_name = cred_entry["name"]
-                        self.args.cred.remove(cred_name)
-                    not_found_str = ",".join(self.args.cred)
-                    logger.error(
-                        _(messages.SOURCE_EDIT_CREDS_NOT_FOUND),
-                        {
-                            "reference": not_found_str,
-                            "source": self.args.name,
-                        },
-                    )
-                    sys.exit(1)
-            else:
+            if found is None:
                 logger.error(_(messages.SOURCE_EDIT_CRED_PROCESS_ERR), self.args.name)
                 sys.exit(1)
+            not_found = [name for name in self.args.cred if name not in found]
+            if not_found:
+                logger.error(
+                    _(messages.SOURCE_EDIT_CREDS_NOT_FOUND),
+                    {"reference": ",".join(not_found), "source": self.args.name},
+                )
+                sys.exit(1)
+            credential_ids = [found[name]["id"] for name in self.args.cred]
+            self.args.credentials = credential_ids
+        return source_id, credential_ids
 
     def _build_data(self):
         """Construct the dictionary cred given our arguments.
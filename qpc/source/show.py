@@ -1,15 +1,14 @@
 """SourceShowCommand is used to show sources for system scans."""
 
 import sys
+from http import HTTPStatus
 from logging import getLogger
 
-from requests import codes
-
-from qpc import messages, source
+from qpc import messages, resolver, source
 from qpc.clicommand import CliCommand
+from qpc.output import add_format_argument, get_format, write_record
 from qpc.request import GET
 from qpc.translation import _
-from qpc.utils import pretty_print
 
 logger = getLogger(__name__)
 
@@ -33,7 +32,7 @@ class SourceShowCommand(CliCommand):
             subparsers.add_parser(self.ACTION),
             GET,
             source.SOURCE_URI,
-            [codes.ok],
+            [HTTPStatus.OK],
         )
         self.parser.add_argument(
             "--name",
@@ -42,6 +41,7 @@ class SourceShowCommand(CliCommand):
             help=_(messages.SOURCE_NAME_HELP),
             required=True,
         )
+        add_format_argument(self.parser)
 
     def _build_req_params(self):
         self.req_params = {"name": self.args.name}
@@ -52,8 +52,8 @@ class SourceShowCommand(CliCommand):
         results = json_data.get("results", [])
         if count == 1:
             cred_entry = results[0]
-            data = pretty_print(cred_entry)
-            print(data)
+            resolver.remember(self.SUBCOMMAND, [cred_entry])
+            write_record(cred_entry, get_format(self.args))
         else:
             logger.error(_(messages.SOURCE_DOES_NOT_EXIST), self.args.name)
             sys.exit(1)
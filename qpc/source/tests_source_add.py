@@ -140,6 +140,11 @@ class SourceAddCliTests(unittest.TestCase):
         get_cred_data = {"count": 1, "results": cred_results}
         with requests_mock.Mocker() as mocker:
             mocker.get(get_cred_url, status_code=200, json=get_cred_data)
+            mocker.get(
+                get_server_location() + CREDENTIAL_URI + "?name=cred2",
+                status_code=200,
+                json={"count": 0, "results": []},
+            )
 
             args = Namespace(
                 name="source1",
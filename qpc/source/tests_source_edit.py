@@ -353,6 +353,11 @@ class SourceEditCliTests(unittest.TestCase):
         with requests_mock.Mocker() as mocker:
             mocker.get(url_get_source, status_code=200, json=source_data)
             mocker.get(url_get_cred, status_code=200, json=cred_data)
+            mocker.get(
+                get_server_location() + CREDENTIAL_URI + "?name=cred2",
+                status_code=200,
+                json={"count": 0, "results": []},
+            )
 
             args = Namespace(
                 name="source1",
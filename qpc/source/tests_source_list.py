@@ -144,3 +144,65 @@ class SourceListCliTests(unittest.TestCase):
                     source_out.getvalue().replace("\n", "").replace(" ", "").strip(),
                     expected,
                 )
+
+    def test_list_source_filters_on_server(self):
+        """Testing the list source command filters are sent to the server."""
+        source_out = StringIO()
+        url = get_server_location() + SOURCE_URI
+        results = [
+            {"id": 2, "name": "net_a", "source_type": "network", "hosts": ["1.2.3.4"]},
+            {"id": 1, "name": "net_b", "source_type": "network", "hosts": ["5.6.7.8"]},
+        ]
+        data = {"count": 2, "next": None, "results": results}
+        with requests_mock.Mocker() as mocker:
+            mocker.get(url, status_code=200, json=data)
+
+            args = Namespace(
+                type="network",
+                name_contains="Net",
+                ordering="name",
+                fields=["name,id"],
+                output_format="csv",
+            )
+            with redirect_stdout(source_out):
+                self.command.main(args)
+            self.assertEqual(
+                mocker.last_request.qs,
+                {
+                    "source_type": ["network"],
+                    "search_by_name": ["net"],
+                    "ordering": ["name"],
+                },
+            )
+            self.assertEqual(source_out.getvalue(), "name,id\nnet_a,2\nnet_b,1\n")
+
+    def test_list_source_filters_locally(self):
+        """Testing the list source command filters ignored by the server."""
+        source_out = StringIO()
+        url = get_server_location() + SOURCE_URI
+        results = [
+            {"id": 1, "name": "net_a", "source_type": "network"},
+            {"id": 2, "name": "vc", "source_type": "vcenter"},
+            {"id": 3, "name": "other_net", "source_type": "network"},
+            {"id": 4, "name": "net_b", "source_type": "network"},
+        ]
+        data = {"count": 4, "next": None, "results": results}
+        with requests_mock.Mocker() as mocker:
+            mocker.get(url, status_code=200, json=data)
+
+            args = Namespace(
+                name_contains="NET_",
+                ordering="-name",
+                all_pages=True,
+                fields=["id", "name"],
+                output_format="ndjson",
+            )
+            with self.assertLogs(level="WARNING") as log:
+                with redirect_stdout(source_out):
+                    self.command.main(args)
+            self.assertEqual(
+                source_out.getvalue(),
+                '{"id": 1, "name": "net_a"}\n{"id": 4, "name": "net_b"}\n',
+            )
+            self.assertIn("did not filter the results by search_by_name", log.output[0])
+            self.assertEqual(len(log.output), 1)
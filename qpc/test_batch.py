@@ -0,0 +1,155 @@
+"""Test running many qpc commands in one process."""
+
+import logging
+import sys
+
+import pytest
+
+from qpc import batch
+from qpc import request as request_module
+from qpc.cli import CLI
+from qpc.request import get_session
+from qpc.utils import write_server_config
+
+CRED_URL = "http://127.0.0.1:8000/api/v1/credentials/"
+
+
+def run_batch(tmp_path, monkeypatch, content, *options):
+    """Run qpc batch on a file with content, returning the exit code."""
+    batch_file = tmp_path / "commands.txt"
+    batch_file.write_text(content)
+    monkeypatch.setattr(
+        sys, "argv", ["/bin/qpc", "batch", "--file", str(batch_file), *options]
+    )
+    with pytest.raises(SystemExit) as exit_info:
+        CLI().main()
+    return exit_info.value.code
+
+
+def test_read_commands():
+    """Test lines are split like a shell would, grouped by blank lines."""
+    lines = [
+        "# credentials first\n",
+        "qpc cred add --name 'my cred' --type network\n",
+        "cred show --name cred2  # with a comment\n",
+        "\n",
+        "\n",
+        "source list\n",
+    ]
+    assert batch.read_commands(lines) == [
+        [
+            (2, ["cred", "add", "--name", "my cred", "--type", "network"]),
+            (3, ["cred", "show", "--name", "cred2"]),
+        ],
+        [(6, ["source", "list"])],
+    ]
+
+
+def test_read_commands_syntax_error():
+    """Test a line with unbalanced quotes fails the whole batch."""
+    with pytest.raises(ValueError, match="Line 2 of the batch"):
+        batch.read_commands(["cred list\n", "cred show --name 'cred\n"])
+
+
+def test_batch(server_config, requests_mock, tmp_path, monkeypatch, caplog):
+    """Test every line runs in the same process, reporting failed lines."""
+    requests_mock.get(CRED_URL, json={"count": 0, "results": []})
+    caplog.set_level(logging.INFO)
+    code = run_batch(
+        tmp_path, monkeypatch, "cred list\ncred show\nqpc cred list --type network\n"
+    )
+    assert code == 1
+    assert requests_mock.call_count == 2
+    assert "Line 1 succeeded: cred list" in caplog.messages
+    assert "Line 2 failed with exit code 2: cred show" in caplog.messages
+    assert "1 of 3 batch commands failed." in caplog.messages
+
+
+def test_batch_shares_session(server_config, requests_mock, tmp_path, monkeypatch):
+    """Test the commands of a batch reuse the same HTTP session."""
+    requests_mock.get(CRED_URL, json={"count": 0, "results": []})
+    session = get_session()
+    assert run_batch(tmp_path, monkeypatch, "cred list\n\ncred list\n") == 0
+    assert get_session() is session
+
+
+def test_batch_retry_budget(requests_mock, tmp_path, monkeypatch, mock_retry_sleep):
+    """Test every command of a batch gets its own retry budget."""
+    write_server_config(
+        {
+            "host": "127.0.0.1",
+            "port": 8000,
+            "use_http": True,
+            "require_token": False,
+            "retry_budget": 10,
+        }
+    )
+    unavailable = {"status_code": 503, "headers": {"Retry-After": "6"}}
+    listed = {"json": {"count": 0, "results": []}}
+    requests_mock.get(CRED_URL, [unavailable, listed, unavailable, listed])
+    assert run_batch(tmp_path, monkeypatch, "cred list\n\ncred list\n") == 0
+    assert requests_mock.call_count == 4
+    assert mock_retry_sleep.call_count == 2
+
+
+def test_batch_deadline(server_config, requests_mock, tmp_path, monkeypatch):
+    """Test every command of a batch gets its own --deadline."""
+    clock = [1000.0]
+    monkeypatch.setattr(request_module.time, "monotonic", lambda: clock[0])
+
+    def slow_list(request, context):
+        clock[0] += 6
+        return {"count": 0, "results": []}
+
+    requests_mock.get(CRED_URL, json=slow_list)
+    batch_file = tmp_path / "commands.txt"
+    batch_file.write_text("cred list\n\ncred list\n")
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["/bin/qpc", "--deadline", "5", "batch", "--file", str(batch_file)],
+    )
+    with pytest.raises(SystemExit) as exit_info:
+        CLI().main()
+    assert exit_info.value.code == 0
+    assert requests_mock.call_count == 2
+
+
+def test_batch_parallel(server_config, requests_mock, tmp_path, monkeypatch, caplog):
+    """Test commands of a group run concurrently, reported in batch order."""
+    requests_mock.get(CRED_URL, json={"count": 0, "results": []})
+    caplog.set_level(logging.INFO)
+    lines = "".join(f"cred list --type network # {index}\n" for index in range(8))
+    assert run_batch(tmp_path, monkeypatch, lines, "--parallel", "4") == 0
+    assert requests_mock.call_count == 8
+    assert [message for message in caplog.messages if message.startswith("Line ")] == [
+        f"Line {line} succeeded: cred list --type network" for line in range(1, 9)
+    ]
+
+
+def test_batch_unexpected_error(
+    server_config, requests_mock, tmp_path, monkeypatch, caplog
+):
+    """Test a line failing with an unexpected error does not stop the others."""
+    requests_mock.get(CRED_URL, json={"count": 0, "results": []})
+    run_command = CLI.run_command
+
+    def fail_sources(cli):
+        if cli.args.subcommand == "source":
+            raise RuntimeError("bug")
+        run_command(cli)
+
+    monkeypatch.setattr(CLI, "run_command", fail_sources)
+    lines = "source list\ncred list\n"
+    assert run_batch(tmp_path, monkeypatch, lines, "--parallel", "2") == 1
+    assert requests_mock.call_count == 1
+    assert "Line 1 stopped with an unexpected error: RuntimeError('bug')" in (
+        caplog.messages
+    )
+    assert "1 of 2 batch commands failed." in caplog.messages
+
+
+def test_batch_nested(server_config, tmp_path, monkeypatch, caplog):
+    """Test a batch line cannot start another batch."""
+    assert run_batch(tmp_path, monkeypatch, "batch --parallel 2\n") == 1
+    assert "qpc batch cannot be run from a batch or a shell." in caplog.messages
@@ -0,0 +1,106 @@
+"""Test the circuit breaker for unreachable servers."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+from requests.exceptions import ConnectionError
+
+from qpc import circuit_breaker
+from qpc.request import request
+from qpc.utils import write_server_config
+
+URL = "http://127.0.0.1:8000/api/v1/sources/"
+STATUS_URL = "http://127.0.0.1:8000/api/v1/status/"
+
+
+@pytest.fixture
+def breaker_config():
+    """Open the circuit after two failures, without retries."""
+    return write_server_config(
+        {
+            "host": "127.0.0.1",
+            "port": 8000,
+            "use_http": True,
+            "retries": 0,
+            "circuit_breaker_threshold": 2,
+        }
+    )
+
+
+def _fail(count):
+    for _ in range(count):
+        with pytest.raises(SystemExit):
+            request("GET", "/api/v1/sources/")
+
+
+def test_circuit_opens(breaker_config, requests_mock, caplog):
+    """Test requests fail fast after consecutive connection failures."""
+    requests_mock.get(URL, exc=ConnectionError)
+    _fail(3)
+    assert requests_mock.call_count == 2
+    assert "failed 2 consecutive connection attempts" in caplog.messages[-1]
+
+
+def test_success_resets_failures(breaker_config, requests_mock):
+    """Test a response in between failures keeps the circuit closed."""
+    requests_mock.get(URL, [{"exc": ConnectionError}, {"json": {}}])
+    _fail(1)
+    assert request("GET", "/api/v1/sources/").ok
+    requests_mock.get(URL, exc=ConnectionError)
+    _fail(2)
+    assert requests_mock.call_count == 4
+
+
+def test_failures_outside_window(breaker_config, requests_mock):
+    """Test failures older than the window are not counted."""
+    requests_mock.get(URL, exc=ConnectionError)
+    _fail(1)
+    later = time.time() + 61
+    with patch("qpc.circuit_breaker.time.time", return_value=later):
+        _fail(2)
+    assert requests_mock.call_count == 3
+
+
+def test_half_open_probe_closes(breaker_config, requests_mock):
+    """Test a successful probe after the cool-down closes the circuit."""
+    requests_mock.get(URL, exc=ConnectionError)
+    _fail(2)
+    requests_mock.get(URL, json={})
+    requests_mock.get(STATUS_URL, json={})
+    later = time.time() + 31
+    with patch("qpc.circuit_breaker.time.time", return_value=later):
+        assert request("GET", "/api/v1/sources/").ok
+    assert [sent.url for sent in requests_mock.request_history[2:]] == [
+        STATUS_URL,
+        URL,
+    ]
+    assert circuit_breaker._server_state() == {}
+
+
+def test_half_open_probe_fails(breaker_config, requests_mock):
+    """Test a failed probe opens the circuit for another cool-down."""
+    requests_mock.get(URL, exc=ConnectionError)
+    requests_mock.get(STATUS_URL, exc=ConnectionError)
+    _fail(2)
+    later = time.time() + 31
+    with patch("qpc.circuit_breaker.time.time", return_value=later):
+        _fail(2)
+    assert [sent.url for sent in requests_mock.request_history[2:]] == [STATUS_URL]
+
+
+def test_circuit_breaker_disabled(requests_mock):
+    """Test circuit_breaker_threshold 0 disables the circuit breaker."""
+    write_server_config(
+        {
+            "host": "127.0.0.1",
+            "port": 8000,
+            "use_http": True,
+            "retries": 0,
+            "circuit_breaker_threshold": 0,
+        }
+    )
+    requests_mock.get(URL, exc=ConnectionError)
+    _fail(10)
+    assert requests_mock.call_count == 10
+    assert circuit_breaker._server_state() == {}
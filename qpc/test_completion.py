@@ -0,0 +1,144 @@
+"""Test the completion of qpc command lines."""
+
+import json
+import time
+from unittest import mock
+
+import pytest
+
+from qpc import completion, utils
+from qpc.cli import CLI
+
+CRED_URL = "http://127.0.0.1:8000/api/v1/credentials/"
+LOCATION = "http://127.0.0.1:8000"
+
+
+def names(kind):
+    """Return made up names of each kind."""
+    return [f"{kind}1", f"{kind}2", "other"]
+
+
+def write_index(entries):
+    """Write the name index of the configured server."""
+    with open(utils.QPC_NAME_INDEX, "w", encoding="utf-8") as index_file:
+        json.dump({LOCATION: entries}, index_file)
+
+
+@pytest.mark.parametrize(
+    "words,expected",
+    [
+        (
+            [""],
+            [
+                "server",
+                "cred",
+                "source",
+                "scan",
+                "report",
+                "insights",
+                "batch",
+                "shell",
+            ],
+        ),
+        (["s"], ["server", "source", "scan", "shell"]),
+        (["--j"], ["--jobs"]),
+        (["--jobs", "4", "-v", "cr"], ["cred"]),
+        (["scan", "c"], ["cancel", "clear"]),
+        (["cred", "show", "--n"], ["--name"]),
+        (["cred", "show", "--name", ""], ["cred1", "cred2", "other"]),
+        (["source", "edit", "--name", "x", "--cred", "c"], ["cred1", "cred2"]),
+        (["scan", "add", "--sources", "source1", "s"], ["source1", "source2"]),
+        (["scan", "start", "--name", "=", "s"], ["scan1", "scan2"]),
+        (["cred", "add", "--name", ""], []),
+        (["report", "details", "--report", ""], []),
+        (["bogus", "show", ""], []),
+    ],
+)
+def test_candidates(words, expected):
+    """Test subcommands, actions, options and names are completed."""
+    assert completion.candidates(words, names) == expected
+
+
+def test_main_script(capsys):
+    """Test completion scripts are printed for bash and zsh."""
+    assert completion.main(["--script", "bash"]) == 0
+    assert "complete -o default -F _qpc_complete qpc" in capsys.readouterr().out
+    assert completion.main(["--script", "zsh"]) == 0
+    assert "#compdef qpc" in capsys.readouterr().out
+    assert completion.main(["--script", "fish"]) == 2
+
+
+def test_main_candidates(server_config, capsys):
+    """Test candidates are printed one per line."""
+    write_index({"cred": {"names": ["cred1", "cred2"], "updated": time.time()}})
+    assert completion.main(["cred", "show", "--name", "c"]) == 0
+    assert capsys.readouterr().out == "cred1\ncred2\n"
+
+
+@mock.patch("qpc.completion._start_refresh")
+def test_get_names_fresh(mock_refresh, server_config):
+    """Test fresh names are returned without refreshing them."""
+    write_index({"cred": {"names": ["cred1"], "updated": time.time()}})
+    assert completion.get_names("cred") == ["cred1"]
+    mock_refresh.assert_not_called()
+
+
+@mock.patch("qpc.completion._start_refresh")
+def test_get_names_stale(mock_refresh, server_config):
+    """Test stale names are returned while they are refreshed once."""
+    write_index({"cred": {"names": ["cred1"], "updated": time.time() - 301}})
+    assert completion.get_names("cred") == ["cred1"]
+    assert completion.get_names("cred") == ["cred1"]
+    mock_refresh.assert_called_once_with("cred")
+    assert completion.get_names("scan") == []
+    mock_refresh.assert_called_with("scan")
+
+
+@mock.patch("qpc.completion._start_refresh")
+def test_get_names_no_server(mock_refresh):
+    """Test nothing is completed before the server is configured."""
+    assert completion.get_names("cred") == []
+    mock_refresh.assert_not_called()
+
+
+def test_refresh_names(server_config, requests_mock):
+    """Test refreshing fetches every page of names into the index."""
+    requests_mock.get(
+        CRED_URL,
+        [
+            {"json": {"results": [{"name": "cred1"}], "next": f"{CRED_URL}?page=2"}},
+            {"json": {"results": [{"name": "cred2"}], "next": None}},
+        ],
+    )
+    completion.refresh_names("cred")
+    assert requests_mock.last_request.qs == {"page": ["2"]}
+    with mock.patch("qpc.completion._start_refresh") as mock_refresh:
+        assert completion.get_names("cred") == ["cred1", "cred2"]
+    mock_refresh.assert_not_called()
+
+
+def test_refresh_names_failed(server_config, requests_mock):
+    """Test indexed names are kept when they cannot be fetched."""
+    write_index({"cred": {"names": ["cred1"], "updated": 0}})
+    requests_mock.get(CRED_URL, status_code=500)
+    completion.refresh_names("cred")
+    with mock.patch("qpc.completion._start_refresh"):
+        assert completion.get_names("cred") == ["cred1"]
+
+
+def test_changing_command_forgets_names(server_config, requests_mock):
+    """Test a command changing credentials drops their indexed names."""
+    write_index(
+        {
+            "cred": {"names": ["cred1"], "updated": time.time()},
+            "scan": {"names": ["scan1"], "updated": time.time()},
+        }
+    )
+    requests_mock.get(
+        f"{CRED_URL}?name=cred1",
+        json={"count": 1, "results": [{"id": 1, "name": "cred1"}]},
+    )
+    requests_mock.delete(f"{CRED_URL}1/", status_code=204)
+    assert CLI().run(["cred", "clear", "--name", "cred1"]) == 0
+    with open(utils.QPC_NAME_INDEX, encoding="utf-8") as index_file:
+        assert list(json.load(index_file)[LOCATION]) == ["scan"]
@@ -0,0 +1,177 @@
+"""Test the on-disk HTTP validation cache."""
+
+import os
+
+import pytest
+
+from qpc import http_cache, utils
+from qpc.request import GET, request
+from qpc.utils import write_server_config
+
+URL = "http://127.0.0.1:8000/api/v1/sources/"
+
+
+def fail_writing(*args):
+    """Fail like a full disk."""
+    raise OSError("disk full")
+
+
+@pytest.fixture
+def cache_config():
+    """Create a server config with the HTTP cache enabled."""
+    return write_server_config(
+        {
+            "host": "127.0.0.1",
+            "port": 8000,
+            "use_http": True,
+            "require_token": False,
+            "http_cache": True,
+            "http_cache_size": 1,
+        }
+    )
+
+
+def test_cache_disabled(server_config, requests_mock):
+    """Test nothing is cached unless http_cache is set."""
+    requests_mock.get(URL, json={"count": 0}, headers={"ETag": '"v1"'})
+    request(GET, "/api/v1/sources/")
+    request(GET, "/api/v1/sources/")
+    assert "If-None-Match" not in requests_mock.last_request.headers
+    assert not os.path.exists(utils.QPC_HTTP_CACHE)
+
+
+def test_cache_revalidates(cache_config, requests_mock):
+    """Test a 304 response serves the cached body."""
+    requests_mock.get(
+        URL,
+        [
+            {
+                "json": {"count": 1},
+                "headers": {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024"},
+            },
+            {"status_code": 304, "headers": {"X-Server-Version": "1.0.0"}},
+        ],
+    )
+    assert request(GET, "/api/v1/sources/").json() == {"count": 1}
+    response = request(GET, "/api/v1/sources/")
+    assert requests_mock.last_request.headers["If-None-Match"] == '"v1"'
+    assert requests_mock.last_request.headers["If-Modified-Since"] == (
+        "Mon, 01 Jan 2024"
+    )
+    assert response.status_code == 200
+    assert response.json() == {"count": 1}
+    assert response.headers["X-Server-Version"] == "1.0.0"
+
+
+def test_cache_requires_validators(cache_config, requests_mock):
+    """Test responses without ETag or Last-Modified are not cached."""
+    requests_mock.get(URL, json={"count": 0})
+    request(GET, "/api/v1/sources/")
+    request(GET, "/api/v1/sources/")
+    assert "If-None-Match" not in requests_mock.last_request.headers
+    assert not os.path.exists(utils.QPC_HTTP_CACHE)
+
+
+def test_cache_key_variants():
+    """Test params are order independent and Accept selects a variant."""
+    assert http_cache.cache_key(URL, {"a": 1, "b": 2}) == http_cache.cache_key(
+        URL, {"b": 2, "a": 1}
+    )
+    assert http_cache.cache_key(URL, {"a": 1}) != http_cache.cache_key(URL, {"a": 2})
+    assert http_cache.cache_key(
+        URL, headers={"Accept": "text/csv"}
+    ) != http_cache.cache_key(URL, headers={"Accept": "application/json"})
+
+
+def test_cache_streamed(cache_config, requests_mock):
+    """Test streamed bodies are spooled to the cache and served from it."""
+    content = os.urandom(300 * 1024)
+    requests_mock.get(
+        URL,
+        [
+            {"content": content, "headers": {"ETag": '"v1"'}},
+            {"status_code": 304},
+        ],
+    )
+    for _ in range(2):
+        with request(GET, "/api/v1/sources/", stream=True) as response:
+            assert b"".join(response.iter_content(chunk_size=1024)) == content
+
+
+def test_cache_streamed_while_read(cache_config, requests_mock):
+    """Test a streamed body is readable before it is all cached."""
+    content = os.urandom(300 * 1024)
+    requests_mock.get(URL, content=content, headers={"ETag": '"v1"'})
+    key = http_cache.cache_key(URL)
+    with request(GET, "/api/v1/sources/", stream=True) as response:
+        chunks = response.iter_content(chunk_size=1024)
+        assert next(chunks) == content[:1024]
+        assert http_cache.lookup(key) is None
+        assert b"".join(chunks) == content[1024:]
+    assert http_cache.lookup(key) is not None
+
+
+def test_cache_streamed_not_read(cache_config, requests_mock):
+    """Test a streamed body closed before its end is not cached."""
+    requests_mock.get(URL, content=b"x" * 4096, headers={"ETag": '"v1"'})
+    with request(GET, "/api/v1/sources/", stream=True) as response:
+        next(response.iter_content(chunk_size=1024))
+    assert not os.listdir(utils.QPC_HTTP_CACHE)
+
+
+def test_cache_streamed_too_big(cache_config, requests_mock):
+    """Test a streamed body larger than the cache is still returned."""
+    content = os.urandom(2 * 1024 * 1024)
+    requests_mock.get(URL, content=content, headers={"ETag": '"v1"'})
+    with request(GET, "/api/v1/sources/", stream=True) as response:
+        assert b"".join(response.iter_content(chunk_size=1024)) == content
+    assert not os.listdir(utils.QPC_HTTP_CACHE)
+
+
+def test_cache_evicts_least_recently_used(cache_config, requests_mock):
+    """Test old entries are evicted once the cache grows past its size."""
+    content = b"x" * 400 * 1024
+    for name in ("a", "b", "c"):
+        requests_mock.get(f"{URL}{name}/", content=content, headers={"ETag": name})
+    request(GET, "/api/v1/sources/a/")
+    request(GET, "/api/v1/sources/b/")
+    key_a = http_cache.cache_key(f"{URL}a/")
+    key_b = http_cache.cache_key(f"{URL}b/")
+    for last_used, key in enumerate((key_a, key_b)):
+        os.utime(http_cache._entry_paths(key)[0], ns=(last_used, last_used))
+    # using "a" again makes "b" the least recently used entry
+    requests_mock.get(f"{URL}a/", status_code=304)
+    request(GET, "/api/v1/sources/a/")
+    request(GET, "/api/v1/sources/c/")
+    assert http_cache.lookup(key_a) is not None
+    assert http_cache.lookup(key_b) is None
+    assert http_cache.lookup(http_cache.cache_key(f"{URL}c/")) is not None
+
+
+@pytest.mark.parametrize("stream", [False, True])
+@pytest.mark.parametrize("failing", ["replace", "write_json_atomically"])
+def test_cache_write_error(cache_config, requests_mock, monkeypatch, stream, failing):
+    """Test a body that cannot be saved is returned, leaving no entry behind."""
+    requests_mock.get(URL, content=b"body", headers={"ETag": '"v1"'})
+    if failing == "replace":
+        target = http_cache.os
+    else:
+        target = http_cache
+
+    monkeypatch.setattr(target, failing, fail_writing)
+    with request(GET, "/api/v1/sources/", stream=stream) as response:
+        assert b"".join(response.iter_content(chunk_size=1024)) == b"body"
+    assert not os.listdir(utils.QPC_HTTP_CACHE)
+
+
+def test_cache_replaced_headers(cache_config, requests_mock, monkeypatch):
+    """Test the headers of a replaced body never validate the new one."""
+    requests_mock.get(URL, content=b"old", headers={"ETag": '"v1"'})
+    request(GET, "/api/v1/sources/")
+    key = http_cache.cache_key(URL)
+    assert http_cache.lookup(key) is not None
+    requests_mock.get(URL, content=b"new", headers={"ETag": '"v2"'})
+
+    monkeypatch.setattr(http_cache, "write_json_atomically", fail_writing)
+    request(GET, "/api/v1/sources/")
+    assert http_cache.lookup(key) is None
@@ -0,0 +1,89 @@
+"""Test the writers of list, show and job records."""
+
+import pytest
+
+from qpc import output
+from qpc.utils import pretty_print
+
+RECORDS = [
+    {"id": 1, "name": "cred1", "cred_type": "network", "sudo_password": None},
+    {"id": 2, "name": "cred, 2", "cred_type": "vcenter", "ports": [22, 2222]},
+]
+
+
+@pytest.mark.parametrize(
+    "pages",
+    [
+        [],
+        [[], []],
+        [[{"id": 1}]],
+        [[{"id": 1, "nested": {"a": [1, 2]}}], [], [{"id": 2}]],
+    ],
+)
+def test_json(capsys, pages):
+    """Test pages are printed as a single list, the way pretty_print does."""
+    output.write_records(iter(pages))
+    records = [record for page in pages for record in page]
+    assert capsys.readouterr().out == pretty_print(records) + "\n"
+
+
+def test_ndjson(capsys):
+    """Test a JSON object is printed per line."""
+    output.write_records([RECORDS[:1], [], RECORDS[1:]], output.NDJSON)
+    assert capsys.readouterr().out == (
+        '{"cred_type": "network", "id": 1, "name": "cred1", "sudo_password": null}\n'
+        '{"cred_type": "vcenter", "id": 2, "name": "cred, 2", "ports": [22, 2222]}\n'
+    )
+
+
+def test_csv(capsys):
+    """Test the columns are the fields of the first page."""
+    output.write_records([RECORDS[:1], RECORDS[1:]], output.CSV)
+    assert capsys.readouterr().out == (
+        "cred_type,id,name,sudo_password\n"
+        "network,1,cred1,\n"
+        'vcenter,2,"cred, 2",\n'
+    )
+
+
+def test_table(capsys):
+    """Test the columns are aligned on the values of the first page."""
+    output.write_records([RECORDS], output.TABLE)
+    assert capsys.readouterr().out == (
+        "cred_type  id  name     ports      sudo_password\n"
+        "---------  --  -------  ---------  -------------\n"
+        "network    1   cred1\n"
+        "vcenter    2   cred, 2  [22,2222]\n"
+    )
+
+
+@pytest.mark.parametrize("output_format", output.FORMATS)
+def test_empty(capsys, output_format):
+    """Test an empty list prints nothing but an empty JSON list."""
+    output.write_records([[]], output_format)
+    expected = "[]\n" if output_format == output.JSON else ""
+    assert capsys.readouterr().out == expected
+
+
+def test_write_record(capsys):
+    """Test a single record is printed as an object or a single line."""
+    output.write_record(RECORDS[0])
+    assert capsys.readouterr().out == pretty_print(RECORDS[0]) + "\n"
+    output.write_record(RECORDS[0], output.NDJSON)
+    assert capsys.readouterr().out.count("\n") == 1
+
+
+@pytest.mark.parametrize(
+    "output_format,expected",
+    [
+        (
+            output.JSON,
+            '[\n    {\n        "id": 1,\n        "name": "cred1"\n    }\n]\n',
+        ),
+        (output.TABLE, "name   id\n-----  --\ncred1  1\n"),
+    ],
+)
+def test_fields(capsys, output_format, expected):
+    """Test only the given fields are printed, in the given column order."""
+    output.write_records([RECORDS[:1]], output_format, ["name", "id"])
+    assert capsys.readouterr().out == expected
@@ -0,0 +1,134 @@
+"""Test the page sizes of paginated lists."""
+
+import json
+from datetime import timedelta
+
+import pytest
+from requests import Response
+
+from qpc import pagination, server_info
+from qpc.cli import CLI
+from qpc.pagination import Pager
+from qpc.utils import write_server_config
+
+
+def receive(pager, ids, count, more=True, elapsed=0.0):
+    """Pass a page with results ids to pager, returning the new result ids."""
+    json_data = {
+        "count": count,
+        "next": "http://127.0.0.1:8000/api/v1/sources/?page=2" if more else None,
+        "results": [{"id": id_} for id_ in ids],
+    }
+    response = Response()
+    response._content = json.dumps(json_data).encode("utf-8")
+    response.elapsed = timedelta(seconds=elapsed)
+    return [result["id"] for result in pager.update(response, json_data)]
+
+
+def test_server_page_size(server_config):
+    """Test pages are walked with the page size of the server by default."""
+    pager = Pager()
+    assert pager.params() == {}
+    assert receive(pager, range(10), 25) == list(range(10))
+    assert pager.params() == {"page": 2}
+    assert receive(pager, range(10, 20), 25) == list(range(10, 20))
+    assert pager.remaining_params(25) == [{"page": 3}]
+    assert receive(pager, range(20, 25), 25, more=False) == list(range(20, 25))
+    assert not pager.more
+
+
+def test_page_size(server_config):
+    """Test page_size is sent, from the command line or server.config."""
+    assert Pager(50).params() == {"page_size": 50}
+    write_server_config({"host": "127.0.0.1", "port": 8000, "page_size": 20})
+    pager = Pager()
+    assert pager.params() == {"page_size": 20}
+    receive(pager, range(20), 100)
+    assert pager.remaining_params(100) == [
+        {"page": page, "page_size": 20} for page in range(2, 6)
+    ]
+
+
+def test_server_limits_page_size(server_config):
+    """Test the largest page size of the server is followed and remembered."""
+    pager = Pager(100)
+    assert receive(pager, range(40), 200) == list(range(40))
+    assert pager.params() == {"page": 2, "page_size": 40}
+    assert server_info.get_capability(pagination.MAX_PAGE_SIZE) == 40
+    assert Pager(500).params() == {"page_size": 40}
+
+
+def test_server_ignores_page_size(server_config):
+    """Test page_size is no longer sent when the server ignores it."""
+    pager = Pager(10)
+    assert receive(pager, range(20), 50) == list(range(20))
+    assert pager.params() == {"page": 2}
+
+
+def test_auto_page_size(server_config):
+    """Test auto mode grows pages taking less than page_target_time."""
+    pager = Pager("auto")
+    assert pager.params() == {"page_size": 100}
+    # 0.25 seconds per 100 results: 400 results per second
+    receive(pager, range(100), 10000, elapsed=0.25)
+    # a page of 100 results can only be followed by pages of up to 100
+    assert pager.params() == {"page": 2, "page_size": 100}
+    receive(pager, range(100, 200), 10000, elapsed=0.25)
+    assert pager.params() == {"page": 2, "page_size": 200}
+    receive(pager, range(200, 400), 10000, elapsed=0.5)
+    assert pager.params() == {"page": 2, "page_size": 400}
+    assert server_info.get_capability(pagination.AUTO_PAGE_SIZE) == 400
+    assert Pager("auto").params() == {"page_size": 400}
+
+
+def test_auto_page_size_shrinks(server_config):
+    """Test auto mode picks smaller pages when they take too long."""
+    pager = Pager("auto")
+    receive(pager, range(100), 10000, elapsed=4)
+    assert pager.params() == {"page": 5, "page_size": 25}
+
+
+def test_server_limits_grown_page(server_config):
+    """Test results already received are skipped after hitting the limit."""
+    pager = Pager("auto")
+    receive(pager, range(100), 1000)
+    receive(pager, range(100, 200), 1000)
+    assert pager.params() == {"page": 2, "page_size": 200}
+    # the server sent the second page of 150 results
+    assert receive(pager, range(150, 300), 1000) == list(range(200, 300))
+    assert pager.params() == {"page": 3, "page_size": 150}
+    assert receive(pager, range(300, 450), 1000) == list(range(300, 450))
+
+
+def test_auto_page_size_all_pages(server_config, requests_mock, capsys):
+    """Test pages listed with --all grow while auto mode picks their size."""
+    url = "http://127.0.0.1:8000/api/v1/sources/"
+    sources = [{"id": id_, "name": f"source{id_}"} for id_ in range(250)]
+
+    def page(request, context):
+        size = min(int(request.qs["page_size"][0]), 1000)
+        start = (int(request.qs.get("page", ["1"])[0]) - 1) * size
+        more = start + size < len(sources)
+        return {
+            "count": len(sources),
+            "next": f"{url}?page=next" if more else None,
+            "results": sources[start : start + size],
+        }
+
+    requests_mock.get(url, json=page)
+    argv = ["source", "list", "--all", "--page-size", "auto", "--fields", "id"]
+    assert CLI().run(argv) == 0
+    assert json.loads(capsys.readouterr().out) == [{"id": id_} for id_ in range(250)]
+    assert [request.qs for request in requests_mock.request_history] == [
+        {"page_size": ["100"]},
+        {"page": ["2"], "page_size": ["100"]},
+        {"page": ["2"], "page_size": ["200"]},
+    ]
+
+
+@pytest.mark.parametrize(
+    "number,limit,divisor", [(100, 400, 100), (300, 200, 150), (7, 5, 1)]
+)
+def test_largest_divisor(number, limit, divisor):
+    """Test the size of a page is a divisor of the results received."""
+    assert pagination._largest_divisor(number, limit) == divisor
@@ -8,9 +8,16 @@ from qpc.utils import (
     INSIGHTS_CONFIG,
     INSIGHTS_ENCRYPTION,
     INSIGHTS_LOGIN_CONFIG,
+    QPC_CIRCUIT_BREAKER,
     QPC_CLIENT_TOKEN,
+    QPC_HTTP_CACHE,
+    QPC_ID_INDEX,
     QPC_LOG,
+    QPC_NAME_INDEX,
+    QPC_REPORT_INDEX,
     QPC_SERVER_CONFIG,
+    QPC_SERVER_INFO,
+    QPC_SHELL_HISTORY,
 )
 
 
@@ -22,9 +29,16 @@ from qpc.utils import (
         INSIGHTS_CONFIG,
         INSIGHTS_ENCRYPTION,
         INSIGHTS_LOGIN_CONFIG,
+        QPC_CIRCUIT_BREAKER,
         QPC_CLIENT_TOKEN,
+        QPC_HTTP_CACHE,
+        QPC_ID_INDEX,
         QPC_LOG,
+        QPC_NAME_INDEX,
+        QPC_REPORT_INDEX,
         QPC_SERVER_CONFIG,
+        QPC_SERVER_INFO,
+        QPC_SHELL_HISTORY,
     ),
 )
 def test_path_constant_is_patched(path_constant):
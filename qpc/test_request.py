@@ -1,10 +1,27 @@
 """QPC request tests."""
 
+import gzip
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import pytest
+from requests import Response
+from requests.exceptions import ConnectionError, ReadTimeout
 
-from qpc.request import request
+from qpc.exceptions import QPCRequestError
+from qpc.request import (
+    close_session,
+    get_session,
+    request,
+    request_many,
+    set_deadline,
+    set_max_jobs,
+    set_timeout,
+)
+from qpc.utils import read_server_config, write_server_config
 
 
 def test_request_invalid_method(server_config, caplog):
@@ -30,6 +47,7 @@ def test_request_methods(server_config, method):
             None,
             {},
             "0.9.0",
+            False,
         )
 
 
@@ -57,3 +75,376 @@ def test_log_request_info_valid_json(server_config, caplog):
         request("GET", "/path")
 
     assert "Response: \"{'message': 'Success'}\"" in caplog.messages[-1]
+
+
+def test_log_request_info_debug_disabled(server_config, requests_mock, caplog):
+    """Test response bodies are not touched unless DEBUG is enabled."""
+    caplog.set_level("INFO")
+    requests_mock.get("http://127.0.0.1:8000/path", json={})
+    with patch("qpc.request.summarize_response_body") as summarize:
+        request("GET", "/path")
+    summarize.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "content_type,expected",
+    [
+        (
+            "application/json",
+            'Response: "[{"id": 1}, {"id": 1}, {"id": 1}... <truncated, 2000 bytes',
+        ),
+        ("application/gzip", 'Response: "<encoded blob ignored, 2000 bytes'),
+    ],
+)
+def test_log_request_info_truncated(requests_mock, caplog, content_type, expected):
+    """Test big response bodies are logged truncated with a summary."""
+    caplog.set_level("DEBUG")
+    write_server_config(
+        {"host": "127.0.0.1", "port": 8000, "use_http": True, "log_payload_size": 32}
+    )
+    body = ("[" + ", ".join(['{"id": 1}'] * 200) + "]").encode()[:2000]
+    requests_mock.get(
+        "http://127.0.0.1:8000/path",
+        content=body,
+        headers={"Content-Type": content_type},
+    )
+    request("GET", "/path")
+    assert expected in caplog.messages[-1]
+    assert f"sha256 {hashlib.sha256(body).hexdigest()}" in caplog.messages[-1]
+
+
+def test_request_reuses_session(server_config, requests_mock):
+    """Test consecutive requests share a single pooled session."""
+    requests_mock.get("http://127.0.0.1:8000/path", json={})
+    session = get_session()
+    request("GET", "/path")
+    request("GET", "/path")
+    assert get_session() is session
+    assert requests_mock.call_count == 2
+
+
+def test_session_settings_from_server_config():
+    """Test pool size and keep-alive are read from server.config."""
+    write_server_config(
+        {
+            "host": "127.0.0.1",
+            "port": 8000,
+            "use_http": True,
+            "pool_size": 8,
+            "keep_alive": False,
+        }
+    )
+    session = get_session()
+    adapter = session.get_adapter("http://127.0.0.1:8000/")
+    assert adapter._pool_maxsize == 8
+    assert session.headers["Connection"] == "close"
+
+
+def test_close_session(server_config):
+    """Test closing the session discards it."""
+    session = get_session()
+    with patch.object(session, "close") as mock_close:
+        close_session()
+    mock_close.assert_called_once_with()
+    assert get_session() is not session
+
+
+def test_session_created_once_by_threads(server_config):
+    """Test threads asking for the session at once share a single one."""
+
+    def slow_read_server_config():
+        # leave the other threads time to ask for the session meanwhile
+        threading.Event().wait(0.05)
+        return read_server_config()
+
+    with patch(
+        "qpc.request.read_server_config", side_effect=slow_read_server_config
+    ), ThreadPoolExecutor(max_workers=4) as executor:
+        sessions = list(executor.map(lambda _: get_session(), range(4)))
+    assert all(session is sessions[0] for session in sessions)
+
+
+def test_request_many_ordered(server_config, requests_mock):
+    """Test request_many returns one result per spec, in order."""
+    for item in range(5):
+        requests_mock.get(f"http://127.0.0.1:8000/item/{item}/", json={"id": item})
+    specs = [("GET", f"/item/{item}/", None, None) for item in range(5)]
+    results = list(request_many(specs, jobs=3))
+    assert [result.index for result in results] == list(range(5))
+    assert [result.response.json()["id"] for result in results] == list(range(5))
+    assert all(result.error is None for result in results)
+
+
+def test_request_many_unordered(server_config, requests_mock):
+    """Test request_many can yield results as they complete."""
+    for item in range(4):
+        requests_mock.delete(f"http://127.0.0.1:8000/item/{item}/", status_code=204)
+    specs = [("DELETE", f"/item/{item}/", None, None) for item in range(4)]
+    results = request_many(specs, ordered=False)
+    assert sorted(result.index for result in results) == list(range(4))
+
+
+def test_request_many_errors_per_item(server_config, requests_mock):
+    """Test request_many reports failures per item instead of exiting."""
+    requests_mock.get("http://127.0.0.1:8000/ok/", json={})
+    requests_mock.get("http://127.0.0.1:8000/down/", exc=ConnectionError)
+    requests_mock.get("http://127.0.0.1:8000/broken/", status_code=500, json={})
+    specs = [
+        ("GET", "/ok/", None, None),
+        ("GET", "/down/", None, None),
+        ("GET", "/broken/", None, None),
+        ("INVALID", "/ok/", None, None),
+    ]
+    ok, down, broken, invalid = request_many(specs)
+    assert ok.error is None
+    assert isinstance(down.error, ConnectionError)
+    assert down.response is None
+    assert isinstance(broken.error, QPCRequestError)
+    assert broken.response.status_code == 500
+    assert isinstance(invalid.error, QPCRequestError)
+
+
+def test_request_many_uses_max_jobs(server_config, requests_mock):
+    """Test the number of workers is bounded by set_max_jobs."""
+    requests_mock.get("http://127.0.0.1:8000/path", json={})
+    set_max_jobs(2)
+    with patch("qpc.request.ThreadPoolExecutor", wraps=ThreadPoolExecutor) as pool:
+        list(request_many([("GET", "/path", None, None)] * 5))
+    pool.assert_called_once_with(max_workers=2)
+
+
+def test_request_many_prefetch(server_config, requests_mock):
+    """Test only prefetch requests are sent ahead of the consumed results."""
+    for item in range(5):
+        requests_mock.get(f"http://127.0.0.1:8000/item/{item}/", json={"id": item})
+    specs = [("GET", f"/item/{item}/", None, None) for item in range(5)]
+    results = request_many(specs, prefetch=0)
+    assert requests_mock.call_count == 0
+    assert [result.index for result in results] == list(range(5))
+    requests_mock.reset_mock()
+    results = request_many(specs, prefetch=2)
+    assert next(results).index == 0
+    results.close()
+    assert requests_mock.call_count <= 3
+    assert requests_mock.request_history[0].path == "/item/0/"
+
+
+def test_request_many_prefetch_closed(server_config, requests_mock):
+    """Test closing prefetching results before reading any sends nothing."""
+    specs = [("GET", f"/item/{item}/", None, None) for item in range(5)]
+    with patch("qpc.request.ThreadPoolExecutor", wraps=ThreadPoolExecutor) as pool:
+        request_many(specs, prefetch=2).close()
+    pool.assert_not_called()
+    assert requests_mock.call_count == 0
+
+
+def test_retry_transient_status(server_config, requests_mock, mock_retry_sleep, caplog):
+    """Test idempotent requests are retried on transient status codes."""
+    caplog.set_level("WARNING")
+    requests_mock.get(
+        "http://127.0.0.1:8000/path",
+        [{"status_code": 502}, {"status_code": 503}, {"status_code": 200}],
+    )
+    response = request("GET", "/path")
+    assert response.status_code == 200
+    assert requests_mock.call_count == 3
+    assert mock_retry_sleep.call_count == 2
+    assert "status code 502" in caplog.messages[0]
+    assert "retry 2 of 3" in caplog.messages[1]
+
+
+def test_retry_connection_error(server_config, requests_mock):
+    """Test idempotent requests are retried after connection errors."""
+    requests_mock.delete(
+        "http://127.0.0.1:8000/path",
+        [{"exc": ConnectionError}, {"status_code": 204}],
+    )
+    assert request("DELETE", "/path").status_code == 204
+
+
+def test_retry_after_header(server_config, requests_mock, mock_retry_sleep):
+    """Test Retry-After is honored on 429 and 503 responses."""
+    requests_mock.put(
+        "http://127.0.0.1:8000/path",
+        [
+            {"status_code": 429, "headers": {"Retry-After": "7"}},
+            {"status_code": 200, "json": {}},
+        ],
+    )
+    request("PUT", "/path", payload={})
+    mock_retry_sleep.assert_called_once_with(7.0)
+
+
+def test_no_retry_for_post(server_config, requests_mock, mock_retry_sleep):
+    """Test non idempotent requests are never retried."""
+    requests_mock.post("http://127.0.0.1:8000/path", status_code=503)
+    assert request("POST", "/path", payload={}).status_code == 503
+    assert requests_mock.call_count == 1
+    mock_retry_sleep.assert_not_called()
+
+
+def test_retries_exhausted(server_config, requests_mock):
+    """Test the last failure is returned once retries run out."""
+    requests_mock.get("http://127.0.0.1:8000/path", status_code=503)
+    assert request("GET", "/path").status_code == 503
+    assert requests_mock.call_count == 4
+
+
+def test_retry_budget(requests_mock, mock_retry_sleep):
+    """Test retries stop when the command retry budget is spent."""
+    write_server_config(
+        {
+            "host": "127.0.0.1",
+            "port": 8000,
+            "use_http": True,
+            "retries": 5,
+            "retry_budget": 10,
+        }
+    )
+    requests_mock.get(
+        "http://127.0.0.1:8000/path",
+        status_code=503,
+        headers={"Retry-After": "6"},
+    )
+    assert request("GET", "/path").status_code == 503
+    assert requests_mock.call_count == 2
+    mock_retry_sleep.assert_called_once_with(6.0)
+
+
+def _gzip_config(**settings):
+    write_server_config(
+        {"host": "127.0.0.1", "port": 8000, "use_http": True, **settings}
+    )
+
+
+@pytest.mark.parametrize("method", ["POST", "PUT"])
+def test_gzip_large_payload(requests_mock, method):
+    """Test payloads over the threshold are sent gzip compressed."""
+    _gzip_config(gzip_threshold=100)
+    payload = {"facts": [{"name": "value"}] * 100}
+    requests_mock.register_uri(method, "http://127.0.0.1:8000/path", json={})
+    request(method, "/path", payload=payload)
+    sent = requests_mock.last_request
+    assert sent.headers["Content-Encoding"] == "gzip"
+    assert sent.headers["Content-Type"] == "application/json"
+    assert json.loads(gzip.decompress(sent.body)) == payload
+
+
+@pytest.mark.parametrize("settings", [{}, {"gzip_threshold": 100, "gzip_level": 0}])
+def test_gzip_small_payload(requests_mock, settings):
+    """Test small payloads, or any with gzip_level 0, are sent uncompressed."""
+    _gzip_config(**settings)
+    payload = {"facts": [{"name": "value"}] * 100}
+    requests_mock.post("http://127.0.0.1:8000/path", json={})
+    request("POST", "/path", payload=payload)
+    sent = requests_mock.last_request
+    assert "Content-Encoding" not in sent.headers
+    assert sent.json() == payload
+
+
+def test_gzip_rejected(requests_mock):
+    """Test a 415 response falls back to uncompressed bodies."""
+    _gzip_config(gzip_threshold=0)
+    requests_mock.post(
+        "http://127.0.0.1:8000/path",
+        [{"status_code": 415}, {"status_code": 201, "json": {}}],
+    )
+    assert request("POST", "/path", payload={"id": 1}).status_code == 201
+    assert "Content-Encoding" not in requests_mock.last_request.headers
+    assert requests_mock.last_request.json() == {"id": 1}
+    # the server is not asked to decompress again
+    request("POST", "/path", payload={"id": 2})
+    assert requests_mock.call_count == 3
+    assert "Content-Encoding" not in requests_mock.last_request.headers
+
+
+def test_response_json_decoded_once(server_config, requests_mock):
+    """Test the JSON body is decoded once, whatever uses it."""
+    requests_mock.get(
+        "http://127.0.0.1:8000/path",
+        status_code=400,
+        json={"name": ["required"]},
+        headers={"Content-Type": "application/json"},
+    )
+    decode_json = Response.json
+    with patch.object(
+        Response, "json", autospec=True, side_effect=decode_json
+    ) as decode:
+        response = request("GET", "/path")
+        assert response.json() == {"name": ["required"]}
+        assert response.json() is response.json()
+    decode.assert_called_once()
+
+
+def test_response_non_json_not_decoded(server_config, requests_mock):
+    """Test bodies that are not JSON are never decoded."""
+    requests_mock.get(
+        "http://127.0.0.1:8000/path",
+        content=b"\x1f\x8b",
+        headers={"Content-Type": "application/gzip"},
+    )
+    with patch.object(Response, "json", autospec=True) as decode:
+        response = request("GET", "/path")
+    assert response.content == b"\x1f\x8b"
+    decode.assert_not_called()
+
+
+def test_request_timeouts(server_config, requests_mock):
+    """Test requests use the server.config timeouts unless overridden."""
+    requests_mock.get("http://127.0.0.1:8000/path", json={})
+    request("GET", "/path")
+    assert requests_mock.last_request.timeout == (10.0, 120.0)
+    set_timeout(2.5)
+    request("GET", "/path")
+    assert requests_mock.last_request.timeout == (2.5, 2.5)
+
+
+def test_request_timeouts_disabled(requests_mock):
+    """Test a 0 timeout in server.config means no timeout."""
+    write_server_config(
+        {"host": "127.0.0.1", "port": 8000, "use_http": True, "read_timeout": 0}
+    )
+    requests_mock.post("http://127.0.0.1:8000/path", json={})
+    request("POST", "/path", payload={})
+    assert requests_mock.last_request.timeout == (10.0, None)
+
+
+def test_deadline_limits_timeouts(server_config, requests_mock):
+    """Test request timeouts never go past the command deadline."""
+    requests_mock.get("http://127.0.0.1:8000/path", json={})
+    set_deadline(5)
+    request("GET", "/path")
+    connect_timeout, read_timeout = requests_mock.last_request.timeout
+    assert 0 < connect_timeout <= 5
+    assert 0 < read_timeout <= 5
+
+
+def test_deadline_exceeded(server_config, requests_mock, caplog):
+    """Test no request is sent once the command deadline passed."""
+    requests_mock.get("http://127.0.0.1:8000/path", json={})
+    set_deadline(0)
+    with pytest.raises(SystemExit):
+        request("GET", "/path")
+    assert requests_mock.call_count == 0
+    assert "before the command deadline" in caplog.messages[-1]
+
+
+def test_deadline_stops_retries(server_config, requests_mock, mock_retry_sleep):
+    """Test retries are not attempted past the command deadline."""
+    requests_mock.get(
+        "http://127.0.0.1:8000/path",
+        status_code=503,
+        headers={"Retry-After": "20"},
+    )
+    set_deadline(10)
+    assert request("GET", "/path").status_code == 503
+    assert requests_mock.call_count == 1
+    mock_retry_sleep.assert_not_called()
+
+
+def test_read_timeout(server_config, requests_mock, caplog):
+    """Test a stalled server fails the command with a timeout error."""
+    requests_mock.get("http://127.0.0.1:8000/path", exc=ReadTimeout)
+    with pytest.raises(SystemExit):
+        request("GET", "/path")
+    assert "timed out waiting for the server" in caplog.messages[-1]
@@ -0,0 +1,211 @@
+"""Test the resolution of names to ids."""
+
+from qpc import resolver, server_info
+from qpc.cli import CLI
+
+CRED_URL = "http://127.0.0.1:8000/api/v1/credentials/"
+SCAN_URL = "http://127.0.0.1:8000/api/v1/scans/"
+SOURCE_URL = "http://127.0.0.1:8000/api/v1/sources/"
+
+
+def cred(cred_id, name):
+    """Return a credential as listed by the server."""
+    return {"id": cred_id, "name": name, "cred_type": "network", "username": "root"}
+
+
+def test_resolve_saves_ids(server_config, requests_mock):
+    """Test names are looked up once, in a single request for credentials."""
+    requests_mock.get(
+        CRED_URL, json={"count": 2, "results": [cred(1, "cred1"), cred(2, "cred2")]}
+    )
+    requests_mock.get(f"{CRED_URL}?name=cred3", json={"count": 0, "results": []})
+    expected = {
+        "cred2": {"name": "cred2", "id": 2, "cred_type": "network"},
+        "cred1": {"name": "cred1", "id": 1, "cred_type": "network"},
+    }
+    assert resolver.resolve("cred", ["cred2", "cred1", "cred3"]) == expected
+    assert requests_mock.request_history[0].qs == {
+        "name": ["cred2,cred1,cred3"],
+        "page_size": ["3"],
+    }
+    assert requests_mock.last_request.qs == {"name": ["cred3"]}
+    assert resolver.resolve("cred", ["cred1", "cred2"]) == expected
+    assert requests_mock.call_count == 2
+
+
+def test_resolve_exact_scan_names(server_config, requests_mock):
+    """Test scans are looked up one at a time, matching the name exactly."""
+    requests_mock.get(
+        SCAN_URL, json={"count": 1, "results": [{"id": 1, "name": "scan10"}]}
+    )
+    assert resolver.resolve("scan", ["scan1", "scan2"]) == {}
+    assert requests_mock.call_count == 2
+
+
+def test_resolve_single_result_not_saved(server_config, requests_mock):
+    """Test the only result of a lookup is used, but saved only if named so."""
+    requests_mock.get(CRED_URL, json={"count": 1, "results": [cred(1, "other")]})
+    expected = {"cred1": {"name": "other", "id": 1, "cred_type": "network"}}
+    assert resolver.resolve("cred", ["cred1"]) == expected
+    assert "cred" not in resolver._server_index()
+    assert resolver.resolve("cred", ["cred1"]) == expected
+    assert requests_mock.call_count == 2
+
+
+def test_resolve_failed(server_config, requests_mock):
+    """Test a failed lookup is reported with None and saves nothing."""
+    requests_mock.get(SOURCE_URL, status_code=400, json={})
+    assert resolver.resolve("source", ["source1"]) is None
+    requests_mock.get(SOURCE_URL, json={"count": 0, "results": []})
+    assert resolver.resolve("source", ["source1"]) == {}
+
+
+def test_resolve_fresh(server_config, requests_mock):
+    """Test fresh lookups replace saved ids and drop the names gone."""
+    resolver.remember("source", [{"id": 1, "name": "source1"}, {"id": 2, "name": "x"}])
+    requests_mock.get(
+        SOURCE_URL, json={"count": 1, "results": [{"id": 3, "name": "source1"}]}
+    )
+    requests_mock.get(f"{SOURCE_URL}?name=x", json={"count": 0, "results": []})
+    assert resolver.resolve("source", ["source1", "x"], fresh=True) == {
+        "source1": {"name": "source1", "id": 3}
+    }
+    assert resolver.resolve("source", ["source1"]) == {
+        "source1": {"name": "source1", "id": 3}
+    }
+    assert requests_mock.call_count == 2
+
+
+def test_resolve_chunks(server_config, requests_mock, monkeypatch):
+    """Test many names are looked up in chunks, following the pages."""
+    monkeypatch.setattr(resolver, "MAX_LOOKUP_LENGTH", 30)
+    names = [f"source {number}" for number in range(5)]
+    requests_mock.get(
+        SOURCE_URL,
+        [
+            {
+                "json": {
+                    "count": 2,
+                    "results": [{"id": 0, "name": names[0]}],
+                    "next": f"{SOURCE_URL}?page=2",
+                }
+            },
+            {"json": {"count": 2, "results": [{"id": 1, "name": names[1]}]}},
+            {"json": {"count": 2, "results": [{"id": 3, "name": names[3]}]}},
+            {"json": {"count": 1, "results": [{"id": 4, "name": names[4]}]}},
+            {"json": {"count": 0, "results": []}},
+        ],
+    )
+    assert list(resolver.resolve("source", names)) == [
+        names[0],
+        names[1],
+        names[3],
+        names[4],
+    ]
+    assert [request.qs["name"] for request in requests_mock.request_history] == [
+        ["source 0,source 1"],
+        ["source 0,source 1"],
+        ["source 2,source 3"],
+        ["source 4"],
+        ["source 2"],
+    ]
+    assert requests_mock.request_history[1].qs["page"] == ["2"]
+
+
+def test_resolve_each_name(server_config, requests_mock):
+    """Test names are looked up one by one if the server cannot join them."""
+    for number in (1, 2):
+        requests_mock.get(
+            f"{SOURCE_URL}?name=source{number}",
+            json={"count": 1, "results": [{"id": number, "name": f"source{number}"}]},
+        )
+    requests_mock.get(
+        f"{SOURCE_URL}?name=source1,source2", json={"count": 0, "results": []}
+    )
+    expected = {
+        "source1": {"name": "source1", "id": 1},
+        "source2": {"name": "source2", "id": 2},
+    }
+    assert resolver.resolve("source", ["source1", "source2"]) == expected
+    assert requests_mock.call_count == 3
+    assert resolver.resolve("source", ["source1", "source2"], fresh=True) == expected
+    assert requests_mock.call_count == 5
+    assert sorted(
+        request.qs["name"][0] for request in requests_mock.request_history[3:]
+    ) == ["source1", "source2"]
+
+
+def test_resolve_unmatched_names_each(server_config, requests_mock):
+    """Test names the joined lookup did not match are looked up one by one."""
+    requests_mock.get(
+        f"{SOURCE_URL}?name=source1,source2",
+        json={
+            "count": 2,
+            "results": [{"id": 1, "name": "source1"}, {"id": 2, "name": "Source2"}],
+        },
+    )
+    requests_mock.get(
+        f"{SOURCE_URL}?name=source2",
+        json={"count": 1, "results": [{"id": 2, "name": "Source2"}]},
+    )
+    assert resolver.resolve("source", ["source1", "source2"]) == {
+        "source1": {"name": "source1", "id": 1},
+        "source2": {"name": "Source2", "id": 2},
+    }
+    assert [request.qs["name"] for request in requests_mock.request_history] == [
+        ["source1,source2"],
+        ["source2"],
+    ]
+    assert server_info.get_capability(resolver.MULTI_NAME_LOOKUPS, True)
+
+
+def test_list_saves_ids(server_config, requests_mock):
+    """Test the ids of listed credentials are used without a lookup."""
+    requests_mock.get(CRED_URL, json={"count": 1, "results": [cred(5, "cred1")]})
+    requests_mock.patch(f"{CRED_URL}5/", json=cred(5, "cred1"))
+    assert CLI().run(["cred", "list"]) == 0
+    assert CLI().run(["cred", "edit", "--name", "cred1", "--username", "admin"]) == 0
+    assert [request.method for request in requests_mock.request_history] == [
+        "GET",
+        "PATCH",
+    ]
+
+
+def test_changing_command_forgets_ids(server_config, requests_mock):
+    """Test clearing an object drops its id, and clearing all drops them all."""
+    resolver.remember("cred", [cred(1, "cred1"), cred(2, "cred2")])
+    requests_mock.get(CRED_URL, json={"count": 1, "results": [cred(1, "cred1")]})
+    requests_mock.delete(f"{CRED_URL}1/", status_code=204)
+    assert CLI().run(["cred", "clear", "--name", "cred1"]) == 0
+    assert resolver._server_index()["cred"] == {
+        "cred2": {"name": "cred2", "id": 2, "cred_type": "network"}
+    }
+    requests_mock.post(f"{CRED_URL}bulk_delete/", json={"deleted": [2]})
+    CLI().run(["cred", "clear", "--all"])
+    assert "cred" not in resolver._server_index()
+
+
+def test_stale_id_resolved_again(server_config, requests_mock):
+    """Test a request failing with a stale id is sent again with the new id."""
+    resolver.remember("scan", [{"id": 1, "name": "scan1"}])
+    requests_mock.post(f"{SCAN_URL}1/jobs/", status_code=404)
+    requests_mock.get(
+        SCAN_URL, json={"count": 1, "results": [{"id": 2, "name": "scan1"}]}
+    )
+    requests_mock.post(f"{SCAN_URL}2/jobs/", status_code=201, json={"id": 7})
+    assert CLI().run(["scan", "start", "--name", "scan1"]) == 0
+    assert resolver.resolve("scan", ["scan1"]) == {"scan1": {"name": "scan1", "id": 2}}
+
+
+def test_missing_id_not_resolved_again(server_config, requests_mock):
+    """Test a request failing with an up to date id is not sent again."""
+    requests_mock.get(
+        SCAN_URL, json={"count": 1, "results": [{"id": 1, "name": "scan1"}]}
+    )
+    requests_mock.post(f"{SCAN_URL}1/jobs/", status_code=404, json={})
+    assert CLI().run(["scan", "start", "--name", "scan1"]) == 1
+    assert [request.method for request in requests_mock.request_history] == [
+        "GET",
+        "POST",
+        "GET",
+    ]
@@ -0,0 +1,80 @@
+"""Test the cache of server versions and capabilities."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from qpc import server_info, utils
+from qpc.request import request
+from qpc.utils import write_server_config
+
+
+def test_record_server_version(server_config):
+    """Test the reported version is kept per server location."""
+    assert server_info.get_server_version() is None
+    server_info.record_server_version("1.4.0")
+    assert server_info.get_server_version() == "1.4.0"
+    write_server_config({"host": "127.0.0.2", "port": 8000, "use_http": True})
+    assert server_info.get_server_version() is None
+
+
+def test_server_version_expires(server_config):
+    """Test cached versions are forgotten after server_info_ttl seconds."""
+    now = server_info.time.time()
+    with patch("qpc.server_info.time.time", return_value=now):
+        server_info.record_server_version("1.4.0")
+    with patch("qpc.server_info.time.time", return_value=now + 599):
+        assert server_info.get_server_version() == "1.4.0"
+    with patch("qpc.server_info.time.time", return_value=now + 601):
+        assert server_info.get_server_version() is None
+
+
+def test_new_version_forgets_capabilities(server_config):
+    """Test capabilities learned from an older version are dropped."""
+    server_info.record_server_version("1.4.0")
+    server_info.set_capability(server_info.GZIP_REQUESTS, False)
+    server_info.record_server_version("1.4.0")
+    assert server_info.get_capability(server_info.GZIP_REQUESTS) is False
+    server_info.record_server_version("1.5.0")
+    assert server_info.get_capability(server_info.GZIP_REQUESTS, True) is True
+
+
+def test_first_version_keeps_capabilities(server_config):
+    """Test capabilities learned before the first version are kept."""
+    server_info.set_capability(server_info.GZIP_REQUESTS, False)
+    server_info.record_server_version("1.4.0")
+    assert server_info.get_server_version() == "1.4.0"
+    assert server_info.get_capability(server_info.GZIP_REQUESTS) is False
+
+
+def test_server_info_disabled():
+    """Test nothing is saved when server_info_ttl is 0."""
+    write_server_config(
+        {"host": "127.0.0.1", "port": 8000, "use_http": True, "server_info_ttl": 0}
+    )
+    server_info.record_server_version("1.4.0")
+    assert not os.path.exists(utils.QPC_SERVER_INFO)
+
+
+@pytest.mark.parametrize(
+    "server_version,supported",
+    [("1.4.0", True), ("0.9.0", False), ("0.0.0.1bd2c2e", True)],
+)
+def test_is_version_supported(server_version, supported):
+    """Test server versions are compared to the version commands require."""
+    assert server_info.is_version_supported(server_version, "1.0.0") is supported
+
+
+def test_old_server_fails_before_request(server_config, requests_mock, caplog):
+    """Test commands fail without a request once the server is known too old."""
+    url = "http://127.0.0.1:8000/api/v1/sources/"
+    requests_mock.get(url, json={}, headers={"X-Server-Version": "0.9.0"})
+    with pytest.raises(SystemExit):
+        request("GET", "/api/v1/sources/", min_server_version="1.0.0")
+    assert requests_mock.call_count == 1
+    with pytest.raises(SystemExit):
+        request("GET", "/api/v1/sources/", min_server_version="1.0.0")
+    assert requests_mock.call_count == 1
+    assert "minimum server version of 1.0.0" in caplog.messages[-1]
+    assert request("GET", "/api/v1/sources/").ok
@@ -0,0 +1,124 @@
+"""Test the interactive qpc shell."""
+
+import os
+from unittest import mock
+
+import pytest
+
+from qpc import utils
+from qpc.cli import CLI
+from qpc.request import get_session
+from qpc.shell import QPCShell
+
+CRED_URL = "http://127.0.0.1:8000/api/v1/credentials/"
+SOURCE_URL = "http://127.0.0.1:8000/api/v1/sources/"
+
+
+@pytest.fixture
+def shell():
+    """Create a shell reading no terminal."""
+    return QPCShell(stdin=mock.Mock(), stdout=mock.Mock())
+
+
+def test_exit(shell):
+    """Test exit and Ctrl-D leave the shell, other lines do not."""
+    assert shell.onecmd("exit")
+    assert shell.onecmd("EOF")
+    assert not shell.onecmd("")
+    assert not shell.onecmd("# just a comment")
+
+
+def test_commands_share_session(server_config, requests_mock, shell):
+    """Test commands run in the shell process with the same HTTP session."""
+    requests_mock.get(CRED_URL, json={"count": 0, "results": []})
+    session = get_session()
+    assert not shell.onecmd("cred list")
+    assert not shell.onecmd("qpc cred list --type network")
+    assert shell.exit_code == 0
+    assert requests_mock.call_count == 2
+    assert get_session() is session
+
+
+def test_commands_share_parsers(server_config, requests_mock, shell):
+    """Test parsers are built once, and commands start from a clean state."""
+    scan_job_url = "http://127.0.0.1:8000/api/v1/jobs/"
+    for job_id in (1, 2):
+        requests_mock.put(f"{scan_job_url}{job_id}/cancel/", json={})
+    build_parser = CLI._build_parser
+    with mock.patch.object(
+        CLI, "_build_parser", autospec=True, side_effect=build_parser
+    ) as build:
+        for job_id in (1, 1, 2):
+            assert not shell.onecmd(f"scan cancel --id {job_id}")
+            assert shell.exit_code == 0
+    assert [request.path for request in requests_mock.request_history] == [
+        "/api/v1/jobs/1/cancel/",
+        "/api/v1/jobs/1/cancel/",
+        "/api/v1/jobs/2/cancel/",
+    ]
+    # the base parser, then the parser of scan cancel
+    assert build.call_count == 2
+
+
+def test_failed_command(shell):
+    """Test a failing command is reported without leaving the shell."""
+    assert not shell.onecmd("cred show")
+    assert shell.exit_code == 2
+    assert not shell.onecmd("shell")
+    assert shell.exit_code == 1
+
+
+def test_complete_subcommands_and_actions(shell):
+    """Test subcommands and actions are completed."""
+    assert shell.completenames("s") == ["server", "source", "scan"]
+    assert shell.completedefault("c", "scan c", 5, 6) == ["cancel", "clear"]
+
+
+def test_complete_names(server_config, requests_mock, shell):
+    """Test names are fetched once, following pages, and kept in memory."""
+    requests_mock.get(
+        CRED_URL,
+        [
+            {
+                "json": {
+                    "results": [{"name": "cred1"}, {"name": "other"}],
+                    "next": f"{CRED_URL}?page=2",
+                }
+            },
+            {"json": {"results": [{"name": "cred2"}], "next": None}},
+        ],
+    )
+    line = "source add --cred cred1 c"
+    assert shell.completedefault("c", line, len(line) - 1, len(line)) == [
+        "cred1",
+        "cred2",
+    ]
+    line = "cred show --name "
+    assert shell.completedefault("", line, len(line), len(line)) == [
+        "cred1",
+        "other",
+        "cred2",
+    ]
+    assert requests_mock.call_count == 2
+
+
+def test_changing_command_forgets_names(server_config, requests_mock, shell):
+    """Test names are fetched again after a command changing them."""
+    requests_mock.get(SOURCE_URL, json={"results": [{"name": "source1"}]})
+    requests_mock.delete(f"{SOURCE_URL}1/", status_code=204)
+    requests_mock.get(
+        f"{SOURCE_URL}?name=source1",
+        json={"count": 1, "results": [{"id": 1, "name": "source1"}]},
+    )
+    assert shell.get_names("source") == ["source1"]
+    shell.onecmd("source list")
+    assert "source" in shell.names
+    shell.onecmd("source clear --name source1")
+    assert "source" not in shell.names
+
+
+def test_history(shell):
+    """Test the history is saved between sessions."""
+    shell.preloop()
+    shell.postloop()
+    assert os.path.exists(utils.QPC_SHELL_HISTORY)
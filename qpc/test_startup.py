@@ -0,0 +1,59 @@
+"""Test the import-time budget of the qpc command."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# third-party packages only the commands talking to a server need
+HEAVY_MODULES = ("cryptography", "packaging", "requests", "urllib3")
+
+# largest import time of qpc.cli, as a share of the import time of requests
+# measured on the same machine: qpc.cli takes about 15% of it, and loading
+# requests alone would take all of it
+IMPORT_BUDGET_RATIO = 0.4
+
+
+def import_times(tmp_path, *args):
+    """Run python with -X importtime, returning {module: cumulative microseconds}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "HOME": str(tmp_path)},
+        check=False,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        times[module.strip()] = int(cumulative_us)
+    return times
+
+
+@pytest.fixture(scope="module")
+def requests_import_time(tmp_path_factory):
+    """Return the import time of requests, in microseconds, as a baseline."""
+    tmp_path = tmp_path_factory.mktemp("baseline")
+    return import_times(tmp_path, "-c", "import requests")["requests"]
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("--version",),
+        ("--help",),
+        ("cred", "add"),
+        ("scan", "--help"),
+        ("insights", "add_login", "--help"),
+        ("__complete", "cred", "show", "--name", ""),
+    ],
+)
+def test_startup_skips_heavy_imports(tmp_path, requests_import_time, args):
+    """Test commands failing before any request do not load heavy modules."""
+    times = import_times(tmp_path, "-m", "qpc", *args)
+    assert "qpc.cli" in times
+    assert [module for module in HEAVY_MODULES if module in times] == []
+    assert times["qpc.cli"] < requests_import_time * IMPORT_BUDGET_RATIO
@@ -1,9 +1,25 @@
 """Test qpc cred utils."""
 
+import json
+from unittest.mock import patch
+
 import pytest
+import requests_mock
+from requests import Session
 
 from qpc.messages import PROMPT_INPUT
-from qpc.utils import check_if_prompt_is_not_empty
+from qpc.utils import (
+    check_if_prompt_is_not_empty,
+    create_tar_buffer,
+    delete_client_token,
+    get_server_setting,
+    read_client_token,
+    read_server_config,
+    write_client_token,
+    write_json_from_tar_response,
+    write_response,
+    write_server_config,
+)
 
 
 @pytest.mark.parametrize("pass_prompt", ["", None])
@@ -13,3 +29,112 @@ def test_invalid_pass_prompt(pass_prompt, caplog):
     with pytest.raises(SystemExit):
         check_if_prompt_is_not_empty(pass_prompt)
     assert caplog.messages[-1] == PROMPT_INPUT
+
+
+def test_read_server_config_is_cached(server_config):
+    """Test server.config is parsed once while it is unchanged on disk."""
+    with patch("qpc.utils.json.load", wraps=json.load) as mock_load:
+        first = read_server_config()
+        second = read_server_config()
+    assert first == second
+    assert mock_load.call_count == 1
+
+
+def test_read_server_config_reloads_changed_file(server_config):
+    """Test a changed server.config invalidates the cached configuration."""
+    assert read_server_config()["port"] == 8000
+    write_server_config({"host": "127.0.0.1", "port": 8001, "use_http": True})
+    assert read_server_config()["port"] == 8001
+
+
+def test_read_server_config_copy(server_config):
+    """Test callers can't alter the cached configuration."""
+    read_server_config()["host"] = "changed"
+    assert read_server_config()["host"] == "127.0.0.1"
+
+
+def test_read_client_token_cached():
+    """Test the client token is re-read only after it changes."""
+    assert read_client_token() is None
+    write_client_token({"token": "first"})
+    with patch("qpc.utils.json.load", wraps=json.load) as mock_load:
+        assert read_client_token() == "first"
+        assert read_client_token() == "first"
+    assert mock_load.call_count == 1
+    write_client_token({"token": "second"})
+    assert read_client_token() == "second"
+    delete_client_token()
+    assert read_client_token() is None
+
+
+@pytest.mark.parametrize(
+    "setting",
+    [
+        {"pool_size": 0},
+        {"retries": "3"},
+        {"retry_backoff": -1},
+        {"keep_alive": 1},
+        {"gzip_level": 10},
+        {"http_cache": "yes"},
+        {"http_cache_size": 0},
+        {"page_size": 0},
+        {"page_size": "max"},
+    ],
+)
+def test_read_server_config_invalid_setting(setting, caplog):
+    """Test invalid optional settings invalidate server.config."""
+    write_server_config({"host": "127.0.0.1", "port": 8000, **setting})
+    assert read_server_config() is None
+    assert "has invalid value" in caplog.messages[-1]
+
+
+def test_get_server_setting(server_config):
+    """Test optional settings fall back to their defaults."""
+    assert get_server_setting("retries") == 3
+    write_server_config({"host": "127.0.0.1", "port": 8000, "retry_backoff": 2})
+    assert get_server_setting("retry_backoff") == 2
+    assert get_server_setting("page_size") is None
+    write_server_config({"host": "127.0.0.1", "port": 8000, "page_size": "auto"})
+    assert get_server_setting("page_size") == "auto"
+
+
+def _streamed_response(content, **kwargs):
+    with requests_mock.Mocker() as mocker:
+        mocker.get("http://qpc.test/report", content=content, **kwargs)
+        return Session().get("http://qpc.test/report", stream=True)
+
+
+def test_write_response(tmp_path):
+    """Test a streamed response body is copied to a file chunk by chunk."""
+    content = bytes(range(256)) * 1024
+    response = _streamed_response(content)
+    with patch("qpc.utils.STREAM_CHUNK_SIZE", 1000):
+        with patch.object(
+            response, "iter_content", wraps=response.iter_content
+        ) as iter_content:
+            write_response(str(tmp_path / "report.tar.gz"), response)
+    iter_content.assert_called_once_with(chunk_size=1000)
+    assert (tmp_path / "report.tar.gz").read_bytes() == content
+
+
+def test_write_response_to_stdout(capsys):
+    """Test a streamed text body split mid character is printed intact."""
+    response = _streamed_response(
+        "id,name\n1,ação\n".encode("utf-8"),
+        headers={"Content-Type": "text/csv; charset=utf-8"},
+    )
+    with patch("qpc.utils.STREAM_CHUNK_SIZE", 1):
+        write_response(None, response)
+    assert capsys.readouterr().out == "id,name\n1,ação\n\n"
+
+
+@pytest.mark.parametrize("to_file", [True, False])
+def test_write_json_from_tar_response(tmp_path, capsys, to_file):
+    """Test the json inside a streamed tarball is pretty printed."""
+    report = {"id": 1, "report": [{"key": "value"}]}
+    response = _streamed_response(create_tar_buffer({"report.json": report}))
+    path = tmp_path / "report.json"
+    write_json_from_tar_response(str(path) if to_file else None, response)
+    output = path.read_text() if to_file else capsys.readouterr().out
+    assert json.loads(output) == report
+    assert output.startswith('{\n    "id": 1,')
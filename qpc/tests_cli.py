@@ -2,7 +2,9 @@
 
 import sys
 import unittest
+from importlib import import_module
 from io import StringIO
+from unittest.mock import patch
 
 from qpc.cli import CLI
 from qpc.release import VERSION
@@ -32,3 +34,62 @@ class CliTests(unittest.TestCase):
                 sys.argv = ["/bin/qpc", "--version"]
                 CLI().main()
                 self.assertEqual(version_out.getvalue(), VERSION)
+
+    def test_jobs_option(self):
+        """Testing the --jobs argument sets request concurrency."""
+        sys.argv = ["/bin/qpc", "--jobs", "8", "server", "config", "--host", "1.2.3.4"]
+        with patch("qpc.request.set_max_jobs") as mock_set_max_jobs:
+            CLI().main()
+        mock_set_max_jobs.assert_called_once_with(8)
+
+    def test_jobs_option_invalid(self):
+        """Testing the --jobs argument must be a positive integer."""
+        sys.argv = ["/bin/qpc", "--jobs", "0", "server", "status"]
+        with self.assertRaises(SystemExit):
+            CLI().main()
+
+    def test_timeout_options(self):
+        """Testing the --timeout and --deadline arguments."""
+        sys.argv = [
+            "/bin/qpc",
+            "--timeout",
+            "2.5",
+            "--deadline",
+            "30",
+            "server",
+            "config",
+            "--host",
+            "1.2.3.4",
+        ]
+        with patch("qpc.request.set_timeout") as mock_set_timeout, patch(
+            "qpc.request.set_deadline"
+        ) as mock_set_deadline:
+            CLI().main()
+        mock_set_timeout.assert_called_once_with(2.5)
+        mock_set_deadline.assert_called_once_with(30.0)
+
+    def test_timeout_option_invalid(self):
+        """Testing the --timeout argument must be a positive number."""
+        sys.argv = ["/bin/qpc", "--timeout", "-1", "server", "status"]
+        with self.assertRaises(SystemExit):
+            CLI().main()
+
+    def test_only_run_command_is_imported(self):
+        """Testing only the module of the command being run is imported."""
+        sys.argv = ["/bin/qpc", "server", "config", "--host", "1.2.3.4"]
+        with patch("qpc.cli.import_module", wraps=import_module) as mock_import:
+            CLI().main()
+        mock_import.assert_called_once_with("qpc.server.configure_host")
+
+    def test_no_action_prints_help(self):
+        """Testing a subcommand without action prints the usage."""
+        sys.argv = ["/bin/qpc", "cred"]
+        help_out = StringIO()
+        with redirect_stdout(help_out), patch(
+            "qpc.cli.get_server_location", return_value="http://127.0.0.1:8000"
+        ), patch("qpc.cli.read_require_auth", return_value=False), patch(
+            "qpc.cli.import_module"
+        ) as mock_import:
+            CLI().main()
+        mock_import.assert_not_called()
+        self.assertIn("usage:", help_out.getvalue())
@@ -1,15 +1,16 @@
 """QPC Command Line utilities."""
 
+import codecs
 import io
 import json
 import logging
 import os
 import sys
 import tarfile
+import tempfile
+from argparse import ArgumentTypeError
 from collections import defaultdict
 
-from cryptography.fernet import Fernet, InvalidToken
-
 from qpc import messages
 from qpc.insights.exceptions import QPCEncryptionKeyError, QPCLoginConfigError
 from qpc.translation import _ as t
@@ -28,12 +29,94 @@ INSIGHTS_CONFIG = os.path.join(CONFIG_DIR, "insights.config")
 INSIGHTS_LOGIN_CONFIG = os.path.join(CONFIG_DIR, "insights_login_config")
 
 INSIGHTS_ENCRYPTION = os.path.join(DATA_DIR, "insights_encryption")
+QPC_HTTP_CACHE = os.path.join(DATA_DIR, "http_cache")
+QPC_SERVER_INFO = os.path.join(DATA_DIR, "server_info.json")
+QPC_CIRCUIT_BREAKER = os.path.join(DATA_DIR, "circuit_breaker.json")
+QPC_SHELL_HISTORY = os.path.join(DATA_DIR, "shell_history")
+QPC_NAME_INDEX = os.path.join(DATA_DIR, "name_index.json")
+QPC_ID_INDEX = os.path.join(DATA_DIR, "id_index.json")
+QPC_REPORT_INDEX = os.path.join(DATA_DIR, "report_index.json")
 
 CONFIG_HOST_KEY = "host"
 CONFIG_PORT_KEY = "port"
 CONFIG_USE_HTTP = "use_http"
 CONFIG_SSL_VERIFY = "ssl_verify"
 CONFIG_REQUIRE_TOKEN = "require_token"
+CONFIG_POOL_SIZE = "pool_size"
+CONFIG_KEEP_ALIVE = "keep_alive"
+CONFIG_CLIENT_CERT = "client_cert"
+CONFIG_RETRIES = "retries"
+CONFIG_RETRY_BACKOFF = "retry_backoff"
+CONFIG_RETRY_BUDGET = "retry_budget"
+CONFIG_HTTP_CACHE = "http_cache"
+CONFIG_HTTP_CACHE_SIZE = "http_cache_size"
+CONFIG_GZIP_THRESHOLD = "gzip_threshold"
+CONFIG_GZIP_LEVEL = "gzip_level"
+CONFIG_LOG_PAYLOAD_SIZE = "log_payload_size"
+CONFIG_SERVER_INFO_TTL = "server_info_ttl"
+CONFIG_NAME_INDEX_TTL = "name_index_ttl"
+CONFIG_CONNECT_TIMEOUT = "connect_timeout"
+CONFIG_READ_TIMEOUT = "read_timeout"
+CONFIG_CIRCUIT_BREAKER_THRESHOLD = "circuit_breaker_threshold"
+CONFIG_CIRCUIT_BREAKER_WINDOW = "circuit_breaker_window"
+CONFIG_CIRCUIT_BREAKER_COOLDOWN = "circuit_breaker_cooldown"
+CONFIG_PAGE_SIZE = "page_size"
+CONFIG_PAGE_TARGET_TIME = "page_target_time"
+CONFIG_PREFETCH_PAGES = "prefetch_pages"
+
+# page_size value letting qpc pick the page size of paginated lists
+PAGE_SIZE_AUTO = "auto"
+
+DEFAULT_JOBS = 4
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 3
+DEFAULT_RETRY_BACKOFF = 0.5
+DEFAULT_RETRY_BUDGET = 60.0
+# megabytes
+DEFAULT_HTTP_CACHE_SIZE = 100
+# bytes
+DEFAULT_GZIP_THRESHOLD = 64 * 1024
+DEFAULT_GZIP_LEVEL = 6
+# bytes
+DEFAULT_LOG_PAYLOAD_SIZE = 4096
+# seconds
+DEFAULT_SERVER_INFO_TTL = 600
+DEFAULT_NAME_INDEX_TTL = 300
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 120.0
+DEFAULT_CIRCUIT_BREAKER_THRESHOLD = 5
+DEFAULT_CIRCUIT_BREAKER_WINDOW = 60.0
+DEFAULT_CIRCUIT_BREAKER_COOLDOWN = 30.0
+DEFAULT_PAGE_TARGET_TIME = 1.0
+DEFAULT_PREFETCH_PAGES = 2
+
+# optional numeric server.config settings mapped to (default, minimum,
+# maximum); a float default means int values are accepted as well
+NUMERIC_CONFIG = {
+    CONFIG_POOL_SIZE: (DEFAULT_POOL_SIZE, 1, None),
+    CONFIG_RETRIES: (DEFAULT_RETRIES, 0, None),
+    CONFIG_RETRY_BACKOFF: (DEFAULT_RETRY_BACKOFF, 0, None),
+    CONFIG_RETRY_BUDGET: (DEFAULT_RETRY_BUDGET, 0, None),
+    CONFIG_HTTP_CACHE_SIZE: (DEFAULT_HTTP_CACHE_SIZE, 1, None),
+    CONFIG_GZIP_THRESHOLD: (DEFAULT_GZIP_THRESHOLD, 0, None),
+    CONFIG_GZIP_LEVEL: (DEFAULT_GZIP_LEVEL, 0, 9),
+    CONFIG_LOG_PAYLOAD_SIZE: (DEFAULT_LOG_PAYLOAD_SIZE, 0, None),
+    CONFIG_SERVER_INFO_TTL: (DEFAULT_SERVER_INFO_TTL, 0, None),
+    CONFIG_NAME_INDEX_TTL: (DEFAULT_NAME_INDEX_TTL, 0, None),
+    CONFIG_CONNECT_TIMEOUT: (DEFAULT_CONNECT_TIMEOUT, 0, None),
+    CONFIG_READ_TIMEOUT: (DEFAULT_READ_TIMEOUT, 0, None),
+    CONFIG_CIRCUIT_BREAKER_THRESHOLD: (DEFAULT_CIRCUIT_BREAKER_THRESHOLD, 0, None),
+    CONFIG_CIRCUIT_BREAKER_WINDOW: (DEFAULT_CIRCUIT_BREAKER_WINDOW, 0, None),
+    CONFIG_CIRCUIT_BREAKER_COOLDOWN: (DEFAULT_CIRCUIT_BREAKER_COOLDOWN, 0, None),
+    CONFIG_PAGE_TARGET_TIME: (DEFAULT_PAGE_TARGET_TIME, 0, None),
+    CONFIG_PREFETCH_PAGES: (DEFAULT_PREFETCH_PAGES, 0, None),
+}
+
+# optional boolean server.config settings mapped to their default
+BOOLEAN_CONFIG = {
+    CONFIG_KEEP_ALIVE: True,
+    CONFIG_HTTP_CACHE: False,
+}
 
 INSIGHTS_CONFIG_USERNAME_KEY = "username"
 INSIGHTS_CONFIG_PASSWORD_KEY = "password"
@@ -50,11 +133,19 @@ DEFAULT_INSIGHTS_CONFIG = {
 
 LOG_LEVEL_INFO = 0
 
+PRETTY_PRINT_OPTIONS = {"sort_keys": True, "indent": 4, "separators": (",", ": ")}
+
+# size of the buffer used to copy streamed responses
+STREAM_CHUNK_SIZE = 64 * 1024
+
 QPC_MIN_SERVER_VERSION = "0.9.0"
 
 logging.captureWarnings(True)
 logger = logging.getLogger(__name__)
 
+# parsed files keyed by path, see read_snapshot
+_snapshots = {}
+
 
 def ensure_config_dir_exists():
     """Ensure the qpc configuration directory exists."""
@@ -101,14 +192,39 @@ except AttributeError:
     exception_class = ValueError
 
 
-def read_client_token():
-    """Retrieve client token for sonar server.
+def read_snapshot(path, loader):
+    """Load a file through loader, reusing the result until the file changes.
 
-    :returns: The client token or None
+    Configuration, token and index files are consulted several times per
+    command, so the parsed content is kept in memory and only reloaded when
+    the file modification time or size changes, or after the file is written
+    with write_json_atomically(). The result is shared by every caller: copy
+    it before changing it.
+
+    :param path: the file to read
+    :param loader: callable that reads, parses and validates the file
+    :returns: the (possibly cached) loader result
+    :raises: FileNotFoundError if the file does not exist
     """
-    if not os.path.exists(QPC_CLIENT_TOKEN):
-        return None
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        _snapshots.pop(path, None)
+        raise
+    version = (stat.st_mtime_ns, stat.st_size)
+    snapshot = _snapshots.get(path)
+    if snapshot is None or snapshot[0] != version:
+        snapshot = (version, loader())
+        _snapshots[path] = snapshot
+    return snapshot[1]
+
+
+def _forget_snapshot(path):
+    """Drop the in-memory snapshot of a file that was just written or removed."""
+    _snapshots.pop(path, None)
+
 
+def _load_client_token():
     token = None
     with open(QPC_CLIENT_TOKEN, encoding="utf-8") as client_token_file:
         try:
@@ -120,6 +236,34 @@ def read_client_token():
         return token
 
 
+def read_client_token():
+    """Retrieve client token for sonar server.
+
+    :returns: The client token or None
+    """
+    try:
+        return read_snapshot(QPC_CLIENT_TOKEN, _load_client_token)
+    except FileNotFoundError:
+        return None
+
+
+def get_server_setting(key):
+    """Return an optional setting from server.config.
+
+    :param key: page_size or one of the NUMERIC_CONFIG or BOOLEAN_CONFIG keys
+    :returns: the configured value, or its default when the setting or the
+        whole configuration is missing
+    """
+    config = read_server_config()
+    if config is None:
+        if key == CONFIG_PAGE_SIZE:
+            return None
+        if key in BOOLEAN_CONFIG:
+            return BOOLEAN_CONFIG[key]
+        return NUMERIC_CONFIG[key][0]
+    return config[key]
+
+
 def read_require_auth():
     """Determine if CLI should require token.
 
@@ -149,15 +293,22 @@ def read_insights_config():
     return insights_config
 
 
-def read_server_config():  # noqa: C901 PLR0911
+def read_server_config():
     """Retrieve configuration for sonar server.
 
     :returns: The validate dictionary with configuration
     """
-    if not os.path.exists(QPC_SERVER_CONFIG):
+    try:
+        config = read_snapshot(QPC_SERVER_CONFIG, _load_server_config)
+    except FileNotFoundError:
         logger.error("Server config %s was not found.", QPC_SERVER_CONFIG)
         return None
+    if config is None:
+        return None
+    return dict(config)
+
 
+def _load_server_config():  # noqa: C901 PLR0911
     with open(QPC_SERVER_CONFIG, encoding="utf-8") as server_config_file:
         try:
             config = json.load(server_config_file)
@@ -169,6 +320,8 @@ def read_server_config():  # noqa: C901 PLR0911
         use_http = config.get(CONFIG_USE_HTTP)
         ssl_verify = config.get(CONFIG_SSL_VERIFY, False)
         require_token = config.get(CONFIG_REQUIRE_TOKEN)
+        client_cert = config.get(CONFIG_CLIENT_CERT)
+        page_size = config.get(CONFIG_PAGE_SIZE)
 
         host_empty = host is None or host == ""
         port_empty = port is None or port == ""
@@ -238,12 +391,74 @@ def read_server_config():  # noqa: C901 PLR0911
             )
             return None
 
+        numeric_config = {}
+        for key, (default, minimum, maximum) in NUMERIC_CONFIG.items():
+            value = config.get(key, default)
+            value_type = (int, float) if isinstance(default, float) else int
+            if (
+                not isinstance(value, value_type)
+                or isinstance(value, bool)
+                or value < minimum
+                or (maximum is not None and value > maximum)
+            ):
+                logger.error(
+                    "Server config %s has invalid value for %s %s",
+                    QPC_SERVER_CONFIG,
+                    key,
+                    value,
+                )
+                return None
+            numeric_config[key] = value
+
+        boolean_config = {}
+        for key, default in BOOLEAN_CONFIG.items():
+            value = config.get(key, default)
+            if not isinstance(value, bool):
+                logger.error(
+                    "Server config %s has invalid value for %s %s",
+                    QPC_SERVER_CONFIG,
+                    key,
+                    value,
+                )
+                return None
+            boolean_config[key] = value
+
+        if client_cert is not None and (
+            not isinstance(client_cert, str) or not os.path.exists(client_cert)
+        ):
+            logger.error(
+                "Server config %s has invalid path for client_cert %s",
+                QPC_SERVER_CONFIG,
+                client_cert,
+            )
+            return None
+
+        if (
+            page_size is not None
+            and page_size != PAGE_SIZE_AUTO
+            and (
+                not isinstance(page_size, int)
+                or isinstance(page_size, bool)
+                or page_size < 1
+            )
+        ):
+            logger.error(
+                "Server config %s has invalid value for page_size %s",
+                QPC_SERVER_CONFIG,
+                page_size,
+            )
+            return None
+
         return {
             CONFIG_HOST_KEY: host,
             CONFIG_PORT_KEY: port,
             CONFIG_USE_HTTP: use_http,
             CONFIG_SSL_VERIFY: ssl_verify,
             CONFIG_REQUIRE_TOKEN: require_token,
+            CONFIG_CLIENT_CERT: client_cert,
+            CONFIG_PAGE_SIZE: page_size,
+            **numeric_config,
+            **boolean_config,
         }
 
 
@@ -257,6 +472,27 @@ def write_config(config_file_path, config_dict):
 
     with open(config_file_path, "w", encoding="utf-8") as config_file:
         json.dump(config_dict, config_file, indent=4)
+    _forget_snapshot(config_file_path)
+
+
+def write_json_atomically(path, data):
+    """Write data as JSON, replacing the file in a single step.
+
+    Other qpc processes reading the file see either the old or the new
+    content, never a partially written one.
+
+    :param path: the file to write
+    :param data: JSON serializable data
+    :raises: EnvironmentError if the file cannot be written
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=directory, prefix=".", delete=False
+    ) as json_file:
+        json.dump(data, json_file)
+    os.replace(json_file.name, path)
+    _forget_snapshot(path)
 
 
 def write_server_config(server_config):
@@ -267,6 +503,22 @@ def write_server_config(server_config):
     write_config(QPC_SERVER_CONFIG, server_config)
 
 
+def update_server_config(changes):
+    """Update keys of server.config, keeping the other keys it has.
+
+    :param changes: dict containing the server configuration to change
+    """
+    server_config = {}
+    try:
+        with open(QPC_SERVER_CONFIG, encoding="utf-8") as server_config_file:
+            server_config = json.load(server_config_file)
+    except (OSError, exception_class):
+        pass
+    if not isinstance(server_config, dict):
+        server_config = {}
+    write_server_config({**server_config, **changes})
+
+
 def write_insights_login_config(login_config):
     """Write insights login configuration to insights_login_config.
 
@@ -320,11 +572,13 @@ def write_client_token(client_token):
 
     with open(QPC_CLIENT_TOKEN, "w", encoding="utf-8") as configFile:
         json.dump(client_token, configFile)
+    _forget_snapshot(QPC_CLIENT_TOKEN)
 
 
 def delete_client_token():
     """Remove file client_token."""
     ensure_config_dir_exists()
+    _forget_snapshot(QPC_CLIENT_TOKEN)
     try:
         os.remove(QPC_CLIENT_TOKEN)
     except FileNotFoundError:
@@ -432,7 +686,7 @@ def pretty_print(json_data):
     :param json_data: the json data to pretty print
     :returns: the pretty print string of the json data
     """
-    return json.dumps(json_data, sort_keys=True, indent=4, separators=(",", ": "))
+    return json.dumps(json_data, **PRETTY_PRINT_OPTIONS)
 
 
 # Read in a file and make it a list
@@ -498,6 +752,53 @@ def write_file(filename, content, binary=False):
     return result
 
 
+def write_response(filename, response):
+    """Copy a streamed response body to a file without buffering it.
+
+    :param filename: the filename to write, or None to print the body
+    :param response: response object of a request sent with stream=True
+    :raises: EnvironmentError if file cannot be written
+    """
+    chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+    if filename is None:
+        encoding = response.encoding or "utf-8"
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        for chunk in chunks:
+            sys.stdout.write(decoder.decode(chunk))
+        print(decoder.decode(b"", final=True))
+        return
+    input_path = os.path.expanduser(os.path.expandvars(filename))
+    with open(input_path, "wb") as out_file:
+        for chunk in chunks:
+            out_file.write(chunk)
+
+
+def write_json_from_tar_response(filename, response):
+    """Pretty print the json file inside a streamed tar.gz response body.
+
+    The tarball is spooled to a temporary file in fixed size chunks, so
+    only the decoded json data is ever held in memory.
+
+    :param filename: the filename to write, or None to print the json
+    :param response: response object of a request sent with stream=True
+    :raises: EnvironmentError if file cannot be written
+    """
+    with tempfile.TemporaryFile() as tar_buffer:
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            tar_buffer.write(chunk)
+        tar_buffer.seek(0)
+        with tarfile.open(fileobj=tar_buffer, mode="r:gz") as tar:
+            json_file = tar.getmembers()[0]
+            json_data = json.load(tar.extractfile(json_file))
+    if filename is None:
+        json.dump(json_data, sys.stdout, **PRETTY_PRINT_OPTIONS)
+        print()
+        return
+    input_path = os.path.expanduser(os.path.expandvars(filename))
+    with open(input_path, "w", encoding="utf-8") as out_file:
+        json.dump(json_data, out_file, **PRETTY_PRINT_OPTIONS)
+
+
 def extract_json_from_tar(fileobj_content, print_pretty=True):
     """Extract json data from tar.gz bytes.
 
@@ -555,6 +856,8 @@ def write_encryption_key_if_non_existent():
     the function will check its existence every time it is called
     """
     if not os.path.exists(INSIGHTS_ENCRYPTION):
+        from cryptography.fernet import Fernet
+
         key = Fernet.generate_key()
         with open(INSIGHTS_ENCRYPTION, "wb") as key_file:
             key_file.write(key)
@@ -577,6 +880,8 @@ def encrypt_password(password):
     write_encryption_key_if_non_existent()
     key = load_encryption_key()
 
+    from cryptography.fernet import Fernet
+
     encryption_algorithm = Fernet(key)
 
     encrypted_password = encryption_algorithm.encrypt(password.encode())
@@ -586,6 +891,9 @@ def encrypt_password(password):
 def decrypt_password(password):
     """Retrieve password from login config file and decrypt it."""
     key = load_encryption_key()
+
+    from cryptography.fernet import Fernet, InvalidToken
+
     encryption_algorithm = Fernet(key)
 
     try:
@@ -597,6 +905,53 @@ def decrypt_password(password):
     return decrypted_password.decode()
 
 
+def validate_positive_float(arg):
+    """Check that arg is a positive number.
+
+    :param arg: the command line argument
+    :returns: The arg, as a float.
+    :raises: ArgumentTypeError, if arg is not a positive number.
+    """
+    try:
+        value = float(arg)
+    except ValueError as exception:
+        raise ArgumentTypeError(t(messages.POSITIVE_NUMBER_ERROR) % arg) from exception
+    if not value > 0 or value == float("inf"):
+        raise ArgumentTypeError(t(messages.POSITIVE_NUMBER_ERROR) % arg)
+    return value
+
+
+def validate_positive_int(arg):
+    """Check that arg is a positive integer.
+
+    :param arg: the command line argument
+    :returns: The arg, as an integer.
+    :raises: ArgumentTypeError, if arg is not a positive integer.
+    """
+    try:
+        value = int(arg)
+    except ValueError as exception:
+        raise ArgumentTypeError(t(messages.POSITIVE_INT_ERROR) % arg) from exception
+    if value < 1:
+        raise ArgumentTypeError(t(messages.POSITIVE_INT_ERROR) % arg)
+    return value
+
+
+def validate_page_size(arg):
+    """Check that arg is a positive integer or auto.
+
+    :param arg: the command line argument
+    :returns: The arg, as an integer, or PAGE_SIZE_AUTO.
+    :raises: ArgumentTypeError, if arg is not a positive integer or auto.
+    """
+    if arg == PAGE_SIZE_AUTO:
+        return arg
+    try:
+        return validate_positive_int(arg)
+    except ArgumentTypeError as exception:
+        raise ArgumentTypeError(t(messages.PAGE_SIZE_ERROR) % arg) from exception
+
+
 def check_if_prompt_is_not_empty(pass_prompt):
     """Validate user prompt."""
     if not pass_prompt: